@@ -58,6 +58,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME':  BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Generations save from several threads at once; take the write
+            # lock at BEGIN so concurrent writers wait instead of failing
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -91,9 +97,76 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Hash uploads while they stream in, then store them as usual
+FILE_UPLOAD_HANDLERS = [
+    'core.upload_handlers.HashingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Ollama Configuration
 OLLAMA_BASE_URL = 'http://localhost:11434'
-OLLAMA_MODEL = 'llama3.2:3b'
\ No newline at end of file
+OLLAMA_MODEL = 'llama3.2:3b'
+OLLAMA_CONNECT_TIMEOUT = 3.05  # Seconds to establish a connection
+OLLAMA_READ_TIMEOUT = 300  # Seconds to wait for a generation
+OLLAMA_PROBE_TIMEOUT = 10  # Read timeout for /api/tags checks
+OLLAMA_POOL_CONNECTIONS = 2  # Hosts kept in the shared connection pool
+OLLAMA_POOL_MAXSIZE = 10  # Keep-alive connections per host
+OLLAMA_MONITOR_INTERVAL = 15  # Seconds between background status probes (/api/tags)
+OLLAMA_BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures before failing fast
+OLLAMA_BREAKER_RECOVERY_SECONDS = 30  # Time open before a half-open probe
+OLLAMA_BREAKER_HALF_OPEN_CALLS = 1  # Probe requests allowed while half-open
+OLLAMA_MAX_IN_FLIGHT = 2  # Concurrent model calls; the rest queue by priority
+GENERATION_REPAIR_ATTEMPTS = 1  # Follow-up calls for missing or invalid flashcards/quiz items
+GENERATION_RETENTION = 3  # Versions of flashcards and of quizzes kept per document
+OLLAMA_KEEP_ALIVE = '30m'  # How long Ollama keeps the model loaded after a request
+OLLAMA_OUTPUT_TOKENS = {  # num_predict per task (flashcards and quiz: per item)
+    'summary': 1024,
+    'chunk_summary': 512,
+    'reduce': 1024,
+    'flashcards': 120,
+    'quiz': 250,
+}
+OLLAMA_WARMUP = True  # Load the model in the background when the server starts
+OLLAMA_MODEL_BUDGETS = {  # Per model (full name, name without tag, or prefix)
+    'default': {'context': 4096, 'chars_per_token': 3.5},  # num_ctx for every request; starting chars/token estimate
+    'llama3.2': {'context': 8192, 'chars_per_token': 3.8},
+}
+
+# LLM response cache (SQLite, keyed by model, prompt and options)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # LRU eviction above this size
+
+# Extracted text storage (compressed, apart from the Document row)
+TEXT_STORE_COMPRESSION_LEVEL = 6  # zlib level for stored extracted text (1 fastest, 9 smallest)
+
+# Prompt text selection (BM25 over document chunks)
+TEXT_SELECTION_CHUNK_CHARS = 800
+TEXT_SELECTION_CACHE_SIZE = 32  # Documents whose chunk index is kept in memory
+
+# Map-reduce summaries for long documents
+SUMMARY_MAP_REDUCE_THRESHOLD = 12000  # Characters of text before switching to map-reduce
+SUMMARY_MAP_CHUNK_CHARS = 6000  # Page-aligned chunk size for the map step
+SUMMARY_MAP_WORKERS = 3  # Concurrent chunk summaries against Ollama
+SUMMARY_REDUCE_MAX_CHARS = 6000  # Chunk summaries combined per reduce prompt
+
+# PDF extraction
+PDF_EXTRACTION_WORKERS = 4  # Worker processes for large documents
+PDF_PARALLEL_PAGE_THRESHOLD = 100  # Minimum page count before using the pool
+
+# Background extraction jobs (in-process worker pool, no broker)
+EXTRACTION_JOB_WORKERS = 2
+EXTRACTION_PROGRESS_BATCH = 25  # Pages written between progress updates
+EXTRACTION_STALE_SECONDS = 120  # Re-queue jobs that stop reporting progress
+
+# Server-side page rendering for the PDF viewer
+PAGE_RENDER_CACHE_DIR = MEDIA_ROOT / 'page_cache'
+PAGE_RENDER_CACHE_MAX_BYTES = 200 * 1024 * 1024  # LRU eviction above this size
+PAGE_RENDER_ZOOM_BUCKETS = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0]
+PAGE_RENDER_MAX_AGE = 86400  # Cache-Control max-age for page images
+
+# Flashcard and quiz exports (CSV, JSONL, Anki)
+EXPORT_CHUNK_SIZE = 100  # Documents fetched per batch, with their cards and questions
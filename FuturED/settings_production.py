@@ -0,0 +1,89 @@
+"""
+Production settings for FuturED.
+
+Use with DJANGO_SETTINGS_MODULE=futured.settings_production and the worker
+configuration in gunicorn.conf.py. Required environment: DJANGO_SECRET_KEY
+and DJANGO_ALLOWED_HOSTS. Run ``manage.py collectstatic`` on deploy; static
+and media files are served by the web server in front of gunicorn (nginx:
+``location /static/ { gzip_static on; }`` and ``location /media/``).
+
+Load numbers (manage.py loadtest against manage.py fake_ollama with 0.5 s
+latency and 30 tokens/s, all on one 1-vCPU VM; seconds):
+
+    Generations: flashcards,quiz-stream,summary-stream,pages --regenerate,
+    16 users, 96 requests
+    profile                              p50     p95     p99   req/s  errors
+    settings, runserver                29.57   47.05   51.31    0.59       0
+    production, gunicorn gthread       29.50   47.22   49.50    0.59       0
+    production, gunicorn uvicorn       29.54   46.88   49.95    0.59       0
+    gthread, 2 workers x 1 Ollama slot 29.29   57.74   63.57    0.53       0
+
+    Page views: home,workspace,pages, 32 users, 1500 requests
+    settings, runserver                 0.22    0.49    0.66  125.74       0
+    production, gunicorn gthread        0.24    0.43    0.61  128.22       0
+    production, gunicorn uvicorn        0.39    0.57    0.72   76.89       0
+
+    Streams: summary-stream,flashcards-stream,quiz-stream,generate-all,export
+    --regenerate; p50 total / p50 time to first byte. 1 user, 10 requests
+    profile                        summary-stream  quiz-stream  generate-all  export
+    production, gunicorn gthread      3.28 / 0.55  9.29 / 0.55  12.45 / 3.26  0.011 / 0.005
+    production, gunicorn uvicorn      3.27 / 0.55  9.42 / 0.56  12.47 / 3.28  0.017 / 0.009
+
+    16 users, 96 requests
+    production, gunicorn gthread    36.80 / 34.12 41.70 / 33.01 42.77 / 29.18 0.013 / 0.007
+    production, gunicorn uvicorn    38.39 / 35.62 43.97 / 35.13 39.09 / 19.61 0.040 / 0.024
+
+Both worker classes send every stream as it is produced: under WSGI the
+async generate-all stream runs on its own event loop, under ASGI the sync
+SSE and export streams are stepped one chunk at a time (see
+_streaming_response in core/views.py). Django on its own buffers either
+kind whole on the other server type; time to first byte then equals the
+total time. Under load the first byte of a token stream waits for a free
+Ollama slot, not for the stream.
+
+Generations are bound by the two Ollama slots (OLLAMA_MAX_IN_FLIGHT) in
+every profile; splitting them across two workers made the tail worse, so
+gunicorn.conf.py defaults to one worker. The sync views each hop to a
+thread under ASGI, which costs about 0.15 s per page view under load here,
+so gthread is the default.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+CSRF_TRUSTED_ORIGINS = [origin for origin in os.environ.get('DJANGO_CSRF_TRUSTED_ORIGINS', '').split(',') if origin]
+
+# SQLite under concurrent workers: WAL lets readers run alongside the one
+# writer, and busy_timeout makes a blocked writer wait instead of failing
+# with "database is locked". synchronous=NORMAL is safe with WAL.
+DATABASES['default']['OPTIONS'] = {
+    **DATABASES['default']['OPTIONS'],
+    'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA busy_timeout=20000',
+}
+DATABASES['default']['CONN_MAX_AGE'] = 600  # Keep connections open between requests
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Templates are compiled once per process
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Hashed file names (cached forever by browsers) with gzipped copies
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# TLS ends at the proxy, which must set X-Forwarded-Proto
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SESSION_COOKIE_SECURE = os.environ.get('DJANGO_SECURE_COOKIES', '1') == '1'
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
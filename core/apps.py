@@ -1,5 +1,38 @@
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _is_serving() -> bool:
+    """
+    True when this process will serve requests (not migrate, shell, tests, etc.).
+
+    Servers opt in with FUTURED_SERVING=1 (gunicorn.conf.py sets it);
+    runserver is recognised from its command line.
+    """
+    if os.environ.get('FUTURED_SERVING') == '1':
+        return True
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    # The autoreloader imports the project in a watcher process too
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
 
 
 class FuturedAppConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        if not _is_serving():
+            return
+
+        # Probe Ollama in the background so pages can show its status without waiting
+        from .services.ollama_monitor import get_monitor
+        get_monitor().start()
+
+        # Load the model in the background so the first user request doesn't wait for it
+        if getattr(settings, 'OLLAMA_WARMUP', True):
+            from .services.ollama_service import OllamaService
+            threading.Thread(target=OllamaService().warm_up, name='ollama-warmup', daemon=True).start()
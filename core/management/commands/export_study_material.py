@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.export_service import FORMATS, KINDS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Export flashcards and quiz questions as CSV, JSONL or an Anki import file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--kind', choices=KINDS, default='all')
+        parser.add_argument('--documents', default='',
+                            help='Comma-separated document ids (default: all documents)')
+        parser.add_argument('--output', '-o', default='-', help="File to write, or '-' for stdout")
+
+    def handle(self, *args, **options):
+        try:
+            document_ids = [int(i) for i in options['documents'].split(',') if i.strip()]
+        except ValueError:
+            raise CommandError('--documents must be comma-separated ids')
+
+        lines = export_lines(options['format'], options['kind'], document_ids)
+        # The csv module writes its own line endings
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8', newline='')
+        try:
+            for line in lines:
+                out.write(line)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        if out is not sys.stdout:
+            self.stderr.write(f"Exported to {options['output']}")
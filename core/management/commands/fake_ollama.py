@@ -0,0 +1,192 @@
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+SUMMARY_TEXT = (
+    "1. **Overview**: This document introduces the main ideas of the topic and "
+    "shows how they connect.\n\n"
+    "2. **Key Topics**: Definitions, worked examples and common pitfalls.\n\n"
+    "3. **Important Concepts**: Each concept is defined, then applied to a short "
+    "problem.\n\n"
+    "4. **Takeaways**: Review the definitions and practise the examples."
+)
+
+
+def canned_flashcards(count: int) -> str:
+    return json.dumps([
+        {'question': f"What is concept {i + 1}?", 'answer': f"Concept {i + 1} is a key idea of the document."}
+        for i in range(count)
+    ])
+
+
+def canned_quiz(count: int) -> str:
+    return json.dumps([
+        {
+            'question': f"Which statement about concept {i + 1} is correct?",
+            'options': [f"Statement {letter}" for letter in 'ABCD'],
+            'correct_answer': i % 4,
+            'explanation': f"Statement {'ABCD'[i % 4]} matches the document.",
+        }
+        for i in range(count)
+    ])
+
+
+def canned_response(payload: dict) -> str:
+    """Pick an output that looks like what the real model returns for this prompt."""
+    prompt = payload.get('prompt', '')
+    items = (payload.get('format') or {}).get('items', {}).get('properties', {})
+    match = re.search(r'Create (\d+)', prompt)
+    count = int(match.group(1)) if match else 5
+
+    if 'options' in items or 'quiz questions' in prompt:
+        return canned_quiz(count)
+    if 'answer' in items or 'flashcards' in prompt:
+        return canned_flashcards(count)
+    return SUMMARY_TEXT
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """
+    Answers /api/tags and /api/generate like Ollama, with simulated timing.
+
+    Class attributes are set from the command's options; a response takes
+    ``latency`` seconds before the first token, then streams at
+    ``tokens_per_second`` (about 4 characters per token).
+    """
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real server
+
+    model = 'llama3.2:3b'
+    latency = 0.5
+    tokens_per_second = 30.0
+    error_rate = 0.0
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, data: dict, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: dict) -> None:
+        line = (json.dumps(data) + '\n').encode()
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+        self.wfile.flush()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/api/tags':
+            self._send_json({'models': [{'name': self.model, 'model': self.model}]})
+        elif path == '/':
+            body = b'Ollama is running'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json({'error': 'not found'}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send_json({'error': 'invalid JSON'}, status=400)
+            return
+
+        if urlparse(self.path).path != '/api/generate':
+            self._send_json({'error': 'not found'}, status=404)
+            return
+
+        prompt = payload.get('prompt', '')
+        if not prompt:
+            # Empty prompt: Ollama just loads the model (warm-up)
+            self._send_json({'model': payload.get('model', self.model), 'response': '', 'done': True})
+            return
+
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self._send_json({'error': 'simulated failure'}, status=500)
+            return
+
+        text = canned_response(payload)
+        tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+        final = {
+            'model': payload.get('model', self.model),
+            'done': True,
+            'prompt_eval_count': max(1, len(prompt) // 4),
+            'eval_count': len(tokens),
+        }
+
+        if payload.get('stream', True):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for token in tokens:
+                time.sleep(1 / self.tokens_per_second)
+                self._write_chunk({'model': final['model'], 'response': token, 'done': False})
+            self._write_chunk({**final, 'response': ''})
+            self.wfile.write(b'0\r\n\r\n')
+            self.wfile.flush()
+        else:
+            time.sleep(len(tokens) / self.tokens_per_second)
+            self._send_json({**final, 'response': text})
+
+
+class Command(BaseCommand):
+    help = 'Run a simulated Ollama server for load testing without a GPU'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=11434)
+        parser.add_argument('--model', default=getattr(settings, 'OLLAMA_MODEL', 'llama3.2:3b'),
+                            help='Model name reported by /api/tags')
+        parser.add_argument('--latency', type=float, default=0.5,
+                            help='Seconds before the first token (prompt processing)')
+        parser.add_argument('--tokens-per-second', type=float, default=30.0)
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of generate requests answered with HTTP 500')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for the simulated errors')
+        parser.add_argument('--verbose-requests', action='store_true', help='Log every request')
+
+    def handle(self, *args, **options):
+        if options['tokens_per_second'] <= 0:
+            self.stderr.write(self.style.ERROR('--tokens-per-second must be positive'))
+            return
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+
+        FakeOllamaHandler.model = options['model']
+        FakeOllamaHandler.latency = options['latency']
+        FakeOllamaHandler.tokens_per_second = options['tokens_per_second']
+        FakeOllamaHandler.error_rate = options['error_rate']
+        FakeOllamaHandler.verbose = options['verbose_requests']
+
+        server = ThreadingHTTPServer((options['host'], options['port']), FakeOllamaHandler)
+        server.daemon_threads = True
+        self.stdout.write(
+            f"Fake Ollama serving {options['model']} on http://{options['host']}:{options['port']} "
+            f"(latency {options['latency']}s, {options['tokens_per_second']} tokens/s, "
+            f"error rate {options['error_rate']:.0%})"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,169 @@
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+# Load test scenario name -> (URL name, takes the document id, HTTP method)
+ENDPOINTS = {
+    'home': ('core:home', False, 'GET'),
+    'workspace': ('core:workspace', True, 'GET'),
+    'summary': ('core:generate_summary', True, 'POST'),
+    'flashcards': ('core:generate_flashcards', True, 'POST'),
+    'quiz': ('core:generate_quiz', True, 'POST'),
+    'summary-stream': ('core:stream_summary', True, 'POST'),
+    'flashcards-stream': ('core:stream_flashcards', True, 'POST'),
+    'quiz-stream': ('core:stream_quiz', True, 'POST'),
+    'generate-all': ('core:generate_all', True, 'POST'),
+    'pages': ('core:page_sizes', True, 'GET'),
+    'status': ('core:ollama_status', False, 'GET'),
+    'export': ('core:export_document', True, 'GET'),
+}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def response_error(response: requests.Response, body: bytes):
+    """Return why a response counts as failed, or None if it succeeded."""
+    if response.status_code >= 400:
+        return f"HTTP {response.status_code}"
+
+    content_type = response.headers.get('Content-Type', '')
+    text = body.decode('utf-8', 'replace')
+    if content_type.startswith('text/event-stream'):
+        if 'event: error' in text:
+            return 'stream error event'
+        if 'event: done' not in text:
+            return 'stream ended without done'
+    elif content_type.startswith('application/x-ndjson'):
+        for line in text.splitlines():
+            if line.strip() and json.loads(line).get('success') is False:
+                return 'task failed'
+    elif content_type.startswith('application/json'):
+        if json.loads(text or '{}').get('success') is False:
+            return 'success false'
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Send concurrent requests to the app and report latency percentiles, throughput and errors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                            help='Where the app under test is served')
+        parser.add_argument('--document', type=int, help='Document id for per-document endpoints')
+        parser.add_argument('--endpoints', default='summary',
+                            help=f"Comma-separated, sent round-robin: {', '.join(ENDPOINTS)}")
+        parser.add_argument('--concurrency', type=int, default=4, help='Simulated users sending at once')
+        parser.add_argument('--requests', type=int, default=40, help='Total requests to send')
+        parser.add_argument('--regenerate', action='store_true',
+                            help='Ask for fresh generations (skip stored results and the LLM cache)')
+        parser.add_argument('--timeout', type=float, default=600, help='Per-request timeout in seconds')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = [name for name in names if name not in ENDPOINTS]
+        if unknown or not names:
+            raise CommandError(f"Unknown endpoints: {', '.join(unknown) or '(none)'}")
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be at least 1')
+
+        targets = []
+        for name in names:
+            url_name, per_document, method = ENDPOINTS[name]
+            if per_document and options['document'] is None:
+                raise CommandError(f"--document is required for {name}")
+            path = reverse(url_name, args=[options['document']] if per_document else [])
+            targets.append((name, method, options['base_url'].rstrip('/') + path))
+
+        body = json.dumps({'regenerate': True} if options['regenerate'] else {})
+        results = {name: {'latencies': [], 'first_byte': [], 'errors': {}} for name in names}
+        results_lock = threading.Lock()
+        local = threading.local()
+
+        def send(i):
+            # One keep-alive session per worker thread, like a browser per user
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            name, method, url = targets[i % len(targets)]
+
+            start = time.monotonic()
+            first_byte = None
+            try:
+                response = local.session.request(
+                    method, url, data=body if method == 'POST' else None,
+                    headers={'Content-Type': 'application/json'}, stream=True, timeout=options['timeout']
+                )
+                # Read one byte first: a bigger read blocks until it fills or the response ends
+                content = [response.raw.read(1, decode_content=True)]
+                first_byte = time.monotonic() - start
+                content.append(response.raw.read(decode_content=True))
+                error = response_error(response, b''.join(content))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                error = type(e).__name__
+            elapsed = time.monotonic() - start
+
+            with results_lock:
+                result = results[name]
+                if error:
+                    result['errors'][error] = result['errors'].get(error, 0) + 1
+                else:
+                    result['latencies'].append(elapsed)
+                    if first_byte is not None:
+                        result['first_byte'].append(first_byte)
+
+        self.stdout.write(
+            f"Sending {options['requests']} requests to {options['base_url']} "
+            f"with {options['concurrency']} concurrent users ({', '.join(names)})"
+        )
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(send, range(options['requests'])))
+        wall = time.monotonic() - start
+
+        self._report(results, wall)
+
+    def _report(self, results: dict, wall: float) -> None:
+        header = f"{'endpoint':<18} {'ok':>5} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'ttfb50':>8} {'req/s':>7}"
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        all_latencies = []
+        total_errors = 0
+        for name, result in results.items():
+            latencies = result['latencies']
+            errors = sum(result['errors'].values())
+            all_latencies += latencies
+            total_errors += errors
+            self.stdout.write(
+                f"{name:<18} {len(latencies):>5} {errors:>5} "
+                f"{percentile(latencies, 50):>8.3f} {percentile(latencies, 95):>8.3f} "
+                f"{percentile(latencies, 99):>8.3f} {max(latencies, default=0):>8.3f} "
+                f"{percentile(result['first_byte'], 50):>8.3f} {len(latencies) / wall:>7.2f}"
+            )
+
+        self.stdout.write('-' * len(header))
+        self.stdout.write(
+            f"{'total':<18} {len(all_latencies):>5} {total_errors:>5} "
+            f"{percentile(all_latencies, 50):>8.3f} {percentile(all_latencies, 95):>8.3f} "
+            f"{percentile(all_latencies, 99):>8.3f} {max(all_latencies, default=0):>8.3f} "
+            f"{'':>8} {len(all_latencies) / wall:>7.2f}"
+        )
+        self.stdout.write(f"\nWall time {wall:.1f}s; latencies in seconds (successful requests only)")
+
+        for name, result in results.items():
+            for error, count in sorted(result['errors'].items()):
+                self.stdout.write(self.style.WARNING(f"  {name}: {count} x {error}"))
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 05:03
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_content_hash(apps, schema_editor):
+    Document = apps.get_model('core', 'Document')
+    for document in Document.objects.filter(content_hash=''):
+        hasher = hashlib.sha256()
+        try:
+            with document.file.open('rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+        except (FileNotFoundError, ValueError):
+            continue
+        document.content_hash = hasher.hexdigest()
+        document.save(update_fields=['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
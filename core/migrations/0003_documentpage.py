@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 05:03
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_pages(apps, schema_editor):
+    # Rebuild page rows from the page markers in the stored text
+    Document = apps.get_model('core', 'Document')
+    DocumentPage = apps.get_model('core', 'DocumentPage')
+    for document in Document.objects.exclude(extracted_text__isnull=True).exclude(extracted_text=''):
+        parts = re.split(r'(?:^|\n\n)--- Page (\d+) ---\n', document.extracted_text)
+        DocumentPage.objects.bulk_create([
+            DocumentPage(
+                document=document,
+                page_number=int(number),
+                text=text,
+                char_count=len(text),
+                has_text=bool(text.strip())
+            )
+            for number, text in zip(parts[1::2], parts[2::2])
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_document_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_number', models.IntegerField()),
+                ('text', models.TextField(blank=True)),
+                ('char_count', models.IntegerField(default=0)),
+                ('has_text', models.BooleanField(default=False)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='core.document')),
+            ],
+            options={
+                'ordering': ['page_number'],
+                'indexes': [models.Index(fields=['document', 'page_number'], name='core_docume_documen_9cd39c_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_pages, migrations.RunPython.noop),
+    ]
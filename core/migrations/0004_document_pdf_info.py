@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-18 05:05
+
+import fitz  # PyMuPDF
+from django.db import migrations, models
+
+
+def backfill_pdf_info(apps, schema_editor):
+    # Page count and metadata come from the file; the text layer from the
+    # text extracted before (it only ever came from the text layer)
+    Document = apps.get_model('core', 'Document')
+    for document in Document.objects.all():
+        document.has_text_layer = bool((document.extracted_text or '').strip())
+        try:
+            with fitz.open(document.file.path) as pdf:
+                document.page_count = len(pdf)
+                document.pdf_metadata = pdf.metadata or {}
+        except Exception:
+            pass  # File missing or unreadable: page count stays unknown (0)
+        document.save(update_fields=['has_text_layer', 'page_count', 'pdf_metadata'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_documentpage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='has_text_layer',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='page_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='pdf_metadata',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(backfill_pdf_info, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+
+def mark_existing_documents(apps, schema_editor):
+    # Documents uploaded before background jobs were extracted inline
+    Document = apps.get_model('core', 'Document')
+    # (page_count was read from the file in 0004; page rows exist only for
+    # pages with text, so they can't be counted instead)
+    for document in Document.objects.all():
+        document.status = 'ready' if document.extracted_text else 'failed'
+        document.pages_done = document.page_count
+        document.save(update_fields=['status', 'pages_done'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_document_pdf_info'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='pages_done',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='status_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='status_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_documents, migrations.RunPython.noop),
+    ]
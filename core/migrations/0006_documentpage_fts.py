@@ -0,0 +1,66 @@
+# Generated by Django 6.0 on 2026-10-18 05:20
+
+from django.db import migrations
+
+
+# External-content FTS5 index over DocumentPage.text. Triggers keep it in
+# sync with inserts, updates and deletes (including cascades from Document).
+FTS_FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_documentpage_fts USING fts5(
+        text,
+        content='core_documentpage',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_documentpage_fts_ai AFTER INSERT ON core_documentpage BEGIN
+        INSERT INTO core_documentpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_documentpage_fts_ad AFTER DELETE ON core_documentpage BEGIN
+        INSERT INTO core_documentpage_fts(core_documentpage_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_documentpage_fts_au AFTER UPDATE ON core_documentpage BEGIN
+        INSERT INTO core_documentpage_fts(core_documentpage_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO core_documentpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO core_documentpage_fts(core_documentpage_fts) VALUES ('rebuild')",
+]
+
+FTS_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS core_documentpage_fts_au",
+    "DROP TRIGGER IF EXISTS core_documentpage_fts_ad",
+    "DROP TRIGGER IF EXISTS core_documentpage_fts_ai",
+    "DROP TABLE IF EXISTS core_documentpage_fts",
+]
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_FORWARD_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_REVERSE_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_document_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 05:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_documentpage_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.IntegerField()),
+                ('page_start', models.IntegerField()),
+                ('page_end', models.IntegerField()),
+                ('source_hash', models.CharField(max_length=40)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summary_chunks', to='core.document')),
+            ],
+            options={
+                'ordering': ['index'],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-18 05:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def version_existing_sets(apps, schema_editor):
+    # Existing flashcards become version 1; each existing quiz its own version
+    Generation = apps.get_model('core', 'Generation')
+    Flashcard = apps.get_model('core', 'Flashcard')
+    Quiz = apps.get_model('core', 'Quiz')
+
+    for document_id in Flashcard.objects.order_by().values_list('document_id', flat=True).distinct():
+        cards = Flashcard.objects.filter(document_id=document_id)
+        generation = Generation.objects.create(
+            document_id=document_id, kind='flashcards', version=1, item_count=cards.count()
+        )
+        cards.update(generation=generation)
+
+    versions = {}
+    for quiz in Quiz.objects.order_by('created_at', 'id'):
+        versions[quiz.document_id] = versions.get(quiz.document_id, 0) + 1
+        quiz.generation = Generation.objects.create(
+            document_id=quiz.document_id, kind='quiz', version=versions[quiz.document_id],
+            item_count=quiz.questions.count()
+        )
+        quiz.save(update_fields=['generation'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_llmcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Generation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('flashcards', 'Flashcards'), ('quiz', 'Quiz')], max_length=20)),
+                ('version', models.IntegerField()),
+                ('item_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generations', to='core.document')),
+            ],
+            options={
+                'ordering': ['-version'],
+            },
+        ),
+        migrations.AddField(
+            model_name='flashcard',
+            name='generation',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='flashcards', to='core.generation'),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='generation',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='quiz', to='core.generation'),
+        ),
+        migrations.AddConstraint(
+            model_name='generation',
+            constraint=models.UniqueConstraint(fields=('document', 'kind', 'version'), name='unique_generation_version'),
+        ),
+        migrations.RunPython(version_existing_sets, migrations.RunPython.noop),
+    ]
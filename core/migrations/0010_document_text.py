@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-18 05:30
+
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def compress_extracted_text(apps, schema_editor):
+    # Move each document's text into the compressed side table
+    Document = apps.get_model('core', 'Document')
+    DocumentText = apps.get_model('core', 'DocumentText')
+    for document in Document.objects.exclude(extracted_text__isnull=True).exclude(extracted_text='').iterator():
+        data = zlib.compress(document.extracted_text.encode('utf-8'), 6)
+        DocumentText.objects.create(document=document, codec='zlib', data=data, compressed_size=len(data))
+        document.text_length = len(document.extracted_text)
+        document.save(update_fields=['text_length'])
+
+
+def decompress_extracted_text(apps, schema_editor):
+    Document = apps.get_model('core', 'Document')
+    DocumentText = apps.get_model('core', 'DocumentText')
+    for stored in DocumentText.objects.iterator():
+        Document.objects.filter(pk=stored.document_id).update(
+            extracted_text=zlib.decompress(bytes(stored.data)).decode('utf-8')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentText',
+            fields=[
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text', serialize=False, to='core.document')),
+                ('codec', models.CharField(default='zlib', max_length=10)),
+                ('data', models.BinaryField()),
+                ('compressed_size', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='text_length',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(compress_extracted_text, decompress_extracted_text),
+        migrations.RemoveField(
+            model_name='document',
+            name='extracted_text',
+        ),
+    ]
@@ -4,18 +4,73 @@ import json
 
 class Document(models.Model):
     """Model to store uploaded PDF documents."""
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     title = models.CharField(max_length=255)
     file = models.FileField(upload_to='uploads/')
-    extracted_text = models.TextField(blank=True, null=True)
+    text_length = models.IntegerField(default=0)  # Characters of extracted text (stored in DocumentText)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of the file
+    page_count = models.IntegerField(default=0)
+    has_text_layer = models.BooleanField(default=False)
+    pdf_metadata = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    pages_done = models.IntegerField(default=0)  # Extraction progress
+    status_error = models.TextField(blank=True)
+    status_updated_at = models.DateTimeField(null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.title
 
+    @property
+    def text_extracted(self) -> bool:
+        """True once extraction has finished with usable text."""
+        return self.status == self.STATUS_READY
+
     class Meta:
         ordering = ['-uploaded_at']
 
 
+class DocumentText(models.Model):
+    """Model to store a document's full extracted text, compressed, apart from the Document row."""
+    CODEC_ZLIB = 'zlib'
+
+    document = models.OneToOneField(Document, on_delete=models.CASCADE, primary_key=True, related_name='text')
+    codec = models.CharField(max_length=10, default=CODEC_ZLIB)
+    data = models.BinaryField()
+    compressed_size = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Text of {self.document.title}"
+
+
+class DocumentPage(models.Model):
+    """Model to store the extracted text of a single PDF page."""
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='pages')
+    page_number = models.IntegerField()  # 1-based
+    text = models.TextField(blank=True)
+    char_count = models.IntegerField(default=0)
+    has_text = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"Page {self.page_number} of {self.document.title}"
+
+    class Meta:
+        ordering = ['page_number']
+        indexes = [
+            models.Index(fields=['document', 'page_number']),
+        ]
+
+
 class Summary(models.Model):
     """Model to store generated summaries."""
     document = models.OneToOneField(Document, on_delete=models.CASCADE, related_name='summary')
@@ -26,9 +81,52 @@ class Summary(models.Model):
         return f"Summary for {self.document.title}"
 
 
+class SummaryChunk(models.Model):
+    """Model to store intermediate summaries of page-aligned chunks (map step)."""
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='summary_chunks')
+    index = models.IntegerField()
+    page_start = models.IntegerField()
+    page_end = models.IntegerField()
+    source_hash = models.CharField(max_length=40)  # SHA-1 of the chunk text
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Summary of pages {self.page_start}-{self.page_end} for {self.document.title}"
+
+    class Meta:
+        ordering = ['index']
+
+
+class Generation(models.Model):
+    """Model to store one version of a document's generated flashcards or quiz."""
+    KIND_FLASHCARDS = 'flashcards'
+    KIND_QUIZ = 'quiz'
+    KIND_CHOICES = [
+        (KIND_FLASHCARDS, 'Flashcards'),
+        (KIND_QUIZ, 'Quiz'),
+    ]
+
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='generations')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    version = models.IntegerField()  # 1, 2, ... per document and kind
+    item_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} v{self.version} for {self.document.title}"
+
+    class Meta:
+        ordering = ['-version']
+        constraints = [
+            models.UniqueConstraint(fields=['document', 'kind', 'version'], name='unique_generation_version'),
+        ]
+
+
 class Flashcard(models. Model):
     """Model to store flashcards."""
     document = models.ForeignKey(Document, on_delete=models. CASCADE, related_name='flashcards')
+    generation = models.ForeignKey(Generation, on_delete=models.CASCADE, related_name='flashcards', null=True)
     question = models.TextField()
     answer = models.TextField()
     order = models.IntegerField(default=0)
@@ -44,6 +142,7 @@ class Flashcard(models. Model):
 class Quiz(models.Model):
     """Model to store quizzes."""
     document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='quizzes')
+    generation = models.OneToOneField(Generation, on_delete=models.CASCADE, related_name='quiz', null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -63,4 +162,20 @@ class QuizQuestion(models.Model):
         return f"Question {self.order} for Quiz {self.quiz. id}"
 
     class Meta:
-        ordering = ['order']
\ No newline at end of file
+        ordering = ['order']
+
+class LLMCacheEntry(models.Model):
+    """Model to store a cached LLM response for an exact prompt and generation options."""
+    key = models.CharField(max_length=64, unique=True)  # SHA-256 of model, prompt and options
+    model = models.CharField(max_length=100)
+    prompt_hash = models.CharField(max_length=64)
+    temperature = models.FloatField()
+    num_predict = models.IntegerField()
+    response = models.TextField()
+    size = models.IntegerField(default=0)  # Bytes of prompt hash + response, for eviction
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Cached {self.model} response {self.key[:12]}"
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from . import metrics
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, message: str, retry_after: float = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call is rejected at once. Once ``recovery_timeout`` seconds have
+    passed it goes half-open and lets up to ``half_open_max_calls`` probe
+    calls through: a success closes the circuit, a failure opens it again.
+    Transitions are counted in metrics as ``circuit.<name>.<from>_to_<to>``.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout: float = 30,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        metrics.set_gauge(f'circuit.{self.name}.state', self._state)
+
+    def _transition(self, state: str) -> None:
+        # Caller holds the lock
+        if state == self._state:
+            return
+        metrics.incr(f'circuit.{self.name}.{self._state}_to_{state}')
+        metrics.set_gauge(f'circuit.{self.name}.state', state)
+        print(f"[Circuit] {self.name}: {self._state} -> {state}")
+        self._state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if state != self.HALF_OPEN:
+            self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if the circuit is open, without reserving a call."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return
+            remaining = self.recovery_timeout - (time.monotonic() - self._opened_at)
+            if remaining > 0:
+                metrics.incr(f'circuit.{self.name}.rejected')
+                raise CircuitOpenError(
+                    f"{self.name} is unavailable after {self._failures} consecutive failures; "
+                    f"retrying in {int(remaining) + 1}s.",
+                    retry_after=remaining
+                )
+
+    def before_call(self) -> None:
+        """Reserve a call, or raise CircuitOpenError if it must be rejected."""
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    metrics.incr(f'circuit.{self.name}.rejected')
+                    raise CircuitOpenError(
+                        f"{self.name} is unavailable after {self._failures} consecutive failures; "
+                        f"retrying in {int(remaining) + 1}s.",
+                        retry_after=remaining
+                    )
+                self._transition(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    metrics.incr(f'circuit.{self.name}.rejected')
+                    raise CircuitOpenError(
+                        f"{self.name} is recovering; a probe request is already in flight.",
+                        retry_after=1
+                    )
+                self._half_open_calls += 1
+
+    def release_probe(self) -> None:
+        """Give back a call reserved by before_call() that ended with neither outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(self.OPEN)
+                # Restart the timer even if we were already open
+                self._opened_at = time.monotonic()
@@ -0,0 +1,182 @@
+import hashlib
+import io
+
+from django.db import transaction
+from django.db.models import Max
+
+from ..models import Document, DocumentPage, Summary, SummaryChunk
+from .generation_service import current_flashcards, current_quiz, save_flashcards, save_quiz
+from .pdf_service import format_pages, iter_pdf_pages
+from .text_store import copy_text, save_text
+
+
+def hash_uploaded_file(uploaded_file) -> str:
+    """
+    Compute the SHA-256 digest of an uploaded file.
+
+    Only used when the digest was not already computed by
+    HashingUploadHandler while the upload streamed in.
+    """
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def find_duplicate(content_hash: str, exclude_id: int = None):
+    """Return the oldest document with the same content hash, if any."""
+    if not content_hash:
+        return None
+
+    duplicates = Document.objects.filter(content_hash=content_hash)
+    if exclude_id is not None:
+        duplicates = duplicates.exclude(id=exclude_id)
+
+    # Prefer a copy that already has its text extracted
+    return (
+        duplicates.filter(text_length__gt=0).order_by('uploaded_at').first()
+        or duplicates.order_by('uploaded_at').first()
+    )
+
+
+def copy_artifacts(source: Document, target: Document) -> None:
+    """
+    Copy extracted text, pages and generated study material between documents.
+
+    Used when an upload is identical to an existing document, so the
+    extraction and the LLM calls do not have to be repeated.
+    """
+    copy_text(source, target)
+    target.page_count = source.page_count
+    target.has_text_layer = source.has_text_layer
+    target.pdf_metadata = source.pdf_metadata
+    target.pages_done = source.page_count
+    target.status = Document.STATUS_READY
+    target.save(update_fields=[
+        'text_length', 'page_count', 'has_text_layer', 'pdf_metadata', 'pages_done', 'status'
+    ])
+
+    DocumentPage.objects.bulk_create([
+        DocumentPage(
+            document=target,
+            page_number=page.page_number,
+            text=page.text,
+            char_count=page.char_count,
+            has_text=page.has_text
+        )
+        for page in source.pages.all()
+    ], batch_size=500)
+
+    try:
+        Summary.objects.update_or_create(
+            document=target,
+            defaults={'content': source.summary.content}
+        )
+    except Summary.DoesNotExist:
+        pass
+
+    SummaryChunk.objects.bulk_create([
+        SummaryChunk(
+            document=target,
+            index=chunk.index,
+            page_start=chunk.page_start,
+            page_end=chunk.page_end,
+            source_hash=chunk.source_hash,
+            content=chunk.content
+        )
+        for chunk in source.summary_chunks.all()
+    ])
+
+    # Only the current versions of the flashcards and quiz are copied
+    cards = [{'question': card.question, 'answer': card.answer} for card in current_flashcards(source)]
+    if cards:
+        save_flashcards(target, cards)
+
+    quiz = current_quiz(source)
+    if quiz:
+        save_quiz(target, [
+            {
+                'question_text': question.question_text,
+                'options': question.options,
+                'correct_answer': question.correct_answer,
+                'explanation': question.explanation,
+            }
+            for question in quiz.questions.all()
+        ])
+
+
+def ingest_document(document: Document, batch_size: int = 100, on_progress=None) -> None:
+    """
+    Extract a document's PDF in a single pass.
+
+    The file is opened once; page count, metadata and the text-layer flag
+    are stored on the document, and pages are written to DocumentPage in
+    batches as they are extracted, so memory stays flat for large files.
+    Pages left by an earlier run are removed in the same transaction that
+    stores the new text, so the document never loses its pages or shows
+    two copies of them once extraction has finished.
+
+    Args:
+        document: Document to extract
+        batch_size: Number of pages written per bulk insert
+        on_progress: Optional callable(pages_done, page_count), called
+            after each batch is written
+    """
+    info = {}
+    text_buffer = io.StringIO()
+    batch = []
+
+    # New rows get higher ids, so earlier pages can be told apart at the end
+    previous_pages = document.pages.aggregate(last_id=Max('id'))['last_id']
+
+    for page_number, text in iter_pdf_pages(document.file.path, info):
+        batch.append(DocumentPage(
+            document=document,
+            page_number=page_number,
+            text=text,
+            char_count=len(text),
+            has_text=bool(text)
+        ))
+        if len(batch) >= batch_size:
+            DocumentPage.objects.bulk_create(batch)
+            batch = []
+            if on_progress:
+                on_progress(page_number, info['num_pages'])
+
+        # Same layout as format_pages()
+        if text:
+            if text_buffer.tell():
+                text_buffer.write("\n\n")
+            text_buffer.write(f"--- Page {page_number} ---\n{text}")
+
+    if batch:
+        DocumentPage.objects.bulk_create(batch)
+    if on_progress:
+        on_progress(info.get('num_pages', 0), info.get('num_pages', 0))
+
+    document.page_count = info.get('num_pages', 0)
+    document.has_text_layer = info.get('has_text', False)
+    document.pdf_metadata = info.get('metadata') or {}
+    full_text = text_buffer.getvalue()
+    meaningful = len(full_text.strip()) >= 50
+
+    with transaction.atomic():
+        if previous_pages is not None:
+            document.pages.filter(id__lte=previous_pages).delete()
+        document.save(update_fields=['page_count', 'has_text_layer', 'pdf_metadata'])
+        if meaningful:
+            save_text(document, full_text)
+
+    if not meaningful:
+        raise Exception("Could not extract meaningful text from PDF.  The document may be scanned or image-based.")
+
+
+def get_page_range_text(document: Document, page_start: int, page_end: int) -> str:
+    """Return the marked-up text for pages page_start..page_end (inclusive)."""
+    pages = document.pages.filter(
+        page_number__gte=page_start,
+        page_number__lte=page_end,
+        has_text=True
+    ).values_list('page_number', 'text')
+    return format_pages(pages)
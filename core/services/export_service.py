@@ -0,0 +1,168 @@
+import csv
+import json
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.utils.html import escape
+from django.utils.text import slugify
+
+from ..models import Document, Flashcard, Quiz
+
+
+FORMATS = {
+    # format -> (content type, file extension)
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'anki': ('text/plain', 'txt'),
+}
+KINDS = ('flashcards', 'quiz', 'all')
+
+CSV_COLUMNS = [
+    'type', 'document_id', 'document', 'question', 'answer',
+    'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer', 'explanation',
+]
+LETTERS = 'ABCD'
+
+
+def _documents(document_ids=None):
+    """
+    Documents with their flashcards and quiz questions, fetched in chunks.
+
+    iterator() with a chunk size runs the prefetch queries once per chunk,
+    so memory depends on the chunk size, not on the size of the export.
+    """
+    documents = Document.objects.only('id', 'title').order_by('id').prefetch_related(
+        Prefetch('flashcards', queryset=Flashcard.objects.order_by('-generation_id', 'order')),
+        Prefetch('quizzes', queryset=Quiz.objects.order_by('-generation_id', '-id')),
+        'quizzes__questions',
+    )
+    if document_ids:
+        documents = documents.filter(id__in=document_ids)
+    return documents.iterator(chunk_size=getattr(settings, 'EXPORT_CHUNK_SIZE', 100))
+
+
+def iter_items(kind: str = 'all', document_ids=None):
+    """
+    Yield (type, document, item) for the current flashcards and quiz of each document.
+
+    Only the newest version is exported; the prefetches are ordered so it
+    comes first.
+    """
+    for document in _documents(document_ids):
+        if kind in ('flashcards', 'all'):
+            for _, cards in groupby(document.flashcards.all(), key=lambda card: card.generation_id):
+                for card in cards:
+                    yield 'flashcard', document, card
+                break
+
+        if kind in ('quiz', 'all'):
+            quiz = next(iter(document.quizzes.all()), None)
+            if quiz is not None:
+                for question in quiz.questions.all():
+                    yield 'quiz_question', document, question
+
+        # Prefetched items point back at their document, a cycle that would
+        # otherwise keep every chunk alive until the garbage collector runs
+        document._prefetched_objects_cache = {}
+
+
+def _as_dict(item_type: str, document: Document, item) -> dict:
+    if item_type == 'flashcard':
+        return {
+            'type': item_type,
+            'document_id': document.id,
+            'document': document.title,
+            'question': item.question,
+            'answer': item.answer,
+        }
+    return {
+        'type': item_type,
+        'document_id': document.id,
+        'document': document.title,
+        'question': item.question_text,
+        'options': item.options,
+        'correct_answer': item.correct_answer,
+        'explanation': item.explanation or '',
+    }
+
+
+class _Echo:
+    """File-like object for csv.writer that returns each line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(items):
+    """One row per item; quiz rows also fill the option columns and answer with the correct option."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for item_type, document, item in items:
+        row = _as_dict(item_type, document, item)
+        if item_type == 'quiz_question':
+            options = ([str(option) for option in row['options']] + [''] * 4)[:4]
+            correct = row['correct_answer'] if 0 <= row['correct_answer'] < 4 else None
+            row.update(zip(('option_a', 'option_b', 'option_c', 'option_d'), options))
+            row['answer'] = options[correct] if correct is not None else ''
+            row['correct_answer'] = LETTERS[correct] if correct is not None else ''
+        yield writer.writerow([row.get(column, '') for column in CSV_COLUMNS])
+
+
+def _jsonl_lines(items):
+    for item_type, document, item in items:
+        yield json.dumps(_as_dict(item_type, document, item), ensure_ascii=False) + '\n'
+
+
+def _anki_field(text: str) -> str:
+    return escape(text or '').replace('\t', ' ').replace('\r\n', '<br>').replace('\n', '<br>')
+
+
+def _anki_lines(items):
+    """
+    Anki's plain-text import format: one note per line, front, back and tags.
+
+    Quiz questions become notes with the options on the front and the
+    correct option and explanation on the back.
+    """
+    yield '#separator:tab\n#html:true\n#tags column:3\n'
+    for item_type, document, item in items:
+        tag = slugify(document.title)[:50] or f'document-{document.id}'
+        if item_type == 'flashcard':
+            front, back = _anki_field(item.question), _anki_field(item.answer)
+        else:
+            options = item.options or []
+            front = _anki_field(item.question_text) + '<br><br>' + '<br>'.join(
+                f"{LETTERS[i]}. {_anki_field(str(option))}" for i, option in enumerate(options[:4])
+            )
+            correct = item.correct_answer
+            back = (f"{LETTERS[correct]}. {_anki_field(str(options[correct]))}"
+                    if 0 <= correct < min(len(options), 4) else '')
+            if item.explanation:
+                back += '<br><br>' + _anki_field(item.explanation)
+        yield f"{front}\t{back}\tfutured {tag}\n"
+
+
+def export_lines(fmt: str, kind: str = 'all', document_ids=None):
+    """
+    Stream study material as CSV, JSONL or an Anki import file.
+
+    Args:
+        fmt: One of FORMATS
+        kind: 'flashcards', 'quiz' or 'all'
+        document_ids: Documents to export (default: all of them)
+
+    Yields:
+        Lines of the export, ready to write or stream
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if kind not in KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+
+    items = iter_items(kind, document_ids)
+    if fmt == 'csv':
+        return _csv_lines(items)
+    if fmt == 'jsonl':
+        return _jsonl_lines(items)
+    return _anki_lines(items)
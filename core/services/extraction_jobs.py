@@ -0,0 +1,166 @@
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Document
+from .document_service import copy_artifacts, ingest_document
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Documents queued or running in this process, and when it started taking jobs
+_active = set()
+_active_lock = threading.Lock()
+_started_at = timezone.now()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide extraction worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'EXTRACTION_JOB_WORKERS', 2),
+                thread_name_prefix='extraction'
+            )
+        return _executor
+
+
+def _set_status(document_id: int, **fields) -> None:
+    fields['status_updated_at'] = timezone.now()
+    Document.objects.filter(id=document_id).update(**fields)
+
+
+def _queue(document_id: int) -> None:
+    """Submit a document to the worker pool unless it is already queued here."""
+    with _active_lock:
+        if document_id in _active:
+            return
+        _active.add(document_id)
+    _get_executor().submit(_run_extraction, document_id)
+
+
+def _run_extraction(document_id: int) -> None:
+    """Extract a document's text in a worker thread, recording progress."""
+    close_old_connections()
+    try:
+        # Claim the pending job, so a copy queued elsewhere never runs alongside it
+        claimed = Document.objects.filter(id=document_id, status=Document.STATUS_PENDING).update(
+            status=Document.STATUS_PROCESSING, pages_done=0, status_error='', status_updated_at=timezone.now()
+        )
+        if not claimed:
+            return
+        document = Document.objects.get(id=document_id)
+
+        # Every progress update doubles as the job's heartbeat
+        def on_progress(pages_done, page_count):
+            _set_status(document_id, pages_done=pages_done, page_count=page_count)
+
+        try:
+            ingest_document(document, batch_size=getattr(settings, 'EXTRACTION_PROGRESS_BATCH', 25), on_progress=on_progress)
+            _set_status(document_id, status=Document.STATUS_READY)
+            print(f"[Extraction] Document {document_id} ready ({document.page_count} pages)")
+        except Exception as e:
+            print(f"Error extracting text: {e}")
+            traceback.print_exc()
+            _set_status(document_id, status=Document.STATUS_FAILED, status_error=str(e))
+
+        _finish_duplicates(document_id)
+
+    except Document.DoesNotExist:
+        pass
+    except Exception:
+        traceback.print_exc()
+    finally:
+        with _active_lock:
+            _active.discard(document_id)
+        connection.close()
+
+
+def _finish_duplicates(original_id: int) -> None:
+    """
+    Give identical uploads waiting on a document the result of its extraction.
+
+    Each waiting copy is claimed first (pending -> processing), so it is
+    filled only once even if this runs twice.
+    """
+    original = Document.objects.get(id=original_id)
+    if original.status not in (Document.STATUS_READY, Document.STATUS_FAILED):
+        return
+
+    waiting = Document.objects.filter(
+        content_hash=original.content_hash, status=Document.STATUS_PENDING, text_length=0
+    ).exclude(id=original.id)
+    for duplicate in waiting:
+        claimed = Document.objects.filter(id=duplicate.id, status=Document.STATUS_PENDING).update(
+            status=Document.STATUS_PROCESSING, status_updated_at=timezone.now()
+        )
+        if not claimed:
+            continue
+        if original.status == Document.STATUS_READY:
+            copy_artifacts(original, duplicate)
+            print(f"[Extraction] Document {duplicate.id} copied from document {original.id}")
+        else:
+            _set_status(duplicate.id, status=Document.STATUS_FAILED, status_error=original.status_error)
+
+
+def submit_extraction(document: Document, original: Document = None) -> None:
+    """
+    Queue a document for background extraction.
+
+    The job is submitted once the current transaction commits, so the worker
+    always sees the saved document row. An identical upload (``original``)
+    whose file is still being extracted is not extracted again: the
+    document waits and is given the original's text when that job ends.
+    """
+    _set_status(document.id, status=Document.STATUS_PENDING, pages_done=0, status_error='')
+    document_id = document.id
+    if original is not None and original.status in (Document.STATUS_PENDING, Document.STATUS_PROCESSING):
+        # Also covers an original that finished before this document was saved
+        original_id = original.id
+        transaction.on_commit(lambda: _finish_duplicates(original_id))
+        return
+    transaction.on_commit(lambda: _queue(document_id))
+
+
+def resume_stale_extraction(document: Document) -> bool:
+    """
+    Re-queue a document whose extraction job was lost.
+
+    Jobs live in the web process, so a restart drops them; documents left
+    behind are picked up again the next time their progress is polled.
+    A processing job is lost when its heartbeat (the last progress update)
+    is older than EXTRACTION_STALE_SECONDS. A pending job is lost only if it
+    was queued before this process started: one waiting in this process's
+    queue behind long extractions is never re-queued.
+    Returns True if the job was re-queued.
+    """
+    if document.status == Document.STATUS_PROCESSING:
+        stale_after = getattr(settings, 'EXTRACTION_STALE_SECONDS', 120)
+        lost = Q(status=Document.STATUS_PROCESSING, status_updated_at__lt=timezone.now() - timedelta(seconds=stale_after))
+    elif document.status == Document.STATUS_PENDING:
+        lost = Q(status=Document.STATUS_PENDING, status_updated_at__lt=_started_at)
+    else:
+        return False
+
+    with _active_lock:
+        if document.id in _active:
+            return False
+
+    # Claim the document atomically so only one process re-queues it
+    claimed = Document.objects.filter(lost, id=document.id).update(
+        status=Document.STATUS_PENDING, status_updated_at=timezone.now()
+    )
+
+    if claimed:
+        print(f"[Extraction] Re-queueing stale job for document {document.id}")
+        document_id = document.id
+        transaction.on_commit(lambda: _queue(document_id))
+    return bool(claimed)
@@ -0,0 +1,94 @@
+# JSON schemas for Ollama's ``format`` parameter. Decoding is constrained to
+# this shape, so responses almost always parse; the validators below confirm
+# each item is usable before it is saved.
+FLASHCARDS_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'question': {'type': 'string'},
+            'answer': {'type': 'string'},
+        },
+        'required': ['question', 'answer'],
+    },
+}
+
+QUIZ_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'question': {'type': 'string'},
+            'options': {
+                'type': 'array',
+                'items': {'type': 'string'},
+                'minItems': 4,
+                'maxItems': 4,
+            },
+            'correct_answer': {'type': 'integer', 'minimum': 0, 'maximum': 3},
+            'explanation': {'type': 'string'},
+        },
+        'required': ['question', 'options', 'correct_answer', 'explanation'],
+    },
+}
+
+
+def _text(value) -> str:
+    return value.strip() if isinstance(value, str) else ''
+
+
+def validate_flashcard(item):
+    """Return a clean flashcard dict, or None if the item isn't usable."""
+    if not isinstance(item, dict):
+        return None
+
+    question = _text(item.get('question'))
+    answer = _text(item.get('answer'))
+    if not question or not answer:
+        return None
+
+    return {'question': question, 'answer': answer}
+
+
+def validate_question(item):
+    """Return a clean quiz question dict, or None if the item isn't usable."""
+    if not isinstance(item, dict):
+        return None
+
+    question = _text(item.get('question'))
+    options = item.get('options')
+    if not question or not isinstance(options, list) or len(options) != 4:
+        return None
+
+    options = [_text(option) for option in options]
+    if not all(options) or len({option.lower() for option in options}) != 4:
+        return None
+
+    correct_answer = item.get('correct_answer')
+    if isinstance(correct_answer, str):
+        # Accept "B" or "1"; anything else is treated as missing
+        value = correct_answer.strip().upper()
+        if value in ('A', 'B', 'C', 'D'):
+            correct_answer = ord(value) - ord('A')
+        elif value.isdigit():
+            correct_answer = int(value)
+    if isinstance(correct_answer, bool) or not isinstance(correct_answer, int) or not 0 <= correct_answer <= 3:
+        return None
+
+    return {
+        'question': question,
+        'options': options,
+        'correct_answer': correct_answer,
+        'explanation': _text(item.get('explanation')),
+    }
+
+
+SCHEMAS = {
+    'flashcards': FLASHCARDS_SCHEMA,
+    'quiz': QUIZ_SCHEMA,
+}
+
+VALIDATORS = {
+    'flashcards': validate_flashcard,
+    'quiz': validate_question,
+}
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from ..models import Document, Generation, Flashcard, Quiz, QuizQuestion
+
+
+def _new_generation(document: Document, kind: str, item_count: int) -> Generation:
+    """Create the next version record; the caller holds a transaction."""
+    latest = document.generations.filter(kind=kind).aggregate(Max('version'))['version__max'] or 0
+    return Generation.objects.create(document=document, kind=kind, version=latest + 1, item_count=item_count)
+
+
+def prune_generations(document: Document, kind: str) -> int:
+    """Delete versions of ``kind`` beyond the newest GENERATION_RETENTION; return how many."""
+    keep = max(1, getattr(settings, 'GENERATION_RETENTION', 3))
+    stale = list(
+        document.generations.filter(kind=kind).order_by('-version').values_list('id', flat=True)[keep:]
+    )
+    if stale:
+        # Cascades to the flashcards or quiz questions of those versions
+        Generation.objects.filter(id__in=stale).delete()
+    return len(stale)
+
+
+def current_generation(document: Document, kind: str):
+    """Return the newest committed version of ``kind``, or None."""
+    return document.generations.filter(kind=kind).order_by('-version').first()
+
+
+def save_flashcards(document: Document, cards: list) -> list:
+    """
+    Store flashcards as the document's next version.
+
+    ``cards`` are dicts of Flashcard fields (question, answer). The version
+    and all its cards are written in one transaction, so readers keep
+    seeing the previous version until it commits, and a failure leaves it
+    untouched. Returns the saved Flashcard objects.
+    """
+    with transaction.atomic():
+        generation = _new_generation(document, Generation.KIND_FLASHCARDS, len(cards))
+        saved = Flashcard.objects.bulk_create([
+            Flashcard(document=document, generation=generation, order=i, **card)
+            for i, card in enumerate(cards)
+        ])
+        prune_generations(document, Generation.KIND_FLASHCARDS)
+    return saved
+
+
+def save_quiz(document: Document, questions: list):
+    """
+    Store a quiz as the document's next version; see save_flashcards.
+
+    ``questions`` are dicts of QuizQuestion fields. Returns the Quiz and
+    its saved QuizQuestion objects.
+    """
+    with transaction.atomic():
+        generation = _new_generation(document, Generation.KIND_QUIZ, len(questions))
+        quiz = Quiz.objects.create(document=document, generation=generation)
+        saved = QuizQuestion.objects.bulk_create([
+            QuizQuestion(quiz=quiz, order=i, **question)
+            for i, question in enumerate(questions)
+        ])
+        prune_generations(document, Generation.KIND_QUIZ)
+    return quiz, saved
+
+
+def current_flashcards(document: Document):
+    """The flashcards of the newest version."""
+    generation = current_generation(document, Generation.KIND_FLASHCARDS)
+    return generation.flashcards.all() if generation else Flashcard.objects.none()
+
+
+def current_quiz(document: Document):
+    """The quiz of the newest version, or None."""
+    generation = current_generation(document, Generation.KIND_QUIZ)
+    return Quiz.objects.filter(generation=generation).first() if generation else None
@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from . import metrics
+
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class _Waiter:
+    """A queued request for a slot; ``wake`` is called when the slot is handed over."""
+    __slots__ = ('priority', 'seq', 'wake', 'granted', 'cancelled')
+
+    def __init__(self, priority: int, seq: int, wake):
+        self.priority = priority
+        self.seq = seq
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class InferenceScheduler:
+    """
+    Limits in-flight model calls and merges identical ones.
+
+    At most ``max_in_flight`` calls run at once; the rest queue and are
+    started in priority order (then arrival order) as slots free up. Calls
+    with the same key that overlap share one execution: the first caller
+    runs it and every later caller gets its result (singleflight).
+
+    Works from threads (``run``) and from async views (``arun``); both share
+    the same slots. Queue depth, in-flight count and wait time are recorded
+    in metrics under ``scheduler.*``.
+    """
+
+    def __init__(self, max_in_flight: int = 2):
+        self.max_in_flight = max_in_flight
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._flights = {}
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        # Caller holds the lock (or is __init__)
+        metrics.set_gauge('scheduler.in_flight', self._in_flight)
+        metrics.set_gauge('scheduler.queue_depth', sum(1 for w in self._waiters if not w.cancelled))
+
+    def _try_acquire(self, priority: int, wake):
+        """Take a free slot (returns None) or queue a waiter (returns it)."""
+        with self._lock:
+            if self._in_flight < self.max_in_flight and not self._waiters:
+                self._in_flight += 1
+                self._update_gauges()
+                return None
+            waiter = _Waiter(priority, next(self._seq), wake)
+            heapq.heappush(self._waiters, waiter)
+            self._update_gauges()
+            return waiter
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Block until a slot is free."""
+        start = time.monotonic()
+        event = threading.Event()
+        if self._try_acquire(priority, event.set) is not None:
+            event.wait()
+        metrics.observe('scheduler.wait_seconds', time.monotonic() - start)
+
+    async def acquire_async(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Wait for a free slot without blocking the event loop."""
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            if not granted.done():
+                granted.set_result(None)
+
+        waiter = self._try_acquire(priority, lambda: loop.call_soon_threadsafe(grant))
+        if waiter is not None:
+            try:
+                await granted
+            except asyncio.CancelledError:
+                with self._lock:
+                    handed_over = waiter.granted
+                    waiter.cancelled = True
+                    self._update_gauges()
+                if handed_over:
+                    self.release()  # The slot arrived as we were cancelled
+                raise
+        metrics.observe('scheduler.wait_seconds', time.monotonic() - start)
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the next waiter if there is one."""
+        with self._lock:
+            while self._waiters:
+                waiter = heapq.heappop(self._waiters)
+                if waiter.cancelled:
+                    continue
+                waiter.granted = True
+                self._update_gauges()
+                waiter.wake()
+                return
+            self._in_flight -= 1
+            self._update_gauges()
+
+    def _join(self, key):
+        """Return (future, is_leader) for the flight with this key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                metrics.incr('scheduler.coalesced')
+                return flight, False
+            flight = Future()
+            self._flights[key] = flight
+            return flight, True
+
+    def _land(self, key) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def run(self, key, fn, priority: int = PRIORITY_INTERACTIVE):
+        """Run ``fn()`` in a slot, or wait for an identical in-flight call."""
+        flight, leader = self._join(key)
+        if not leader:
+            return flight.result()
+
+        try:
+            self.acquire(priority)
+            try:
+                result = fn()
+            finally:
+                self.release()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            self._land(key)
+
+        flight.set_result(result)
+        return result
+
+    async def arun(self, key, coro_fn, priority: int = PRIORITY_INTERACTIVE):
+        """Async ``run``: await ``coro_fn()`` in a slot, or an identical in-flight call."""
+        flight, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(flight)
+
+        try:
+            await self.acquire_async(priority)
+            try:
+                result = await coro_fn()
+            finally:
+                self.release()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            self._land(key)
+
+        flight.set_result(result)
+        return result
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> InferenceScheduler:
+    """Get the process-wide scheduler for Ollama calls."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = InferenceScheduler(getattr(settings, 'OLLAMA_MAX_IN_FLIGHT', 2))
+        return _scheduler
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from ..models import LLMCacheEntry
+from . import metrics
+
+
+_cache_lock = threading.Lock()
+_cache_size = None  # Total bytes stored, summed from the table on first use
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'LLM_CACHE_ENABLED', True)
+
+
+def make_key(model: str, prompt: str, temperature: float, num_predict: int, extra: dict = None) -> tuple:
+    """
+    Build the cache key for a generation.
+
+    ``extra`` holds any other request fields that change the output, such
+    as the format schema or stop sequences.
+
+    Returns:
+        (key, prompt_hash): SHA-256 of the model, prompt and options, and of
+        the prompt alone
+    """
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8', 'ignore')).hexdigest()
+    raw = f"{model}\0{prompt_hash}\0{float(temperature)!r}\0{int(num_predict)}"
+    extra = {name: value for name, value in (extra or {}).items() if value}
+    if extra:
+        raw += f"\0{json.dumps(extra, sort_keys=True)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest(), prompt_hash
+
+
+def get(key: str):
+    """Return the cached response for a key (refreshing its LRU position), or None."""
+    entry = LLMCacheEntry.objects.filter(key=key).only('id', 'response').first()
+    if entry is None:
+        metrics.incr('llm_cache.misses')
+        return None
+
+    LLMCacheEntry.objects.filter(id=entry.id).update(
+        last_used_at=timezone.now(),
+        hits=F('hits') + 1
+    )
+    metrics.incr('llm_cache.hits')
+    return entry.response
+
+
+def put(key: str, prompt_hash: str, model: str, temperature: float, num_predict: int, response: str) -> None:
+    """Store a response, then evict least recently used entries over LLM_CACHE_MAX_BYTES."""
+    global _cache_size
+    size = len(response.encode('utf-8', 'ignore')) + len(prompt_hash)
+    fields = {
+        'model': model,
+        'prompt_hash': prompt_hash,
+        'temperature': temperature,
+        'num_predict': num_predict,
+        'response': response,
+        'size': size,
+        'last_used_at': timezone.now(),
+    }
+    try:
+        if not LLMCacheEntry.objects.filter(key=key).update(**fields):
+            LLMCacheEntry.objects.create(key=key, **fields)
+    except IntegrityError:
+        return  # Another request stored the same generation first
+    except DatabaseError as e:
+        # A cache write must never fail the generation itself
+        print(f"[LLMCache] Could not store response: {e}")
+        return
+
+    # A running total (an overestimate when an entry was replaced) decides
+    # when to look at the table; evict() recounts it from the table
+    max_bytes = getattr(settings, 'LLM_CACHE_MAX_BYTES', 50 * 1024 * 1024)
+    with _cache_lock:
+        if _cache_size is None:
+            _cache_size = _stored_bytes()
+        else:
+            _cache_size += size
+        over = _cache_size > max_bytes
+    if over:
+        evict(max_bytes)
+
+
+def _stored_bytes() -> int:
+    return LLMCacheEntry.objects.aggregate(total=Sum('size'))['total'] or 0
+
+
+def evict(max_bytes: int) -> int:
+    """Delete least recently used entries until the cache fits in max_bytes. Returns the count."""
+    global _cache_size
+    with _cache_lock:
+        total = _stored_bytes()
+        _cache_size = total
+        metrics.set_gauge('llm_cache.bytes', total)
+        if total <= max_bytes:
+            return 0
+
+        # Evict down to 90% so the next stores don't trigger it again at once
+        target = int(max_bytes * 0.9)
+        stale = []
+        for entry_id, size in LLMCacheEntry.objects.order_by('last_used_at').values_list('id', 'size').iterator():
+            if total <= target:
+                break
+            stale.append(entry_id)
+            total -= size
+
+        LLMCacheEntry.objects.filter(id__in=stale).delete()
+        _cache_size = total
+        metrics.incr('llm_cache.evictions', len(stale))
+        metrics.set_gauge('llm_cache.bytes', total)
+        print(f"[LLMCache] Evicted {len(stale)} entries")
+        return len(stale)
@@ -0,0 +1,51 @@
+import threading
+from collections import Counter
+
+
+_lock = threading.Lock()
+_counters = Counter()
+_timings = {}
+_gauges = {}
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Increment a process-wide counter."""
+    with _lock:
+        _counters[name] += amount
+
+
+def observe(name: str, value: float) -> None:
+    """Record a duration or size sample (count, total and max are kept)."""
+    with _lock:
+        stats = _timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += value
+        stats['max'] = max(stats['max'], value)
+
+
+def set_gauge(name: str, value) -> None:
+    """Record the current value of something (queue depth, breaker state, ...)."""
+    with _lock:
+        _gauges[name] = value
+
+
+def get(name: str) -> int:
+    with _lock:
+        return _counters[name]
+
+
+def snapshot() -> dict:
+    """Return a copy of all counters, timings and gauges in this process."""
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'timings': {
+                name: {
+                    'count': stats['count'],
+                    'avg': round(stats['total'] / stats['count'], 4) if stats['count'] else 0,
+                    'max': round(stats['max'], 4),
+                }
+                for name, stats in _timings.items()
+            },
+            'gauges': dict(_gauges),
+        }
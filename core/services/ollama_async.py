@@ -0,0 +1,121 @@
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import metrics, ollama_client, token_budget
+from .generation_schema import SCHEMAS
+from .inference_scheduler import PRIORITY_INTERACTIVE, get_scheduler
+from .ollama_monitor import get_monitor
+from .ollama_service import OllamaService
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """
+    Create an async HTTP client for Ollama.
+
+    An AsyncClient is bound to the event loop it is used on, so callers
+    create one per request (``async with new_async_client() as client``)
+    and share it between that request's concurrent generations.
+    """
+    connect, read = ollama_client.get_timeout()
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(read, connect=connect),
+        limits=httpx.Limits(max_connections=getattr(settings, 'OLLAMA_POOL_MAXSIZE', 10)),
+    )
+
+
+class AsyncOllamaService(OllamaService):
+    """
+    OllamaService for async views.
+
+    Prompts, parsing and the response cache are shared with OllamaService;
+    only the generate call is awaited on an httpx.AsyncClient, so the worker
+    is free while the model runs. Sync work (model lookup, cache reads and
+    writes) runs through sync_to_async.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, use_cache: bool = True,
+                 priority: int = PRIORITY_INTERACTIVE):
+        super().__init__(use_cache=use_cache, priority=priority)
+        self.client = client
+
+    async def _agenerate(self, prompt: str, temperature: float = 0.7, fmt: dict = None,
+                         options: dict = None) -> str:
+        """Send a prompt to Ollama and await the response, reusing a cached one if allowed."""
+        url = f"{self.base_url}/api/generate"
+        payload = await sync_to_async(self._build_payload)(
+            prompt, temperature, stream=False, fmt=fmt, options=options
+        )
+
+        cached, key = await sync_to_async(self._cache_lookup)(payload)
+        if cached is not None:
+            print(f"[Ollama] Cache hit ({len(cached)} chars)")
+            return cached
+
+        async def call():
+            breaker = ollama_client.get_breaker()
+            breaker.before_call()
+            metrics.incr('ollama.requests')
+            start = time.monotonic()
+
+            try:
+                response = await self.client.post(url, json=payload)
+            except httpx.TimeoutException:
+                breaker.record_failure()
+                raise Exception("Request timed out.  Try a shorter document.")
+            except httpx.ConnectError:
+                breaker.record_failure()
+                get_monitor().invalidate()
+                raise Exception("Cannot connect to Ollama.  Run 'ollama serve' first.")
+            except httpx.HTTPError as e:
+                breaker.record_failure()
+                raise Exception(f"Ollama error: {str(e)}")
+            except BaseException:
+                # Cancelled (the client went away): not a verdict on Ollama,
+                # but a half-open probe slot must not stay reserved
+                breaker.release_probe()
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.is_error:
+                raise Exception(f"Ollama error: HTTP {response.status_code}")
+
+            result = response.json()
+            generated = result.get('response', '')
+            token_budget.record_usage(payload['model'], len(prompt), result.get('prompt_eval_count'))
+            print(f"[Ollama] Generated {len(generated)} chars in {time.monotonic() - start:.1f}s (async)")
+
+            if not generated.strip():
+                raise Exception("Model returned empty response")
+
+            await sync_to_async(self._cache_store)(payload, key, generated)
+            return generated
+
+        # Shares slots and in-flight generations with the sync path
+        return await get_scheduler().arun(key[0], call, self.priority)
+
+    async def agenerate_summary(self, text: str) -> str:
+        """Generate a summary of the text."""
+        return await self._agenerate(self._summary_prompt(text), temperature=0.5, options=self._task_options('summary'))
+
+    async def agenerate_flashcards(self, text: str, num_cards: int = 5) -> list:
+        """Generate flashcards from text."""
+        response = await self._agenerate(
+            self._flashcards_prompt(text, num_cards), temperature=0.6,
+            fmt=SCHEMAS['flashcards'], options=self._task_options('flashcards', num_cards)
+        )
+        # Any follow-up calls for failing items use the sync path
+        return await sync_to_async(self.complete_items, thread_sensitive=False)('flashcards', text, response, num_cards)
+
+    async def agenerate_quiz(self, text: str, num_questions: int = 5) -> list:
+        """Generate quiz questions from text."""
+        response = await self._agenerate(
+            self._quiz_prompt(text, num_questions), temperature=0.6,
+            fmt=SCHEMAS['quiz'], options=self._task_options('quiz', num_questions)
+        )
+        return await sync_to_async(self.complete_items, thread_sensitive=False)('quiz', text, response, num_questions)
@@ -0,0 +1,125 @@
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from . import metrics
+from .circuit_breaker import CircuitBreaker
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """Connection pool that counts new TCP connections, to make reuse observable."""
+
+    def _new_conn(self):
+        metrics.incr('ollama.connections_opened')
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+
+    def _new_conn(self):
+        metrics.incr('ollama.connections_opened')
+        return super()._new_conn()
+
+
+class _OllamaAdapter(HTTPAdapter):
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+_session = None
+_session_lock = threading.Lock()
+_breaker = None
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session for Ollama.
+
+    The session keeps connections alive and pools up to OLLAMA_POOL_MAXSIZE
+    of them, so concurrent views share sockets instead of opening a new
+    TCP connection per call.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            adapter = _OllamaAdapter(
+                pool_connections=getattr(settings, 'OLLAMA_POOL_CONNECTIONS', 2),
+                pool_maxsize=getattr(settings, 'OLLAMA_POOL_MAXSIZE', 10),
+                max_retries=0
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['Connection'] = 'keep-alive'
+            _session = session
+        return _session
+
+
+def get_timeout(read: float = None) -> tuple:
+    """(connect, read) timeout for a request; read defaults to OLLAMA_READ_TIMEOUT."""
+    connect = getattr(settings, 'OLLAMA_CONNECT_TIMEOUT', 3.05)
+    if read is None:
+        read = getattr(settings, 'OLLAMA_READ_TIMEOUT', 300)
+    return (connect, read)
+
+
+def get_breaker() -> CircuitBreaker:
+    """Get the process-wide circuit breaker guarding Ollama calls."""
+    global _breaker
+    with _session_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                'Ollama',
+                failure_threshold=getattr(settings, 'OLLAMA_BREAKER_FAILURE_THRESHOLD', 3),
+                recovery_timeout=getattr(settings, 'OLLAMA_BREAKER_RECOVERY_SECONDS', 30),
+                half_open_max_calls=getattr(settings, 'OLLAMA_BREAKER_HALF_OPEN_CALLS', 1)
+            )
+        return _breaker
+
+
+def request(method: str, url: str, read_timeout: float = None, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session and record connection reuse.
+
+    Connection errors, timeouts and 5xx responses count as failures for the
+    circuit breaker; while it is open this raises CircuitOpenError at once.
+    With ``stream=True`` only a failure to connect is recorded here: the
+    caller records the outcome once the body has been read, since a model
+    can time out or report an error mid-stream.
+    """
+    breaker = get_breaker()
+    breaker.before_call()
+
+    metrics.incr('ollama.requests')
+    kwargs.setdefault('timeout', get_timeout(read_timeout))
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.exceptions.RequestException:
+        breaker.record_failure()
+        raise
+
+    if kwargs.get('stream'):
+        return response
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def connection_stats() -> dict:
+    requests_sent = metrics.get('ollama.requests')
+    opened = metrics.get('ollama.connections_opened')
+    return {
+        'requests': requests_sent,
+        'connections_opened': opened,
+        'reuse_ratio': round(1 - opened / requests_sent, 3) if requests_sent else 0.0,
+    }
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import requests
+from django.conf import settings
+
+from . import metrics, ollama_client
+
+
+class OllamaMonitor:
+    """
+    Keeps the latest Ollama status in memory, refreshed by a background thread.
+
+    One probe of /api/tags every ``interval`` seconds tells whether the
+    server is reachable and which models it has. Page renders, the status
+    endpoint and OllamaService read the snapshot instead of making their
+    own blocking calls. The probe bypasses the circuit breaker, so it keeps
+    noticing when Ollama comes back.
+    """
+
+    def __init__(self, base_url: str, interval: float = 15):
+        self.base_url = base_url.rstrip('/')
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked = 0.0  # time.monotonic() of the last probe
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the background probe (once per process)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='ollama-monitor', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            reachable = False
+            try:
+                reachable = self.refresh()['reachable']
+            except Exception as e:
+                print(f"[Ollama] Status probe failed: {e}")
+            # Probe more often while Ollama is down, so its return is noticed quickly
+            self._wake.wait(self.interval if reachable else min(self.interval, 3))
+            self._wake.clear()
+
+    def refresh(self) -> dict:
+        """Probe Ollama now and store the result."""
+        snapshot = {'reachable': False, 'models': [], 'error': None, 'checked_at': time.time()}
+        start = time.monotonic()
+
+        try:
+            response = ollama_client.get_session().get(
+                f"{self.base_url}/api/tags",
+                timeout=ollama_client.get_timeout(getattr(settings, 'OLLAMA_PROBE_TIMEOUT', 10))
+            )
+            snapshot['reachable'] = True
+            if response.status_code == 200:
+                snapshot['models'] = [m.get('name', '') for m in response.json().get('models', [])]
+            else:
+                snapshot['error'] = f"Ollama returned HTTP {response.status_code}"
+        except requests.exceptions.ConnectionError:
+            snapshot['error'] = f"Cannot connect to Ollama server at {self.base_url}"
+        except requests.exceptions.RequestException as e:
+            snapshot['error'] = str(e)
+        except ValueError:
+            snapshot['error'] = 'Ollama returned an invalid model list'
+
+        metrics.observe('ollama.probe_seconds', time.monotonic() - start)
+        metrics.set_gauge('ollama.reachable', snapshot['reachable'])
+        metrics.set_gauge('ollama.models', len(snapshot['models']))
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked = time.monotonic()
+        return snapshot
+
+    def snapshot(self, max_age: float = None) -> dict:
+        """
+        Return the latest status: reachable, models, error and checked_at.
+
+        Probes inline only when the snapshot is older than ``max_age``
+        seconds (default: three intervals, i.e. the thread has stopped) or
+        there is none yet.
+        """
+        self.start()
+        if max_age is None:
+            max_age = self.interval * 3
+        with self._lock:
+            snapshot = self._snapshot
+            stale = time.monotonic() - self._checked > max_age
+        if snapshot is None or stale:
+            snapshot = self.refresh()
+        return {**snapshot, 'models': list(snapshot['models'])}
+
+    def invalidate(self) -> None:
+        """Ask the background thread to probe again now."""
+        self._wake.set()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> OllamaMonitor:
+    """Get the process-wide Ollama status monitor."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = OllamaMonitor(
+                getattr(settings, 'OLLAMA_BASE_URL', 'http://localhost:11434'),
+                interval=getattr(settings, 'OLLAMA_MONITOR_INTERVAL', 15)
+            )
+        return _monitor
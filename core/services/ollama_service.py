@@ -1,49 +1,84 @@
 import requests
 import json
 import re
+import time
 from django.conf import settings
+from urllib3.exceptions import ReadTimeoutError
+
+from . import llm_cache, metrics, ollama_client, token_budget
+from .inference_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, get_scheduler
+from .ollama_monitor import get_monitor
+from .circuit_breaker import CircuitOpenError
+from .generation_schema import SCHEMAS, VALIDATORS
+from .stream_parser import parse_items
+from .text_selection import select_text
+
+
+# Output token ceilings per task; flashcards and quiz are per item requested
+DEFAULT_OUTPUT_TOKENS = {
+    'summary': 1024,
+    'chunk_summary': 512,
+    'reduce': 1024,
+    'flashcards': 120,
+    'quiz': 250,
+}
+
+# Fields a flashcard or quiz question recovered from a cut-off response must have
+FLASHCARD_KEYS = ('question', 'answer')
+QUESTION_KEYS = ('question', 'options', 'correct_answer')
 
 
 class OllamaService:
     """Service for interacting with Ollama LLM."""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, priority: int = PRIORITY_INTERACTIVE):
         self.base_url = getattr(settings, 'OLLAMA_BASE_URL', 'http://localhost:11434')
         self.model = getattr(settings, 'OLLAMA_MODEL', 'llama3.2:1b')
-        self.timeout = 300  # 5 minutes
+        self.timeout = ollama_client.get_timeout()  # (connect, read)
+        # False for regenerate requests: skip cached responses, but still store the new one
+        self.use_cache = use_cache
+        # Scheduling priority for this service's model calls (lower runs first)
+        self.priority = priority
     
-    def is_available(self) -> bool:
-        """Check if Ollama server is running."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                model_names = [m.get('name', '') for m in models]
-                
-                # Check for exact or partial match
-                for name in model_names: 
-                    if self.model == name or self.model in name or name.startswith(self.model. split(':')[0]):
-                        return True
-                
-                # If configured model not found but others exist, use first available
-                if models: 
-                    return True
-                    
-                return False
-            return False
-        except: 
+    def _fetch_models(self, max_age: float = None):
+        """Get model names from the background monitor's latest /api/tags probe. None if unreachable."""
+        snapshot = get_monitor().snapshot(max_age)
+        if not snapshot['reachable'] or snapshot['error']:
+            return None
+        return snapshot['models']
+    
+    def check_circuit(self) -> None:
+        """Fail fast with CircuitOpenError while Ollama is known to be down."""
+        ollama_client.get_breaker().check()
+    
+    def is_available(self, recheck: bool = True) -> bool:
+        """
+        Check if Ollama server is running.
+        
+        With ``recheck``, a snapshot saying Ollama is down is confirmed with
+        a fresh probe (at most one a second), since it may have just started;
+        page renders pass False and report the snapshot as it is.
+        """
+        model_names = self._fetch_models()
+        if model_names is None and recheck:
+            model_names = self._fetch_models(max_age=1)
+        if model_names is None:
             return False
+        
+        # Check for exact or partial match
+        for name in model_names: 
+            if self.model == name or self.model in name or name.startswith(self.model. split(':')[0]):
+                return True
+        
+        # If configured model not found but others exist, use first available
+        if model_names: 
+            return True
+            
+        return False
     
     def get_available_models(self) -> list:
         """Get list of available models."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
-            if response. status_code == 200:
-                models = response.json().get('models', [])
-                return [m.get('name', '') for m in models]
-            return []
-        except:
-            return []
+        return self._fetch_models() or []
     
     def _get_working_model(self) -> str:
         """Get a working model name."""
@@ -61,52 +96,251 @@ class OllamaService:
         
         return self.model
     
-    def _generate(self, prompt: str, temperature: float = 0.7) -> str:
-        """Send a prompt to Ollama and get a response."""
-        url = f"{self.base_url}/api/generate"
+    def warm_up(self) -> bool:
+        """
+        Load the model into Ollama's memory ahead of the first real request.
+        
+        An empty prompt makes Ollama load the model and return at once, with
+        the same num_ctx every later request uses.
+        """
+        model = self._get_working_model()
+        num_ctx = self._context_size(model)
+        start = time.monotonic()
+        
+        try:
+            response = ollama_client.get_session().post(
+                f"{self.base_url}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": "",
+                    "keep_alive": getattr(settings, 'OLLAMA_KEEP_ALIVE', '30m'),
+                    "options": {"num_ctx": num_ctx},
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"[Ollama] Warm-up of {model} failed: {e}")
+            return False
+        
+        elapsed = time.monotonic() - start
+        metrics.observe('ollama.warmup_seconds', elapsed)
+        print(f"[Ollama] Warmed up {model} (num_ctx {num_ctx}) in {elapsed:.1f}s")
+        return True
+    
+    def _task_options(self, task: str, count: int = 1) -> dict:
+        """Output size for a task, from OLLAMA_OUTPUT_TOKENS."""
+        tokens = {**DEFAULT_OUTPUT_TOKENS, **getattr(settings, 'OLLAMA_OUTPUT_TOKENS', {})}
+        if task in ('flashcards', 'quiz'):
+            # Room for the requested items plus the array around them; the
+            # format schema ends the output when the array closes
+            return {'num_predict': 64 + tokens[task] * count}
+        return {'num_predict': tokens[task]}
+    
+    def _context_size(self, model: str) -> int:
+        """
+        num_ctx for every request to a model: its context budget.
+        
+        Ollama reloads the model whenever num_ctx changes, so it stays fixed
+        per model; tasks differ only in num_predict, and prompts are fitted
+        to the budget by _fit_text.
+        """
+        return token_budget.context_limit(model)
+    
+    def _fit_text(self, text: str, build, num_predict: int) -> str:
+        """
+        Cut ``text`` to what fits in the model's context with the prompt
+        ``build`` makes around it, keeping the most informative chunks from
+        across the document.
+        """
+        max_chars = token_budget.text_budget(self._get_working_model(), build(''), num_predict)
+        return select_text(text, max_chars)
+    
+    def _build_payload(self, prompt: str, temperature: float, stream: bool, fmt: dict = None,
+                       options: dict = None) -> dict:
         model = self._get_working_model()
+        options = {'num_predict': DEFAULT_OUTPUT_TOKENS['summary'], **(options or {})}
+        
+        print(f"[Ollama] Generating with model: {model}")
+        print(f"[Ollama] Prompt length: {len(prompt)} chars")
         
         payload = {
             "model": model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
+            "keep_alive": getattr(settings, 'OLLAMA_KEEP_ALIVE', '30m'),
             "options": {
                 "temperature": temperature,
-                "num_predict": 2048,
+                "num_ctx": self._context_size(model),
+                **options,
             }
         }
+        if fmt:
+            # JSON schema the output is constrained to
+            payload["format"] = fmt
+        return payload
+    
+    def _cache_key(self, payload: dict) -> tuple:
+        options = payload['options']
+        return llm_cache.make_key(
+            payload['model'], payload['prompt'], options['temperature'], options['num_predict'],
+            extra={'format': payload.get('format'), 'stop': options.get('stop')}
+        )
+    
+    def _cache_lookup(self, payload: dict):
+        """Return (cached response or None, cache key) for a payload."""
+        key = self._cache_key(payload)
+        if not llm_cache.is_enabled():
+            return None, key
+        if not self.use_cache:
+            metrics.incr('llm_cache.bypassed')
+            return None, key
+        return llm_cache.get(key[0]), key
+    
+    def _cache_store(self, payload: dict, key: tuple, response: str) -> None:
+        if not llm_cache.is_enabled():
+            return
+        options = payload['options']
+        llm_cache.put(key[0], key[1], payload['model'], options['temperature'], options['num_predict'], response)
+    
+    def _generate(self, prompt: str, temperature: float = 0.7, priority: int = None, fmt: dict = None,
+                  options: dict = None) -> str:
+        """
+        Send a prompt to Ollama and get a response, reusing a cached one if allowed.
         
-        print(f"[Ollama] Generating with model: {model}")
-        print(f"[Ollama] Prompt length: {len(prompt)} chars")
+        The call goes through the inference scheduler: it waits for a free
+        slot, and an identical generation already in flight is joined
+        instead of being sent again.
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = self._build_payload(prompt, temperature, stream=False, fmt=fmt, options=options)
+        
+        cached, key = self._cache_lookup(payload)
+        if cached is not None:
+            print(f"[Ollama] Cache hit ({len(cached)} chars)")
+            return cached
+        
+        def call():
+            try:
+                response = ollama_client.request('POST', url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                result = response.json()
+                
+                generated = result.get('response', '')
+                token_budget.record_usage(payload['model'], len(prompt), result.get('prompt_eval_count'))
+                stats = ollama_client.connection_stats()
+                print(f"[Ollama] Generated {len(generated)} chars "
+                      f"({stats['connections_opened']} connections for {stats['requests']} requests)")
+                
+                if not generated.strip():
+                    raise Exception("Model returned empty response")
+                
+                self._cache_store(payload, key, generated)
+                return generated
+                
+            except requests.exceptions. Timeout:
+                raise Exception("Request timed out.  Try a shorter document.")
+            except requests.exceptions.ConnectionError:
+                get_monitor().invalidate()
+                raise Exception("Cannot connect to Ollama.  Run 'ollama serve' first.")
+            except requests.exceptions.RequestException as e: 
+                raise Exception(f"Ollama error: {str(e)}")
+        
+        return get_scheduler().run(key[0], call, self.priority if priority is None else priority)
+    
+    def _generate_stream(self, prompt: str, temperature: float = 0.7, fmt: dict = None, options: dict = None):
+        """
+        Send a prompt to Ollama and yield response tokens as they arrive.
+        
+        Reads Ollama's streaming NDJSON, one JSON object per line, until the
+        object with ``done: true``. A cached response is yielded as a single
+        token; a completed stream is stored in the cache. The stream holds an
+        inference scheduler slot until it ends, but is never merged with
+        other calls since each caller needs its own tokens.
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = self._build_payload(prompt, temperature, stream=True, fmt=fmt, options=options)
+        
+        cached, key = self._cache_lookup(payload)
+        if cached is not None:
+            print(f"[Ollama] Cache hit ({len(cached)} chars)")
+            yield cached
+            return
+        
+        scheduler = get_scheduler()
+        scheduler.acquire(self.priority)
+        start = time.monotonic()
+        parts = []
+        first_token_at = None
+        generated_chars = 0
         
         try:
-            response = requests.post(url, json=payload, timeout=self.timeout)
-            response.raise_for_status()
-            result = response.json()
-            
-            generated = result.get('response', '')
-            print(f"[Ollama] Generated {len(generated)} chars")
-            
-            if not generated.strip():
-                raise Exception("Model returned empty response")
+            response = ollama_client.request('POST', url, json=payload, timeout=self.timeout, stream=True)
+            healthy = None  # What the stream showed about Ollama; recorded when it ends
+            try:
+                if not response.ok:
+                    healthy = response.status_code < 500
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get('error'):
+                        healthy = False
+                        raise Exception(f"Ollama error: {chunk['error']}")
+                    
+                    if chunk.get('done'):
+                        token_budget.record_usage(payload['model'], len(prompt), chunk.get('prompt_eval_count'))
+                    
+                    token = chunk.get('response', '')
+                    if token:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                            metrics.observe('ollama.time_to_first_token', first_token_at - start)
+                        generated_chars += len(token)
+                        parts.append(token)
+                        yield token
+                    
+                    # No break on ``done``: reading to the end of the body
+                    # lets the connection go back to the pool
+                healthy = True
+            except requests.exceptions.RequestException as e:
+                # A read timeout or dropped connection mid-stream
+                if healthy is None:
+                    healthy = False
+                if e.args and isinstance(e.args[0], ReadTimeoutError):
+                    # requests reports a read timeout inside the body as a connection error
+                    raise requests.exceptions.ReadTimeout(e) from e
+                raise
+            finally:
+                response.close()
+                breaker = ollama_client.get_breaker()
+                if healthy is True:
+                    breaker.record_success()
+                elif healthy is False:
+                    breaker.record_failure()
+                else:
+                    # Closed early by the caller or an unreadable line: no verdict
+                    breaker.release_probe()
             
-            return generated
+            print(f"[Ollama] Streamed {generated_chars} chars in {time.monotonic() - start:.1f}s")
+            if ''.join(parts).strip():
+                self._cache_store(payload, key, ''.join(parts))
             
         except requests.exceptions. Timeout:
             raise Exception("Request timed out.  Try a shorter document.")
         except requests.exceptions.ConnectionError:
+            get_monitor().invalidate()
             raise Exception("Cannot connect to Ollama.  Run 'ollama serve' first.")
         except requests.exceptions.RequestException as e: 
             raise Exception(f"Ollama error: {str(e)}")
+        finally:
+            scheduler.release()
     
-    def generate_summary(self, text: str) -> str:
-        """Generate a summary of the text."""
-        # Limit text length for faster processing
-        max_chars = 4000
-        if len(text) > max_chars: 
-            text = text[: max_chars] + "\n[Content truncated...]"
-        
-        prompt = f"""Please provide a comprehensive summary of the following educational content. 
+    def _summary_prompt(self, text: str) -> str:
+        """Build the summary prompt."""
+        def build(text):
+            return f"""Please provide a comprehensive summary of the following educational content. 
 
 Structure your summary as follows:
 1. **Overview**: Brief 2-3 sentence overview
@@ -121,15 +355,72 @@ Content to summarize:
 
 Summary:"""
 
-        return self._generate(prompt, temperature=0.5)
+        return build(self._fit_text(text, build, self._task_options('summary')['num_predict']))
     
-    def generate_flashcards(self, text: str, num_cards: int = 5) -> list:
-        """Generate flashcards from text."""
-        max_chars = 3000
-        if len(text) > max_chars:
-            text = text[:max_chars]
+    def generate_summary(self, text: str) -> str:
+        """Generate a summary of the text."""
+        return self._generate(self._summary_prompt(text), temperature=0.5, options=self._task_options('summary'))
+    
+    def stream_summary(self, text: str):
+        """Stream a summary of the text token by token."""
+        return self._generate_stream(self._summary_prompt(text), temperature=0.5, options=self._task_options('summary'))
+    
+    def summarize_chunk(self, text: str, page_start: int, page_end: int) -> str:
+        """Summarize one page-aligned chunk of a long document (map step)."""
+        def build(text):
+            return f"""Summarize the following section (pages {page_start}-{page_end}) of an educational document.
+List the main topics, key definitions and important facts as concise bullet points.
+Do not add an introduction or conclusion.
+
+Section:
+---
+{text}
+---
+
+Summary:"""
+
+        options = self._task_options('chunk_summary')
+        prompt = build(self._fit_text(text, build, options['num_predict']))
+        
+        # Bulk map-step calls yield to single interactive requests
+        return self._generate(
+            prompt, temperature=0.3, priority=max(self.priority, PRIORITY_BACKGROUND), options=options
+        )
+    
+    def _reduce_prompt(self, summaries: list) -> str:
+        """Build the prompt that combines section summaries."""
+        sections = "\n\n".join(summaries)
         
-        prompt = f"""Based on the following educational content, create exactly {num_cards} study flashcards. 
+        prompt = f"""The following are summaries of consecutive sections of one educational document.
+Combine them into a single comprehensive summary of the whole document.
+
+Structure your summary as follows:
+1. **Overview**: Brief 2-3 sentence overview
+2. **Key Topics**: Main subjects covered
+3. **Important Concepts**: Key definitions and ideas
+4. **Takeaways**: Main points to remember
+
+Section summaries:
+---
+{sections}
+---
+
+Summary:"""
+
+        return prompt
+    
+    def reduce_summaries(self, summaries: list) -> str:
+        """Combine section summaries into one structured summary (reduce step)."""
+        return self._generate(self._reduce_prompt(summaries), temperature=0.5, options=self._task_options('reduce'))
+    
+    def stream_reduce_summaries(self, summaries: list):
+        """Stream the reduce step of a map-reduce summary token by token."""
+        return self._generate_stream(self._reduce_prompt(summaries), temperature=0.5, options=self._task_options('reduce'))
+    
+    def _flashcards_prompt(self, text: str, num_cards: int, exclude: list = None) -> str:
+        """Build the flashcards prompt (``exclude``: questions not to repeat)."""
+        def build(text):
+            return f"""Based on the following educational content, create exactly {num_cards} study flashcards. 
 Each flashcard must have a question and an answer.
 
 Content:
@@ -142,19 +433,30 @@ You must respond with ONLY a valid JSON array in this exact format (no markdown,
   {{"question": "What is the first concept?", "answer":  "The first concept is..."}},
   {{"question": "What is the second concept?", "answer": "The second concept is..."}}
 ]
-
+{self._exclude_note(exclude)}
 Create {num_cards} flashcards now: """
 
-        response = self._generate(prompt, temperature=0.6)
-        return self._parse_flashcards(response, num_cards)
+        return build(self._fit_text(text, build, self._task_options('flashcards', num_cards)['num_predict']))
     
-    def generate_quiz(self, text: str, num_questions: int = 5) -> list:
-        """Generate quiz questions from text."""
-        max_chars = 3000
-        if len(text) > max_chars:
-            text = text[:max_chars]
-        
-        prompt = f"""Based on the following educational content, create exactly {num_questions} multiple choice quiz questions.
+    def generate_flashcards(self, text: str, num_cards: int = 5) -> list:
+        """Generate flashcards from text."""
+        response = self._generate(
+            self._flashcards_prompt(text, num_cards), temperature=0.6,
+            fmt=SCHEMAS['flashcards'], options=self._task_options('flashcards', num_cards)
+        )
+        return self.complete_items('flashcards', text, response, num_cards)
+    
+    def stream_flashcards(self, text: str, num_cards: int = 5):
+        """Stream the raw flashcards response token by token (check items with validate_item)."""
+        return self._generate_stream(
+            self._flashcards_prompt(text, num_cards), temperature=0.6,
+            fmt=SCHEMAS['flashcards'], options=self._task_options('flashcards', num_cards)
+        )
+    
+    def _quiz_prompt(self, text: str, num_questions: int, exclude: list = None) -> str:
+        """Build the quiz prompt (``exclude``: questions not to repeat)."""
+        def build(text):
+            return f"""Based on the following educational content, create exactly {num_questions} multiple choice quiz questions.
 Each question must have exactly 4 options and one correct answer.
 
 Content:
@@ -173,47 +475,212 @@ You must respond with ONLY a valid JSON array in this exact format (no markdown,
 ]
 
 Important: correct_answer must be a number (0, 1, 2, or 3) indicating which option is correct. 
-
+{self._exclude_note(exclude)}
 Create {num_questions} quiz questions now: """
 
-        response = self._generate(prompt, temperature=0.6)
-        return self._parse_quiz(response, num_questions)
+        return build(self._fit_text(text, build, self._task_options('quiz', num_questions)['num_predict']))
+    
+    def generate_quiz(self, text: str, num_questions: int = 5) -> list:
+        """Generate quiz questions from text."""
+        response = self._generate(
+            self._quiz_prompt(text, num_questions), temperature=0.6,
+            fmt=SCHEMAS['quiz'], options=self._task_options('quiz', num_questions)
+        )
+        return self.complete_items('quiz', text, response, num_questions)
+    
+    def stream_quiz(self, text: str, num_questions: int = 5):
+        """Stream the raw quiz response token by token (check items with validate_item)."""
+        return self._generate_stream(
+            self._quiz_prompt(text, num_questions), temperature=0.6,
+            fmt=SCHEMAS['quiz'], options=self._task_options('quiz', num_questions)
+        )
+    
+    def _exclude_note(self, exclude: list) -> str:
+        if not exclude:
+            return ''
+        listed = '\n'.join(f"- {question}" for question in exclude)
+        return f"\nDo not repeat any of these existing questions:\n{listed}\n"
+    
+    def validate_item(self, kind: str, item):
+        """Check one parsed flashcard or quiz item; returns the clean item or None."""
+        valid = VALIDATORS[kind](item)
+        if valid is None:
+            metrics.incr(f'generation.{kind}.invalid_items')
+        return valid
+    
+    def fill_missing(self, kind: str, text: str, valid: list, count: int) -> list:
+        """
+        Generate only the items a response was short of.
+        
+        ``valid`` holds the usable items already generated. Up to
+        GENERATION_REPAIR_ATTEMPTS follow-up calls ask for just the missing
+        number, listing the existing questions so they aren't repeated.
+        
+        Returns:
+            The additional valid items (possibly fewer than requested)
+        """
+        metrics.incr(f'generation.{kind}.responses')
+        if len(valid) >= count:
+            return []
+        
+        metrics.incr(f'generation.{kind}.short_responses')
+        prompt_builder = self._flashcards_prompt if kind == 'flashcards' else self._quiz_prompt
+        exclude = [item['question'] for item in valid]
+        extra = []
+        
+        for _ in range(getattr(settings, 'GENERATION_REPAIR_ATTEMPTS', 1)):
+            missing = count - len(valid) - len(extra)
+            if missing <= 0:
+                break
+            
+            print(f"[Ollama] Regenerating {missing} missing {kind} item(s)")
+            metrics.incr(f'generation.{kind}.retries')
+            try:
+                response = self._generate(
+                    prompt_builder(text, missing, exclude=exclude + [item['question'] for item in extra]),
+                    temperature=0.7,
+                    fmt=SCHEMAS[kind],
+                    options=self._task_options(kind, missing)
+                )
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                print(f"[Ollama] Repair failed: {e}")
+                break
+            
+            seen = {question.lower() for question in exclude + [item['question'] for item in extra]}
+            for item in parse_items(response):
+                item = self.validate_item(kind, item)
+                if item and item['question'].lower() not in seen and len(extra) < count - len(valid):
+                    seen.add(item['question'].lower())
+                    extra.append(item)
+        
+        metrics.incr(f'generation.{kind}.repaired_items', len(extra))
+        return extra
+    
+    def complete_items(self, kind: str, text: str, response: str, count: int) -> list:
+        """Validate a full flashcards or quiz response and fill in any failing items."""
+        valid = []
+        for item in parse_items(response):
+            item = self.validate_item(kind, item)
+            if item:
+                valid.append(item)
+        valid = valid[:count]
+        valid += self.fill_missing(kind, text, valid, count)
+        
+        if valid:
+            return valid
+        
+        # Nothing usable: fall back to the lenient parser and its error item
+        metrics.incr(f'generation.{kind}.fallbacks')
+        if kind == 'flashcards':
+            return self._parse_flashcards(response, count)
+        return self._parse_quiz(response, count)
+    
+    def _extract_items(self, response: str, required_keys: tuple = ()) -> list:
+        """Get the items of the JSON array in an LLM response."""
+        # Objects are read one by one, so a single broken item is skipped
+        # rather than failing the whole response
+        items = parse_items(response, required_keys)
+        if items:
+            return items
+        
+        # Fall back to parsing the whole array (e.g. an array of plain strings)
+        start = response.find('[')
+        end = response.rfind(']') + 1
+        
+        if start != -1 and end > start:
+            json_str = response[start:end]
+            
+            # Clean common issues
+            json_str = self._clean_json(json_str)
+            
+            result = json.loads(json_str)
+            if isinstance(result, list):
+                return result
+        
+        return []
+    
+    def _normalize_flashcard(self, item) -> dict:
+        """Turn one parsed item into a flashcard dict, or None if unusable."""
+        # Handle both dict and other formats
+        if isinstance(item, dict):
+            return {
+                'question': str(item.get('question', 'Question not available')),
+                'answer': str(item.get('answer', 'Answer not available'))
+            }
+        elif isinstance(item, str):
+            # If it's a string, try to use it as both Q and A
+            return {
+                'question': item,
+                'answer': 'Please regenerate flashcards.'
+            }
+        return None
+    
+    def _normalize_question(self, item) -> dict:
+        """Turn one parsed item into a quiz question dict, or None if unusable."""
+        # Validate and extract question data
+        if not isinstance(item, dict):
+            return None
+        
+        # Get question text
+        question_text = item.get('question', 'Question not available')
+        if not isinstance(question_text, str):
+            question_text = str(question_text)
+        
+        # Get options - ensure it's a list of strings
+        options = item.get('options', [])
+        if not isinstance(options, list) or len(options) < 2:
+            options = ['Option A', 'Option B', 'Option C', 'Option D']
+        else:
+            # Ensure all options are strings
+            options = [str(opt) for opt in options[: 4]]
+            # Pad if needed
+            while len(options) < 4:
+                options.append(f'Option {len(options) + 1}')
+        
+        # Get correct answer - ensure it's a valid integer
+        correct_answer = item.get('correct_answer', 0)
+        if isinstance(correct_answer, str):
+            # Try to parse string like "A", "B", "0", "1"
+            if correct_answer.upper() in ['A', 'B', 'C', 'D']:
+                correct_answer = ord(correct_answer. upper()) - ord('A')
+            else:
+                try:
+                    correct_answer = int(correct_answer)
+                except: 
+                    correct_answer = 0
+        elif not isinstance(correct_answer, int):
+            correct_answer = 0
+        
+        # Clamp to valid range
+        correct_answer = max(0, min(correct_answer, len(options) - 1))
+        
+        # Get explanation
+        explanation = item.get('explanation', '')
+        if not isinstance(explanation, str):
+            explanation = str(explanation) if explanation else ''
+        
+        return {
+            'question':  question_text,
+            'options':  options,
+            'correct_answer':  correct_answer,
+            'explanation':  explanation
+        }
     
     def _parse_flashcards(self, response: str, expected_count: int) -> list:
         """Parse flashcards from LLM response."""
         print(f"[Ollama] Parsing flashcards response...")
         
         try:
-            # Find JSON array in response
-            start = response.find('[')
-            end = response.rfind(']') + 1
+            flashcards = []
+            for item in self._extract_items(response, FLASHCARD_KEYS):
+                card = self._normalize_flashcard(item)
+                if card:
+                    flashcards.append(card)
             
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                
-                # Clean common issues
-                json_str = self._clean_json(json_str)
-                
-                result = json.loads(json_str)
-                
-                if isinstance(result, list) and len(result) > 0:
-                    flashcards = []
-                    for item in result[: expected_count]: 
-                        # Handle both dict and other formats
-                        if isinstance(item, dict):
-                            flashcards.append({
-                                'question': str(item.get('question', 'Question not available')),
-                                'answer': str(item.get('answer', 'Answer not available'))
-                            })
-                        elif isinstance(item, str):
-                            # If it's a string, try to use it as both Q and A
-                            flashcards.append({
-                                'question': item,
-                                'answer': 'Please regenerate flashcards.'
-                            })
-                    
-                    if flashcards: 
-                        return flashcards
+            if flashcards: 
+                return flashcards[:expected_count]
         
         except json.JSONDecodeError as e:
             print(f"[Ollama] JSON parse error: {e}")
@@ -229,70 +696,14 @@ Create {num_questions} quiz questions now: """
         print(f"[Ollama] Parsing quiz response...")
         
         try:
-            # Find JSON array in response
-            start = response.find('[')
-            end = response.rfind(']') + 1
+            questions = []
+            for item in self._extract_items(response, QUESTION_KEYS):
+                question = self._normalize_question(item)
+                if question:
+                    questions.append(question)
             
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                
-                # Clean common issues
-                json_str = self._clean_json(json_str)
-                
-                result = json.loads(json_str)
-                
-                if isinstance(result, list) and len(result) > 0:
-                    questions = []
-                    for item in result[:expected_count]:
-                        # Validate and extract question data
-                        if isinstance(item, dict):
-                            # Get question text
-                            question_text = item.get('question', 'Question not available')
-                            if not isinstance(question_text, str):
-                                question_text = str(question_text)
-                            
-                            # Get options - ensure it's a list of strings
-                            options = item.get('options', [])
-                            if not isinstance(options, list) or len(options) < 2:
-                                options = ['Option A', 'Option B', 'Option C', 'Option D']
-                            else:
-                                # Ensure all options are strings
-                                options = [str(opt) for opt in options[: 4]]
-                                # Pad if needed
-                                while len(options) < 4:
-                                    options.append(f'Option {len(options) + 1}')
-                            
-                            # Get correct answer - ensure it's a valid integer
-                            correct_answer = item.get('correct_answer', 0)
-                            if isinstance(correct_answer, str):
-                                # Try to parse string like "A", "B", "0", "1"
-                                if correct_answer.upper() in ['A', 'B', 'C', 'D']:
-                                    correct_answer = ord(correct_answer. upper()) - ord('A')
-                                else:
-                                    try:
-                                        correct_answer = int(correct_answer)
-                                    except: 
-                                        correct_answer = 0
-                            elif not isinstance(correct_answer, int):
-                                correct_answer = 0
-                            
-                            # Clamp to valid range
-                            correct_answer = max(0, min(correct_answer, len(options) - 1))
-                            
-                            # Get explanation
-                            explanation = item.get('explanation', '')
-                            if not isinstance(explanation, str):
-                                explanation = str(explanation) if explanation else ''
-                            
-                            questions.append({
-                                'question':  question_text,
-                                'options':  options,
-                                'correct_answer':  correct_answer,
-                                'explanation':  explanation
-                            })
-                    
-                    if questions: 
-                        return questions
+            if questions: 
+                return questions[:expected_count]
         
         except json.JSONDecodeError as e:
             print(f"[Ollama] JSON parse error: {e}")
@@ -1,78 +1,171 @@
 import fitz  # PyMuPDF
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
     """
-    Extract text content from a PDF file. 
-    
-    Args:
-        pdf_path: Path to the PDF file
-        
-    Returns:
-        Extracted text as a string
+    Get the process-wide extraction pool for a worker count, creating it on first use.
+
+    Workers are started by a forkserver rather than forked from the web
+    process: forking a multithreaded server while another thread holds a
+    MuPDF or logging lock can deadlock the child.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next document starts a fresh one."""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_text(page) -> str:
+    """Extract text from a single page, falling back to text blocks."""
+    # Try to extract text
+    text = page.get_text("text")
+
+    # If no text found, try with different extraction method
+    if not text.strip():
+        text = page.get_text("blocks")
+        if isinstance(text, list):
+            text = "\n".join([block[4] for block in text if len(block) > 4 and isinstance(block[4], str)])
+
+    return text
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> list:
     """
-    text_content = []
-    
+    Extract (page_number, text) pairs for pages [start, end).
+
+    Runs inside a worker process, so it opens its own PyMuPDF handle.
+    """
+    pages = []
+    doc = fitz.open(pdf_path)
     try:
-        doc = fitz.open(pdf_path)
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
-            # Try to extract text
-            text = page.get_text("text")
-            
-            # If no text found, try with different extraction method
-            if not text.strip():
-                text = page.get_text("blocks")
-                if isinstance(text, list):
-                    text = "\n".join([block[4] for block in text if len(block) > 4 and isinstance(block[4], str)])
-            
-            if text and text.strip():
-                text_content.append(f"--- Page {page_num + 1} ---\n{text.strip()}")
-        
+        for page_num in range(start, end):
+            text = _extract_page_text(doc[page_num])
+            pages.append((page_num + 1, text.strip() if text else ''))
+    finally:
         doc.close()
-        
-    except Exception as e:
-        raise Exception(f"Error extracting text from PDF: {str(e)}")
-    
-    full_text = "\n\n".join(text_content)
-    
-    # Basic validation
-    if len(full_text.strip()) < 50:
-        raise Exception("Could not extract meaningful text from PDF.  The document may be scanned or image-based.")
-    
-    return full_text
+    return pages
 
 
-def get_pdf_info(pdf_path:  str) -> dict:
+def _split_page_ranges(num_pages: int, workers: int) -> list:
+    """Split [0, num_pages) into contiguous ranges, one or more per worker."""
+    if num_pages <= 0:
+        return []
+    # A few ranges per worker keeps the pool busy when pages vary in cost
+    num_ranges = min(num_pages, workers * 4)
+    size, extra = divmod(num_pages, num_ranges)
+    ranges = []
+    start = 0
+    for i in range(num_ranges):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def iter_pdf_pages(pdf_path: str, info: dict = None, workers: int = None, parallel_threshold: int = None):
     """
-    Get information about a PDF file. 
-    
+    Open a PDF once and yield the text of every page.
+
+    Before the first page is yielded, ``info`` is filled with the page count
+    and metadata; ``has_text`` is set as soon as a page with a text layer is
+    seen. Documents with at least ``parallel_threshold`` pages are split
+    across a process pool; the output is identical to the sequential path.
+
     Args:
         pdf_path: Path to the PDF file
-        
-    Returns:
-        Dictionary with PDF metadata
+        info: Optional dict to receive num_pages, metadata and has_text
+        workers: Number of worker processes (defaults to PDF_EXTRACTION_WORKERS)
+        parallel_threshold: Minimum page count for parallel extraction
+            (defaults to PDF_PARALLEL_PAGE_THRESHOLD)
+
+    Yields:
+        (page_number, text) tuples, one per page, 1-based
     """
+    if info is None:
+        info = {}
+    if workers is None:
+        workers = getattr(settings, 'PDF_EXTRACTION_WORKERS', 4)
+    if parallel_threshold is None:
+        parallel_threshold = getattr(settings, 'PDF_PARALLEL_PAGE_THRESHOLD', 100)
+
     try:
         doc = fitz.open(pdf_path)
-        info = {
-            'num_pages': len(doc),
+        num_pages = len(doc)
+        info.update({
+            'num_pages': num_pages,
             'metadata': doc.metadata,
             'has_text': False
-        }
-        
-        # Check if PDF has extractable text
-        for page_num in range(min(3, len(doc))):  # Check first 3 pages
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text. strip():
-                info['has_text'] = True
-                break
-        
-        doc.close()
-        return info
-        
+        })
+
+        if workers > 1 and num_pages > 0 and num_pages >= parallel_threshold:
+            doc.close()
+            ranges = _split_page_ranges(num_pages, workers)
+            pool = _get_pool(workers)
+            futures = [pool.submit(_extract_page_range, pdf_path, start, end) for start, end in ranges]
+            try:
+                # Futures are read in submission order, so pages stay in sequence
+                for future in futures:
+                    for page_number, text in future.result():
+                        if text:
+                            info['has_text'] = True
+                        yield page_number, text
+            except BrokenProcessPool:
+                _discard_pool(workers, pool)
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
+        else:
+            try:
+                for page_num in range(num_pages):
+                    text = _extract_page_text(doc[page_num])
+                    text = text.strip() if text else ''
+                    if text:
+                        info['has_text'] = True
+                    yield page_num + 1, text
+            finally:
+                doc.close()
+
     except Exception as e:
-        return {'error': str(e)}
\ No newline at end of file
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+
+def extract_pages_from_pdf(pdf_path: str, workers: int = None, parallel_threshold: int = None) -> list:
+    """
+    Extract the text of every page in a PDF file.
+
+    Returns:
+        List of (page_number, text) tuples, one per page, 1-based
+    """
+    return list(iter_pdf_pages(pdf_path, workers=workers, parallel_threshold=parallel_threshold))
+
+
+def format_pages(pages) -> str:
+    """Join (page_number, text) pairs into marked-up document text."""
+    return "\n\n".join(
+        f"--- Page {page_number} ---\n{text}"
+        for page_number, text in pages
+        if text
+    )
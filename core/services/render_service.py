@@ -0,0 +1,140 @@
+import os
+import threading
+from pathlib import Path
+
+import fitz  # PyMuPDF
+from django.conf import settings
+
+
+DEFAULT_ZOOM_BUCKETS = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0]
+
+_cache_lock = threading.Lock()
+_cache_size = None  # Total bytes on disk, computed on first use
+
+
+def get_zoom_buckets() -> list:
+    return sorted(getattr(settings, 'PAGE_RENDER_ZOOM_BUCKETS', DEFAULT_ZOOM_BUCKETS))
+
+
+def zoom_bucket(zoom: float) -> float:
+    """Snap a requested zoom to the smallest bucket that is at least as sharp."""
+    buckets = get_zoom_buckets()
+    for bucket in buckets:
+        if bucket >= zoom:
+            return bucket
+    return buckets[-1]
+
+
+def _cache_dir() -> Path:
+    return Path(getattr(settings, 'PAGE_RENDER_CACHE_DIR', Path(settings.MEDIA_ROOT) / 'page_cache'))
+
+
+def _cache_key(document, page_number: int, bucket: float) -> str:
+    # Identical uploads share a content hash, so they share rendered pages
+    source = document.content_hash or f"doc{document.id}"
+    return f"{source}_p{page_number}_z{int(bucket * 100)}"
+
+
+def page_etag(document, page_number: int, bucket: float) -> str:
+    return _cache_key(document, page_number, bucket)
+
+
+def _cache_path(key: str) -> Path:
+    return _cache_dir() / key[:2] / f"{key}.png"
+
+
+def _scan_cache_size() -> int:
+    total = 0
+    for path in _cache_dir().glob('*/*.png'):
+        try:
+            total += path.stat().st_size
+        except FileNotFoundError:
+            pass
+    return total
+
+
+def _evict(max_bytes: int) -> None:
+    """Delete least recently used images until the cache fits in max_bytes."""
+    global _cache_size
+    entries = []
+    for path in _cache_dir().glob('*/*.png'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # Evict down to 90% so we don't rescan on every new render
+    target = int(max_bytes * 0.9)
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except FileNotFoundError:
+            pass
+
+    _cache_size = total
+
+
+def render_page(pdf_path: str, page_number: int, zoom: float) -> bytes:
+    """Rasterize one page (1-based) to PNG bytes at the given zoom."""
+    doc = fitz.open(pdf_path)
+    try:
+        if page_number < 1 or page_number > len(doc):
+            raise IndexError(f"Page {page_number} out of range")
+        pixmap = doc[page_number - 1].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return pixmap.tobytes("png")
+    finally:
+        doc.close()
+
+
+def get_rendered_page(document, page_number: int, bucket: float) -> Path:
+    """
+    Return the path of a cached page image, rendering it on a miss.
+
+    The cache is a size-bounded LRU on disk: hits refresh the file's mtime,
+    and the oldest files are evicted once PAGE_RENDER_CACHE_MAX_BYTES is
+    exceeded.
+    """
+    global _cache_size
+    path = _cache_path(_cache_key(document, page_number, bucket))
+
+    if path.exists():
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass  # Evicted between the check and the touch
+
+    data = render_page(document.file.path, page_number, bucket)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+    max_bytes = getattr(settings, 'PAGE_RENDER_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+    with _cache_lock:
+        if _cache_size is None:
+            _cache_size = _scan_cache_size()
+        else:
+            _cache_size += len(data)
+        if _cache_size > max_bytes:
+            _evict(max_bytes)
+
+    return path
+
+
+def get_page_sizes(pdf_path: str) -> list:
+    """Return the size of every page in PDF points, for laying out placeholders."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [
+            {'number': i + 1, 'width': round(page.rect.width, 2), 'height': round(page.rect.height, 2)}
+            for i, page in enumerate(doc)
+        ]
+    finally:
+        doc.close()
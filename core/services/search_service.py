@@ -0,0 +1,110 @@
+import re
+
+from django.db import connection
+from django.utils.html import escape
+
+from ..models import DocumentPage
+
+
+# Control characters that cannot appear in extracted text; used to mark
+# snippet highlights before the snippet is HTML-escaped
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Each word becomes a quoted term so user input can't inject FTS syntax;
+    the last word also matches as a prefix for search-as-you-type.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _format_snippet(snippet: str) -> str:
+    return escape(snippet).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def _search_fts(match: str, limit: int, document_id: int = None) -> list:
+    sql = f"""
+        SELECT p.document_id, d.title, p.page_number,
+               snippet(core_documentpage_fts, 0, %s, %s, '...', 16),
+               bm25(core_documentpage_fts) AS rank
+        FROM core_documentpage_fts
+        JOIN core_documentpage p ON p.id = core_documentpage_fts.rowid
+        JOIN core_document d ON d.id = p.document_id
+        WHERE core_documentpage_fts MATCH %s
+        {'AND p.document_id = %s' if document_id else ''}
+        ORDER BY rank
+        LIMIT %s
+    """
+    params = [_MARK_START, _MARK_END, match]
+    if document_id:
+        params.append(document_id)
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'document_id': doc_id,
+            'title': title,
+            'page': page_number,
+            'snippet': _format_snippet(snippet),
+            # bm25() is lower-is-better; flip it so higher scores rank first
+            'score': round(-rank, 4),
+        }
+        for doc_id, title, page_number, snippet, rank in rows
+    ]
+
+
+def _search_fallback(terms: list, limit: int, document_id: int = None) -> list:
+    """Unranked substring search for databases without FTS5."""
+    pages = DocumentPage.objects.select_related('document').filter(has_text=True)
+    if document_id:
+        pages = pages.filter(document_id=document_id)
+    for term in terms:
+        pages = pages.filter(text__icontains=term)
+
+    results = []
+    for page in pages[:limit]:
+        position = page.text.lower().find(terms[0].lower())
+        start = max(position - 80, 0)
+        results.append({
+            'document_id': page.document_id,
+            'title': page.document.title,
+            'page': page.page_number,
+            'snippet': escape(page.text[start:start + 200]),
+            'score': 0,
+        })
+    return results
+
+
+def search_pages(query: str, limit: int = 20, document_id: int = None) -> list:
+    """
+    Search extracted page text across all documents.
+
+    Args:
+        query: Free-text query
+        limit: Maximum number of hits
+        document_id: Optionally restrict the search to one document
+
+    Returns:
+        List of hits ranked best first, each with document_id, title, page,
+        an HTML snippet with <mark> highlights, and a score
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    if connection.vendor == 'sqlite':
+        return _search_fts(match, limit, document_id)
+    return _search_fallback(re.findall(r'\w+', query), limit, document_id)
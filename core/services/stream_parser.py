@@ -0,0 +1,162 @@
+import json
+import re
+
+from . import metrics
+
+
+class JSONItemStreamParser:
+    """
+    Incrementally extract top-level JSON objects from a streamed array.
+
+    Text is fed in as it arrives; each object is returned as soon as its
+    closing brace is seen, so callers can use the first item long before
+    the model finishes. The parser tolerates what small models tend to
+    produce around the array (prose, markdown fences, a missing ``[``, an
+    object wrapping the array such as ``{"flashcards": [...]}``) and skips
+    an item that doesn't parse instead of failing the whole response.
+
+    Example::
+
+        parser = JSONItemStreamParser()
+        for token in tokens:
+            for item in parser.feed(token):
+                ...
+        for item in parser.finish():  # A truncated last item, if repairable
+            ...
+    """
+
+    def __init__(self, required_keys: tuple = ()):
+        # Keys a repaired (truncated) object must have to be kept
+        self.required_keys = required_keys
+        self._buffer = []  # Characters of the object being read
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.malformed = 0
+
+    def feed(self, text: str) -> list:
+        """Consume more text; return the objects completed by it."""
+        items = []
+        for char in text:
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._load(''.join(self._buffer))
+                    self._buffer = []
+                    if item is not None:
+                        items.extend(self._unwrap(item))
+        return items
+
+    def finish(self) -> list:
+        """
+        Try to recover an object cut off by the end of the stream.
+
+        Only an object cut off between values is repaired (by closing its
+        lists and braces), and only if it has all of ``required_keys``; one
+        cut off mid-string may hold half a sentence and is dropped.
+        """
+        if self._depth == 0 or not self._buffer or self._in_string:
+            return []
+
+        text = ''.join(self._buffer)
+        text = re.sub(r',\s*$', '', text.rstrip())
+        # Drop a dangling key, then close open lists and braces
+        text = re.sub(r',?\s*"[^"]*"\s*:\s*$', '', text)
+        text += _closers(text)
+
+        self._buffer = []
+        self._depth = 0
+
+        item = self._load(text, count_failure=False)
+        if item is None:
+            return []
+        items = [item for item in self._unwrap(item) if all(key in item for key in self.required_keys)]
+        if items:
+            metrics.incr('parser.repaired_items')
+        return items
+
+    def _unwrap(self, item: dict) -> list:
+        """
+        Return the items held by a wrapper object, or the object itself.
+
+        An object with none of ``required_keys`` that holds a list of
+        objects (``{"flashcards": [...]}``, ``{"data": {"questions": [...]}}``)
+        is a wrapper around the real items.
+        """
+        if not self.required_keys or any(key in item for key in self.required_keys):
+            return [item]
+        for value in item.values():
+            if isinstance(value, list) and any(isinstance(inner, dict) for inner in value):
+                return [found for inner in value if isinstance(inner, dict) for found in self._unwrap(inner)]
+            if isinstance(value, dict):
+                found = self._unwrap(value)
+                if found != [value]:
+                    return found
+        return [item]
+
+    def _load(self, text: str, count_failure: bool = True):
+        for candidate in (text, _clean_item(text)):
+            try:
+                item = json.loads(candidate, strict=False)  # Allow raw newlines in strings
+            except json.JSONDecodeError:
+                continue
+            if isinstance(item, dict):
+                return item
+
+        if count_failure:
+            self.malformed += 1
+            metrics.incr('parser.malformed_items')
+            print(f"[Parser] Skipping malformed item: {text[:200]}")
+        return None
+
+
+def _closers(text: str) -> str:
+    """The brackets and braces that close what is still open in ``text``, innermost first."""
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+    return ''.join(reversed(stack))
+
+
+def _clean_item(text: str) -> str:
+    """Fix common LLM JSON slips in one object: trailing commas and control characters."""
+    text = re.sub(r',\s*([}\]])', r'\1', text)
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', text)
+    return text
+
+
+def parse_items(text: str, required_keys: tuple = ()) -> list:
+    """Parse every complete (or repairable) object out of a full response."""
+    parser = JSONItemStreamParser(required_keys)
+    return parser.feed(text) + parser.finish()
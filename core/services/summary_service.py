@@ -0,0 +1,124 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from ..models import Document, SummaryChunk
+from .pdf_service import format_pages
+
+
+def build_page_chunks(document: Document, max_chars: int) -> list:
+    """
+    Group a document's pages into chunks of at most ``max_chars``.
+
+    Chunks always break between pages; a single page longer than the limit
+    becomes its own chunk.
+
+    Returns:
+        List of (page_start, page_end, text) tuples
+    """
+    chunks = []
+    pages = []
+    size = 0
+
+    def flush():
+        if pages:
+            chunks.append((pages[0][0], pages[-1][0], format_pages(pages)))
+
+    for page_number, text in document.pages.filter(has_text=True).values_list('page_number', 'text').iterator():
+        if pages and size + len(text) > max_chars:
+            flush()
+            pages = []
+            size = 0
+        pages.append((page_number, text))
+        size += len(text)
+    flush()
+
+    return chunks
+
+
+def _reduce_to_fit(ollama, summaries: list, max_chars: int, workers: int) -> list:
+    """Run intermediate reduce rounds until the summaries fit one reduce prompt."""
+    while len(summaries) > 1 and sum(len(summary) for summary in summaries) > max_chars:
+        groups = []
+        for summary in summaries:
+            if groups and sum(len(s) for s in groups[-1]) + len(summary) <= max_chars:
+                groups[-1].append(summary)
+            else:
+                groups.append([summary])
+        if len(groups) == len(summaries):
+            break  # Every summary is over budget alone; reduce what we have
+
+        print(f"[Summary] Intermediate reduce: {len(summaries)} summaries into {len(groups)}")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            summaries = list(executor.map(ollama.reduce_summaries, groups))
+
+    return summaries
+
+
+def map_chunk_summaries(ollama, document: Document, regenerate_chunks: bool = False) -> list:
+    """
+    Run the map step of a map-reduce summary.
+
+    Page-aligned chunks are summarized concurrently (at most
+    SUMMARY_MAP_WORKERS calls in flight) and the chunk summaries are stored
+    as SummaryChunk rows. A later regenerate reuses any stored chunk whose
+    text is unchanged, so only the reduce step runs again unless
+    ``regenerate_chunks`` is set.
+
+    Returns:
+        Section summaries, small enough for a single reduce prompt
+    """
+    chunk_chars = getattr(settings, 'SUMMARY_MAP_CHUNK_CHARS', 6000)
+    workers = getattr(settings, 'SUMMARY_MAP_WORKERS', 3)
+    reduce_chars = getattr(settings, 'SUMMARY_REDUCE_MAX_CHARS', 6000)
+
+    chunks = build_page_chunks(document, chunk_chars)
+    existing = {chunk.index: chunk for chunk in document.summary_chunks.all()}
+    summaries = {}
+    pending = []
+
+    for index, (page_start, page_end, text) in enumerate(chunks):
+        source_hash = hashlib.sha1(text.encode('utf-8', 'ignore')).hexdigest()
+        stored = existing.get(index)
+        if stored and stored.source_hash == source_hash and not regenerate_chunks:
+            summaries[index] = stored.content
+        else:
+            pending.append((index, page_start, page_end, text, source_hash))
+
+    print(f"[Summary] Map-reduce over {len(chunks)} chunks ({len(pending)} to summarize)")
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(ollama.summarize_chunk, text, page_start, page_end): (index, page_start, page_end, source_hash)
+                for index, page_start, page_end, text, source_hash in pending
+            }
+            # Save each chunk as it finishes, so a failure keeps completed work
+            for future in as_completed(futures):
+                index, page_start, page_end, source_hash = futures[future]
+                content = future.result()
+                SummaryChunk.objects.update_or_create(
+                    document=document,
+                    index=index,
+                    defaults={
+                        'page_start': page_start,
+                        'page_end': page_end,
+                        'source_hash': source_hash,
+                        'content': content
+                    }
+                )
+                summaries[index] = content
+
+    document.summary_chunks.filter(index__gte=len(chunks)).delete()
+
+    ordered = [
+        f"Pages {page_start}-{page_end}:\n{summaries[index]}"
+        for index, (page_start, page_end, _) in enumerate(chunks)
+    ]
+    return _reduce_to_fit(ollama, ordered, reduce_chars, workers)
+
+
+def generate_map_reduce_summary(ollama, document: Document, regenerate_chunks: bool = False) -> str:
+    """Summarize a long document with a parallel map-reduce."""
+    return ollama.reduce_summaries(map_chunk_summaries(ollama, document, regenerate_chunks))
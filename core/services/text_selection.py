@@ -0,0 +1,183 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just may me more most my no nor not now of off on once only or other our out
+over own same she should so some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your page
+""".split())
+
+CHUNK_SEPARATOR = "\n\n[...]\n\n"
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_text(text: str, chunk_chars: int = 800) -> list:
+    """
+    Split text into chunks of roughly ``chunk_chars`` characters.
+
+    Chunks break on paragraph boundaries (including the page markers), and
+    paragraphs longer than a chunk are split on lines.
+    """
+    chunks = []
+    current = []
+    current_len = 0
+
+    def flush():
+        nonlocal current, current_len
+        if current:
+            chunks.append("\n\n".join(current))
+        current = []
+        current_len = 0
+
+    for paragraph in text.split("\n\n"):
+        pieces = [paragraph] if len(paragraph) <= chunk_chars else paragraph.split("\n")
+        for piece in pieces:
+            if current_len + len(piece) > chunk_chars:
+                flush()
+            current.append(piece)
+            current_len += len(piece) + 2
+    flush()
+
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+class ChunkIndex:
+    """In-memory BM25 index over the chunks of one document."""
+
+    def __init__(self, chunks: list, k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(chunk)) for chunk in chunks]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0
+
+        self.doc_freqs = Counter()
+        for tf in self.term_freqs:
+            self.doc_freqs.update(tf.keys())
+
+    def idf(self, term: str) -> float:
+        n = len(self.chunks)
+        df = self.doc_freqs.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def keywords(self, limit: int = 40) -> list:
+        """Terms that characterise the whole document (frequent overall, but not in every chunk)."""
+        totals = Counter()
+        for tf in self.term_freqs:
+            totals.update(tf)
+        weighted = {term: count * self.idf(term) for term, count in totals.items() if count > 1}
+        return sorted(weighted, key=weighted.get, reverse=True)[:limit]
+
+    def scores(self, query_terms: list) -> list:
+        results = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            for term in query_terms:
+                freq = tf.get(term, 0)
+                if freq:
+                    score += self.idf(term) * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+    def select(self, max_chars: int, query: str = None) -> str:
+        """
+        Pick the most informative chunks that fit in ``max_chars``.
+
+        Chunks are scored with BM25 against the query, or against the
+        document's own keywords when no query is given. The document is
+        divided into regions and the best chunk of each region is taken
+        first, so the selection covers the whole text rather than one
+        dense section; leftover budget goes to the best remaining chunks.
+        Selected chunks are returned in document order.
+        """
+        if not self.chunks:
+            return ""
+
+        query_terms = tokenize(query) if query else self.keywords()
+        scores = self.scores(query_terms)
+        avg_chunk = sum(len(chunk) for chunk in self.chunks) / len(self.chunks)
+        num_regions = max(1, min(len(self.chunks), int(max_chars // (avg_chunk + len(CHUNK_SEPARATOR)))))
+
+        selected = set()
+        used = 0
+
+        def try_add(i):
+            nonlocal used
+            cost = len(self.chunks[i]) + (len(CHUNK_SEPARATOR) if selected else 0)
+            if i in selected or used + cost > max_chars:
+                return False
+            selected.add(i)
+            used += cost
+            return True
+
+        # One chunk per region, best regions first
+        region_best = []
+        for region in range(num_regions):
+            start = region * len(self.chunks) // num_regions
+            end = (region + 1) * len(self.chunks) // num_regions
+            if start < end:
+                best = max(range(start, end), key=lambda i: scores[i])
+                region_best.append(best)
+        for i in sorted(region_best, key=lambda i: scores[i], reverse=True):
+            try_add(i)
+
+        # Fill the remaining budget with the best chunks overall
+        for i in sorted(range(len(self.chunks)), key=lambda i: scores[i], reverse=True):
+            try_add(i)
+
+        if not selected:
+            return self.chunks[0][:max_chars]
+
+        return CHUNK_SEPARATOR.join(self.chunks[i] for i in sorted(selected))
+
+
+def get_chunk_index(text: str) -> ChunkIndex:
+    """
+    Get the chunk index for a text, building it on a cache miss.
+
+    Indexes are cached by a digest of the text, so repeat generations for
+    the same document (or page range) skip chunking and tokenizing.
+    """
+    key = hashlib.sha1(text.encode('utf-8', 'ignore')).hexdigest()
+
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    chunk_chars = getattr(settings, 'TEXT_SELECTION_CHUNK_CHARS', 800)
+    index = ChunkIndex(chunk_text(text, chunk_chars))
+
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > getattr(settings, 'TEXT_SELECTION_CACHE_SIZE', 32):
+            _index_cache.popitem(last=False)
+
+    return index
+
+
+def select_text(text: str, max_chars: int, query: str = None) -> str:
+    """Return text unchanged if it fits, otherwise its most informative chunks."""
+    if len(text) <= max_chars:
+        return text
+    return get_chunk_index(text).select(max_chars, query)
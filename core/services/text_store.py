@@ -0,0 +1,40 @@
+import zlib
+
+from django.conf import settings
+
+from ..models import Document, DocumentText
+
+
+def save_text(document: Document, text: str) -> None:
+    """
+    Store a document's extracted text, compressed, in DocumentText.
+
+    Only ``text_length`` stays on the Document row, so listing and
+    loading documents never reads the text itself.
+    """
+    data = zlib.compress(text.encode('utf-8'), getattr(settings, 'TEXT_STORE_COMPRESSION_LEVEL', 6))
+    DocumentText.objects.update_or_create(
+        document=document,
+        defaults={'codec': DocumentText.CODEC_ZLIB, 'data': data, 'compressed_size': len(data)}
+    )
+    document.text_length = len(text)
+    document.save(update_fields=['text_length'])
+
+
+def load_text(document: Document) -> str:
+    """Return a document's extracted text, or '' if none is stored."""
+    data = DocumentText.objects.filter(document_id=document.pk).values_list('data', flat=True).first()
+    if data is None:
+        return ''
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+def copy_text(source: Document, target: Document) -> None:
+    """Give ``target`` the stored text of ``source`` without recompressing it."""
+    stored = DocumentText.objects.filter(document_id=source.pk).first()
+    if stored is not None:
+        DocumentText.objects.update_or_create(
+            document=target,
+            defaults={'codec': stored.codec, 'data': stored.data, 'compressed_size': stored.compressed_size}
+        )
+    target.text_length = source.text_length
@@ -0,0 +1,88 @@
+import math
+import threading
+
+from django.conf import settings
+
+from . import metrics
+
+
+DEFAULT_BUDGET = {
+    'context': 4096,  # num_ctx for every request to the model
+    'chars_per_token': 3.5,  # Starting estimate until calibrated
+    'reserve_tokens': 64,  # Slack for the estimate being off
+}
+
+# Characters per token observed from Ollama's prompt_eval_count, per model
+_calibration = {}
+_calibration_lock = threading.Lock()
+
+
+def get_budget(model: str) -> dict:
+    """
+    Get the token budget for a model from OLLAMA_MODEL_BUDGETS.
+
+    Keys are matched against the full model name ("llama3.2:3b"), then the
+    name without its tag ("llama3.2"), then the longest key the name starts
+    with; ``default`` applies otherwise.
+    """
+    budgets = getattr(settings, 'OLLAMA_MODEL_BUDGETS', {})
+    base = model.split(':')[0]
+
+    match = budgets.get(model) or budgets.get(base)
+    if match is None:
+        prefixes = [key for key in budgets if key != 'default' and model.startswith(key)]
+        match = budgets[max(prefixes, key=len)] if prefixes else budgets.get('default', {})
+
+    return {**DEFAULT_BUDGET, **match}
+
+
+def chars_per_token(model: str) -> float:
+    with _calibration_lock:
+        calibrated = _calibration.get(model)
+    return calibrated or get_budget(model)['chars_per_token']
+
+
+def estimate_tokens(text: str, model: str) -> int:
+    """Estimate how many tokens the model's tokenizer makes of ``text``."""
+    return math.ceil(len(text) / chars_per_token(model))
+
+
+def record_usage(model: str, prompt_chars: int, prompt_tokens: int) -> None:
+    """
+    Calibrate the estimate from a prompt's real token count.
+
+    Ollama reports ``prompt_eval_count`` with each response. Samples that
+    look wrong (e.g. only part of the prompt was evaluated because Ollama
+    reused a cached prefix) are ignored; the rest update a moving average.
+    """
+    if not prompt_tokens or prompt_chars < 200:
+        return
+    ratio = prompt_chars / prompt_tokens
+    if not 1.5 <= ratio <= 8:
+        return
+
+    with _calibration_lock:
+        current = _calibration.get(model)
+        _calibration[model] = ratio if current is None else current * 0.8 + ratio * 0.2
+        calibrated = _calibration[model]
+    metrics.set_gauge(f'token_budget.{model}.chars_per_token', round(calibrated, 3))
+
+
+def context_limit(model: str) -> int:
+    return get_budget(model)['context']
+
+
+def text_budget(model: str, template: str, num_predict: int) -> int:
+    """
+    Largest number of characters of document text that fits in a prompt.
+
+    The model's context must hold the prompt template, the inserted text
+    and ``num_predict`` output tokens, plus a small reserve. The result is
+    10% under the estimate, since a prompt that overflows num_ctx is
+    silently truncated by Ollama.
+    """
+    budget = get_budget(model)
+    available = budget['context'] - estimate_tokens(template, model) - num_predict - budget['reserve_tokens']
+    chars = int(available * chars_per_token(model) * 0.9)
+    # Never starve the prompt entirely, even for a large output request
+    return max(chars, 1000)
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('core.services.circuit_breaker.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30, half_open_max_calls=2)
+
+    def fail(self, times=1):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.fail()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 10
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.before_call()
+        self.assertEqual(raised.exception.retry_after, 20)
+        self.assertRaises(CircuitOpenError, self.breaker.check)
+
+    def test_half_open_limits_probes_and_closes_on_success(self):
+        self.fail(3)
+        self.now += 30
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.check()  # Does not reserve a probe
+
+        self.breaker.before_call()
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_probe_reopens_for_a_full_timeout(self):
+        self.fail(3)
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.retry_after(), 30)
+
+    def test_released_probe_frees_its_slot(self):
+        self.fail(3)
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.before_call()
+
+        self.breaker.release_probe()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
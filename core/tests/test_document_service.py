@@ -0,0 +1,76 @@
+from django.test import TestCase
+
+from ..models import Document, DocumentPage, Summary, SummaryChunk
+from ..services.document_service import copy_artifacts, find_duplicate
+from ..services.extraction_jobs import _finish_duplicates
+from ..services.generation_service import current_flashcards, current_quiz, save_flashcards, save_quiz
+from ..services.text_store import load_text, save_text
+
+
+class DuplicateUploadTests(TestCase):
+    def setUp(self):
+        self.original = Document.objects.create(
+            title='Cells', file='uploads/cells.pdf', content_hash='abc', page_count=2,
+            has_text_layer=True, pdf_metadata={'author': 'A'}, status=Document.STATUS_READY
+        )
+        save_text(self.original, '--- Page 1 ---\nMitosis\n\n--- Page 2 ---\nMeiosis')
+        for page_number, text in ((1, 'Mitosis'), (2, 'Meiosis')):
+            DocumentPage.objects.create(
+                document=self.original, page_number=page_number, text=text, char_count=len(text), has_text=True
+            )
+        Summary.objects.create(document=self.original, content='About cells')
+        SummaryChunk.objects.create(
+            document=self.original, index=0, page_start=1, page_end=2, source_hash='f' * 40, content='Division'
+        )
+        save_flashcards(self.original, [{'question': 'old', 'answer': 'old'}])
+        save_flashcards(self.original, [{'question': 'Q1', 'answer': 'A1'}])
+        save_quiz(self.original, [{'question_text': 'Which?', 'options': ['a', 'b'], 'correct_answer': 1}])
+
+        self.copy = Document.objects.create(title='Cells (copy)', file='uploads/cells_2.pdf', content_hash='abc')
+
+    def assertCopied(self, document):
+        document.refresh_from_db()
+        self.assertEqual(document.status, Document.STATUS_READY)
+        self.assertEqual((document.page_count, document.pages_done), (2, 2))
+        self.assertEqual((document.has_text_layer, document.pdf_metadata), (True, {'author': 'A'}))
+        self.assertEqual(load_text(document), load_text(self.original))
+        self.assertEqual(document.text_length, self.original.text_length)
+        self.assertEqual(list(document.pages.values_list('page_number', 'text')), [(1, 'Mitosis'), (2, 'Meiosis')])
+        self.assertEqual(document.summary.content, 'About cells')
+        self.assertEqual(list(document.summary_chunks.values_list('content', flat=True)), ['Division'])
+        self.assertEqual([card.question for card in current_flashcards(document)], ['Q1'])
+        self.assertEqual(current_quiz(document).questions.get().correct_answer, 1)
+
+    def test_copy_artifacts_copies_the_current_study_material(self):
+        copy_artifacts(self.original, self.copy)
+        self.assertCopied(self.copy)
+        # Only the current flashcards are copied, as a first version
+        self.assertEqual(self.copy.generations.count(), 2)
+
+    def test_find_duplicate_prefers_an_extracted_copy(self):
+        self.assertEqual(find_duplicate('abc', exclude_id=self.copy.id), self.original)
+        self.assertEqual(find_duplicate('abc', exclude_id=self.original.id), self.copy)
+        self.assertIsNone(find_duplicate(''))
+
+    def test_waiting_duplicate_gets_the_original_text(self):
+        _finish_duplicates(self.original.id)
+        self.assertCopied(self.copy)
+
+        # A second run does not copy again
+        _finish_duplicates(self.original.id)
+        self.assertEqual(self.copy.pages.count(), 2)
+
+    def test_waiting_duplicate_fails_with_the_original(self):
+        Document.objects.filter(id=self.original.id).update(status=Document.STATUS_FAILED, status_error='No text')
+        _finish_duplicates(self.original.id)
+
+        self.copy.refresh_from_db()
+        self.assertEqual((self.copy.status, self.copy.status_error), (Document.STATUS_FAILED, 'No text'))
+        self.assertEqual(self.copy.pages.count(), 0)
+
+    def test_duplicate_waits_while_the_original_is_extracting(self):
+        Document.objects.filter(id=self.original.id).update(status=Document.STATUS_PROCESSING)
+        _finish_duplicates(self.original.id)
+
+        self.copy.refresh_from_db()
+        self.assertEqual(self.copy.status, Document.STATUS_PENDING)
@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from ..models import Document
+from ..services.export_service import export_lines
+from ..services.generation_service import save_flashcards, save_quiz
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cell Biology', file='uploads/cells.pdf')
+        save_flashcards(self.document, [{'question': 'old', 'answer': 'old'}])
+        save_flashcards(self.document, [{'question': 'What is\ta <cell>?', 'answer': 'A "unit"\nof life'}])
+        save_quiz(self.document, [{
+            'question_text': 'Which?', 'options': ['w', 'x', 'y', 'z'], 'correct_answer': 2, 'explanation': 'Because'
+        }])
+
+    def test_csv_has_the_current_version_only(self):
+        lines = list(export_lines('csv', 'all', [self.document.id]))
+        self.assertEqual(lines[0].rstrip(), 'type,document_id,document,question,answer,option_a,option_b,'
+                                            'option_c,option_d,correct_answer,explanation')
+        rows = ''.join(lines[1:])
+        self.assertNotIn('old', rows)
+        self.assertIn(f'flashcard,{self.document.id},Cell Biology,What is\ta <cell>?,"A ""unit""\nof life"', rows)
+        self.assertIn(f'quiz_question,{self.document.id},Cell Biology,Which?,y,w,x,y,z,C,Because', rows)
+
+    def test_anki_fields_are_escaped_one_note_per_line(self):
+        lines = list(export_lines('anki', 'flashcards', [self.document.id]))
+        self.assertEqual(lines[0], '#separator:tab\n#html:true\n#tags column:3\n')
+        self.assertEqual(lines[1:], ['What is a &lt;cell&gt;?\tA &quot;unit&quot;<br>of life\tfutured cell-biology\n'])
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            export_lines('xml')
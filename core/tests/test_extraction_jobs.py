@@ -0,0 +1,72 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Document
+from ..services import extraction_jobs
+
+
+@mock.patch('core.services.extraction_jobs.ingest_document')
+class RunExtractionTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cells', file='uploads/cells.pdf')
+
+    def test_pending_document_is_claimed_and_extracted(self, ingest):
+        extraction_jobs._run_extraction(self.document.id)
+
+        ingest.assert_called_once()
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, Document.STATUS_READY)
+
+    def test_document_claimed_elsewhere_is_not_extracted_again(self, ingest):
+        for status in (Document.STATUS_PROCESSING, Document.STATUS_READY):
+            with self.subTest(status=status):
+                Document.objects.filter(id=self.document.id).update(status=status)
+                extraction_jobs._run_extraction(self.document.id)
+
+                ingest.assert_not_called()
+                self.document.refresh_from_db()
+                self.assertEqual(self.document.status, status)
+
+    def test_failed_extraction_records_the_error(self, ingest):
+        ingest.side_effect = Exception('Could not extract meaningful text from PDF.')
+        extraction_jobs._run_extraction(self.document.id)
+
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, Document.STATUS_FAILED)
+        self.assertEqual(self.document.status_error, 'Could not extract meaningful text from PDF.')
+
+
+@override_settings(EXTRACTION_STALE_SECONDS=120)
+class ResumeStaleExtractionTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cells', file='uploads/cells.pdf')
+
+    def resume(self, status, updated_at):
+        Document.objects.filter(id=self.document.id).update(status=status, status_updated_at=updated_at)
+        self.document.refresh_from_db()
+        with self.captureOnCommitCallbacks() as callbacks:
+            resumed = extraction_jobs.resume_stale_extraction(self.document)
+        self.assertEqual(len(callbacks), int(resumed))
+        return resumed
+
+    def test_processing_job_is_resumed_once_its_heartbeat_is_stale(self):
+        self.assertFalse(self.resume(Document.STATUS_PROCESSING, timezone.now() - timedelta(seconds=60)))
+        self.assertTrue(self.resume(Document.STATUS_PROCESSING, timezone.now() - timedelta(seconds=180)))
+
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, Document.STATUS_PENDING)
+
+    def test_pending_job_is_resumed_only_if_queued_before_this_process(self):
+        started_at = extraction_jobs._started_at
+        self.assertFalse(self.resume(Document.STATUS_PENDING, started_at + timedelta(seconds=1)))
+        self.assertTrue(self.resume(Document.STATUS_PENDING, started_at - timedelta(seconds=1)))
+
+    def test_job_running_here_or_finished_is_not_resumed(self):
+        self.assertFalse(self.resume(Document.STATUS_READY, timezone.now() - timedelta(hours=1)))
+
+        extraction_jobs._active.add(self.document.id)
+        self.addCleanup(extraction_jobs._active.discard, self.document.id)
+        self.assertFalse(self.resume(Document.STATUS_PROCESSING, timezone.now() - timedelta(hours=1)))
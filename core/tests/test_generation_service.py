@@ -0,0 +1,46 @@
+from django.test import TestCase, override_settings
+
+from ..models import Document, Flashcard, Generation, Quiz
+from ..services.generation_service import current_flashcards, current_quiz, save_flashcards, save_quiz
+
+
+class GenerationVersioningTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cells', file='uploads/cells.pdf')
+
+    def test_each_save_is_a_new_current_version(self):
+        save_flashcards(self.document, [{'question': 'old', 'answer': 'a'}])
+        save_flashcards(self.document, [{'question': 'Q1', 'answer': 'A1'}, {'question': 'Q2', 'answer': 'A2'}])
+
+        versions = list(self.document.generations.filter(kind=Generation.KIND_FLASHCARDS).values_list('version', 'item_count'))
+        self.assertEqual(versions, [(2, 2), (1, 1)])
+        self.assertEqual([card.question for card in current_flashcards(self.document)], ['Q1', 'Q2'])
+
+    @override_settings(GENERATION_RETENTION=2)
+    def test_versions_beyond_retention_are_pruned(self):
+        for i in range(4):
+            save_flashcards(self.document, [{'question': f'Q{i}', 'answer': 'A'}])
+            save_quiz(self.document, [{'question_text': f'Q{i}', 'options': ['a', 'b'], 'correct_answer': 0}])
+
+        for kind in (Generation.KIND_FLASHCARDS, Generation.KIND_QUIZ):
+            versions = self.document.generations.filter(kind=kind).values_list('version', flat=True)
+            self.assertEqual(list(versions), [4, 3])
+        self.assertEqual(Flashcard.objects.filter(document=self.document).count(), 2)
+        self.assertEqual(Quiz.objects.filter(document=self.document).count(), 2)
+        self.assertEqual(current_quiz(self.document).questions.get().question_text, 'Q3')
+
+    def test_failed_save_keeps_the_previous_version(self):
+        save_flashcards(self.document, [{'question': 'Q1', 'answer': 'A1'}])
+        with self.assertRaises(TypeError):
+            save_flashcards(self.document, [{'question': 'Q2', 'answer': 'A2'}, {'question': 'Q3', 'bogus': 1}])
+
+        self.assertEqual(self.document.generations.count(), 1)
+        self.assertEqual([card.question for card in current_flashcards(self.document)], ['Q1'])
+
+    def test_legacy_cards_without_a_version_are_not_current(self):
+        Flashcard.objects.create(document=self.document, question='legacy', answer='a')
+        self.assertEqual(list(current_flashcards(self.document)), [])
+        self.assertIsNone(current_quiz(self.document))
+
+        save_flashcards(self.document, [{'question': 'Q1', 'answer': 'A1'}])
+        self.assertEqual([card.question for card in current_flashcards(self.document)], ['Q1'])
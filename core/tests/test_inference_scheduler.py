@@ -0,0 +1,81 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from ..services.inference_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, InferenceScheduler
+
+
+class InferenceSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = InferenceScheduler(max_in_flight=1)
+
+    async def test_waiters_run_by_priority_then_arrival(self):
+        await self.scheduler.acquire_async()
+        order = []
+
+        async def job(name, priority):
+            await self.scheduler.acquire_async(priority)
+            order.append(name)
+            self.scheduler.release()
+
+        tasks = [
+            asyncio.create_task(job('background', PRIORITY_BACKGROUND)),
+            asyncio.create_task(job('first', PRIORITY_INTERACTIVE)),
+            asyncio.create_task(job('second', PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)  # Let every job queue
+        self.scheduler.release()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order, ['first', 'second', 'background'])
+
+    async def test_identical_calls_share_one_execution(self):
+        calls = 0
+
+        async def generate():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 'cards'
+
+        results = await asyncio.gather(*(self.scheduler.arun('key', generate) for _ in range(3)))
+        self.assertEqual(results, ['cards'] * 3)
+        self.assertEqual(calls, 1)
+
+        # A finished flight is not reused
+        await self.scheduler.arun('key', generate)
+        self.assertEqual(calls, 2)
+
+    async def test_shared_call_failure_reaches_every_caller(self):
+        async def generate():
+            await asyncio.sleep(0.01)
+            raise ValueError('model error')
+
+        results = await asyncio.gather(*(self.scheduler.arun('key', generate) for _ in range(2)),
+                                       return_exceptions=True)
+        self.assertEqual([type(result) for result in results], [ValueError, ValueError])
+
+    async def test_cancelled_waiter_does_not_hold_a_slot(self):
+        await self.scheduler.acquire_async()
+        waiting = asyncio.create_task(self.scheduler.acquire_async())
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.scheduler.release()
+
+        await asyncio.wait_for(self.scheduler.acquire_async(), timeout=1)
+
+    async def test_slot_handed_to_a_cancelled_waiter_is_released(self):
+        await self.scheduler.acquire_async()
+        waiting = asyncio.create_task(self.scheduler.acquire_async())
+        await asyncio.sleep(0)
+
+        # The slot is handed over, but the waiter is cancelled before it runs
+        self.scheduler.release()
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+        await asyncio.wait_for(self.scheduler.acquire_async(), timeout=1)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import LLMCacheEntry
+from ..services import llm_cache
+
+
+def store(name):
+    # 936 characters + a 64-character prompt hash = 1000 bytes per entry
+    key, prompt_hash = llm_cache.make_key('llama3.2:3b', name, 0.7, 500)
+    llm_cache.put(key, prompt_hash, 'llama3.2:3b', 0.7, 500, name[0] * 936)
+    return key
+
+
+@override_settings(LLM_CACHE_MAX_BYTES=3000)
+class LLMCacheEvictionTests(TestCase):
+    def setUp(self):
+        # The running size is process-wide; recount it for this test's empty table
+        llm_cache.evict(10 ** 9)
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        keys = [store(name) for name in ('a', 'b', 'c')]
+        for minutes, key in zip((3, 2, 1), keys):
+            LLMCacheEntry.objects.filter(key=key).update(last_used_at=timezone.now() - timedelta(minutes=minutes))
+        self.assertEqual(llm_cache.get(keys[0]), 'a' * 936)
+
+        store('d')
+
+        # Down to 90% of the limit: the two least recently used entries go
+        self.assertEqual({response[0] for response in LLMCacheEntry.objects.values_list('response', flat=True)}, {'a', 'd'})
+        self.assertIsNone(llm_cache.get(keys[1]))
+
+    def test_nothing_is_evicted_under_the_limit(self):
+        for name in ('a', 'b', 'c'):
+            store(name)
+        store('a')  # Replacing an entry does not grow the cache
+
+        self.assertEqual(LLMCacheEntry.objects.count(), 3)
+        self.assertEqual(llm_cache.evict(3000), 0)
@@ -0,0 +1,15 @@
+from django.test import SimpleTestCase
+
+from ..services.pdf_service import _split_page_ranges
+
+
+class SplitPageRangesTests(SimpleTestCase):
+    def test_ranges_cover_every_page_in_order(self):
+        for num_pages, workers in ((1, 4), (5, 4), (100, 4), (101, 3)):
+            with self.subTest(num_pages=num_pages, workers=workers):
+                ranges = _split_page_ranges(num_pages, workers)
+                self.assertEqual([page for start, end in ranges for page in range(start, end)], list(range(num_pages)))
+                self.assertLessEqual(len(ranges), workers * 4)
+
+    def test_empty_document_has_no_ranges(self):
+        self.assertEqual(_split_page_ranges(0, 4), [])
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from ..models import Document, DocumentPage
+from ..services.search_service import build_match_query, search_pages
+
+
+class BuildMatchQueryTests(SimpleTestCase):
+    def test_words_are_quoted_and_the_last_is_a_prefix(self):
+        self.assertEqual(build_match_query('cell division'), '"cell" "division"*')
+
+    def test_fts_syntax_is_not_passed_through(self):
+        self.assertEqual(build_match_query('cell* OR "x" NEAR(a)'), '"cell" "OR" "x" "NEAR" "a"*')
+        self.assertEqual(build_match_query('"*()'), '')
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cells', file='uploads/cells.pdf')
+        self.page = DocumentPage.objects.create(
+            document=self.document, page_number=3, text='Mitosis divides the nucleus', has_text=True
+        )
+
+    def indexed_rows(self, word):
+        # Query the index itself: search_pages() joins back to the pages
+        # table, which would hide entries left behind for deleted rows
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM core_documentpage_fts WHERE core_documentpage_fts MATCH %s", [word])
+            return sorted(row[0] for row in cursor.fetchall())
+
+    def test_inserted_page_is_searchable(self):
+        self.assertEqual(self.indexed_rows('mitosis'), [self.page.id])
+        hits = search_pages('mitos')
+        self.assertEqual([(hit['document_id'], hit['page']) for hit in hits], [(self.document.id, 3)])
+        self.assertIn('<mark>Mitosis</mark>', hits[0]['snippet'])
+
+    def test_updated_page_is_reindexed(self):
+        self.page.text = 'Meiosis halves the chromosomes'
+        self.page.save()
+
+        self.assertEqual(self.indexed_rows('mitosis'), [])
+        self.assertEqual(self.indexed_rows('meiosis'), [self.page.id])
+
+    def test_deleted_pages_leave_the_index(self):
+        other = Document.objects.create(title='More cells', file='uploads/more.pdf')
+        other_page = DocumentPage.objects.create(document=other, page_number=1, text='Mitosis again', has_text=True)
+
+        self.page.delete()
+        self.assertEqual(self.indexed_rows('mitosis'), [other_page.id])
+
+        # Deleting the document cascades to its pages
+        other.delete()
+        self.assertEqual(self.indexed_rows('mitosis'), [])
@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from ..services.ollama_service import FLASHCARD_KEYS
+from ..services.stream_parser import JSONItemStreamParser, parse_items
+
+
+def _feed_in_pieces(parser, text, size):
+    items = []
+    for i in range(0, len(text), size):
+        items += parser.feed(text[i:i + size])
+    return items + parser.finish()
+
+
+class JSONItemStreamParserTests(SimpleTestCase):
+    REPLY = (
+        'Here are your flashcards:\n```json\n['
+        '{"question": "What does {x} mean?", "answer": "A \\"set\\" with one element"},'
+        '{"question": "Q2", "answer": "A2"}'
+        ']\n```'
+    )
+
+    def test_items_are_the_same_however_the_text_is_split(self):
+        expected = [
+            {'question': 'What does {x} mean?', 'answer': 'A "set" with one element'},
+            {'question': 'Q2', 'answer': 'A2'},
+        ]
+        for size in (1, 2, 7, len(self.REPLY)):
+            with self.subTest(size=size):
+                self.assertEqual(_feed_in_pieces(JSONItemStreamParser(FLASHCARD_KEYS), self.REPLY, size), expected)
+
+    def test_item_is_returned_when_its_closing_brace_arrives(self):
+        parser = JSONItemStreamParser(FLASHCARD_KEYS)
+        self.assertEqual(parser.feed('[{"question": "Q1", "answer": "A1"'), [])
+        self.assertEqual(parser.feed('}, {"question": '), [{'question': 'Q1', 'answer': 'A1'}])
+
+    def test_malformed_item_is_skipped(self):
+        parser = JSONItemStreamParser(FLASHCARD_KEYS)
+        items = parser.feed('[{"question": "Q1" "answer": "A1"}, {"question": "Q2", "answer": "A2",}]')
+        self.assertEqual(items, [{'question': 'Q2', 'answer': 'A2'}])
+        self.assertEqual(parser.malformed, 1)
+
+    def test_truncated_item_is_repaired_between_values(self):
+        items = parse_items('[{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "A2", ', FLASHCARD_KEYS)
+        self.assertEqual(items, [{'question': 'Q1', 'answer': 'A1'}, {'question': 'Q2', 'answer': 'A2'}])
+
+    def test_truncated_item_is_dropped_mid_string_or_without_required_keys(self):
+        self.assertEqual(parse_items('[{"question": "Q1", "answer": "half a sen', FLASHCARD_KEYS), [])
+        self.assertEqual(parse_items('[{"question": "Q1", "ans', FLASHCARD_KEYS), [])
+
+    def test_wrapped_array_is_unwrapped(self):
+        expected = [{'question': 'Q1', 'answer': 'A1'}, {'question': 'Q2', 'answer': 'A2'}]
+        self.assertEqual(
+            parse_items('{"flashcards": [{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "A2"}]}',
+                        FLASHCARD_KEYS),
+            expected
+        )
+        self.assertEqual(
+            parse_items('{"data": {"cards": [{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "A2"',
+                        FLASHCARD_KEYS),
+            expected
+        )
+
+    def test_item_with_a_list_of_objects_is_not_unwrapped(self):
+        item = {'question': 'Q1', 'options': [{'text': 'a'}]}
+        self.assertEqual(parse_items('[{"question": "Q1", "options": [{"text": "a"}]}]', FLASHCARD_KEYS), [item])
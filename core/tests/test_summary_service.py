@@ -0,0 +1,65 @@
+import threading
+
+from django.test import TestCase, override_settings
+
+from ..models import Document, DocumentPage
+from ..services.summary_service import generate_map_reduce_summary
+
+
+class FakeOllama:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.summarized = []
+
+    def summarize_chunk(self, text, page_start, page_end):
+        with self.lock:
+            self.summarized.append(page_start)
+        return f"summary of {text.split()[-1]}"
+
+    def reduce_summaries(self, summaries):
+        return ' | '.join(summary.split('\n')[1] for summary in summaries)
+
+
+@override_settings(SUMMARY_MAP_CHUNK_CHARS=100, SUMMARY_REDUCE_MAX_CHARS=6000)
+class MapReduceSummaryTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(title='Cells', file='uploads/cells.pdf')
+        for page_number, word in enumerate(['mitosis', 'meiosis', 'osmosis'], start=1):
+            self.set_page(page_number, word)
+
+    def set_page(self, page_number, word):
+        # Each page is over half a chunk, so every chunk holds one page
+        DocumentPage.objects.update_or_create(
+            document=self.document, page_number=page_number,
+            defaults={'text': 'x' * 60 + f' {word}', 'has_text': True}
+        )
+
+    def summarize(self, **kwargs):
+        ollama = FakeOllama()
+        summary = generate_map_reduce_summary(ollama, self.document, **kwargs)
+        return summary, sorted(ollama.summarized)
+
+    def test_unchanged_chunks_are_reused(self):
+        self.assertEqual(self.summarize(), ('summary of mitosis | summary of meiosis | summary of osmosis', [1, 2, 3]))
+        self.assertEqual(self.document.summary_chunks.count(), 3)
+
+        self.assertEqual(self.summarize(), ('summary of mitosis | summary of meiosis | summary of osmosis', []))
+
+    def test_only_changed_chunks_are_summarized_again(self):
+        self.summarize()
+        self.set_page(2, 'cytokinesis')
+
+        summary, summarized = self.summarize()
+        self.assertEqual(summary, 'summary of mitosis | summary of cytokinesis | summary of osmosis')
+        self.assertEqual(summarized, [2])
+
+    def test_regenerate_chunks_summarizes_everything(self):
+        self.summarize()
+        self.assertEqual(self.summarize(regenerate_chunks=True)[1], [1, 2, 3])
+
+    def test_chunks_past_the_end_are_removed(self):
+        self.summarize()
+        self.document.pages.filter(page_number=3).delete()
+
+        self.assertEqual(self.summarize(), ('summary of mitosis | summary of meiosis', []))
+        self.assertEqual(list(self.document.summary_chunks.values_list('index', flat=True)), [0, 1])
@@ -0,0 +1,51 @@
+from django.test import SimpleTestCase
+
+from ..services.text_selection import CHUNK_SEPARATOR, ChunkIndex, chunk_text, select_text
+
+
+TOPICS = ['mitosis', 'meiosis', 'ribosome', 'enzyme', 'membrane', 'osmosis', 'glucose', 'neuron', 'hormone', 'allele']
+
+
+def make_chunk(topic):
+    return f"The {topic} section. " + f"{topic} " * 10 + "cell " * 5
+
+
+class ChunkIndexSelectTests(SimpleTestCase):
+    def setUp(self):
+        self.chunks = [make_chunk(topic) for topic in TOPICS]
+        self.index = ChunkIndex(self.chunks)
+        self.chunk_size = len(self.chunks[0]) + len(CHUNK_SEPARATOR)
+
+    def selected(self, text):
+        return [self.chunks.index(chunk) for chunk in text.split(CHUNK_SEPARATOR)]
+
+    def test_selection_fits_and_keeps_document_order(self):
+        text = self.index.select(self.chunk_size * 4)
+        positions = self.selected(text)
+        self.assertLessEqual(len(text), self.chunk_size * 4)
+        self.assertEqual(len(positions), 4)
+        self.assertEqual(positions, sorted(positions))
+
+    def test_selection_covers_every_region(self):
+        # Room for three chunks makes three regions: chunks 0-2, 3-5 and 6-9
+        positions = self.selected(self.index.select(self.chunk_size * 3))
+        regions = [max(region for region in range(3) if region * len(self.chunks) // 3 <= position)
+                   for position in positions]
+        self.assertEqual(regions, [0, 1, 2])
+
+    def test_query_picks_matching_chunks(self):
+        text = self.index.select(self.chunk_size, query='What does a neuron do?')
+        self.assertEqual(self.selected(text), [TOPICS.index('neuron')])
+
+        # The best match of each half, rather than the two best overall
+        text = self.index.select(self.chunk_size * 2, query='meiosis enzyme neuron')
+        self.assertEqual(self.selected(text), [TOPICS.index('meiosis'), TOPICS.index('neuron')])
+
+    def test_small_budget_truncates_the_first_chunk(self):
+        self.assertEqual(self.index.select(20), self.chunks[0][:20])
+        self.assertEqual(ChunkIndex([]).select(100), '')
+
+    def test_short_text_is_returned_unchanged(self):
+        text = "\n\n".join(self.chunks)
+        self.assertEqual(select_text(text, len(text)), text)
+        self.assertEqual(chunk_text(text, len(self.chunks[0])), self.chunks)
@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..services import token_budget
+
+
+@override_settings(OLLAMA_MODEL_BUDGETS={
+    'default': {'context': 4096},
+    'llama3.2': {'context': 8192, 'chars_per_token': 4.0},
+    'qwen': {'context': 32768},
+})
+class TokenBudgetTests(SimpleTestCase):
+    def setUp(self):
+        token_budget._calibration.clear()
+        self.addCleanup(token_budget._calibration.clear)
+
+    def test_budget_is_matched_by_name_then_base_then_prefix(self):
+        self.assertEqual(token_budget.get_budget('llama3.2:3b')['context'], 8192)
+        self.assertEqual(token_budget.get_budget('qwen2.5:7b')['context'], 32768)
+        self.assertEqual(token_budget.get_budget('mistral')['context'], 4096)
+        self.assertEqual(token_budget.get_budget('mistral')['chars_per_token'], 3.5)
+
+    def test_usage_calibrates_a_moving_average(self):
+        self.assertEqual(token_budget.chars_per_token('llama3.2:3b'), 4.0)
+
+        token_budget.record_usage('llama3.2:3b', 3000, 1000)
+        self.assertEqual(token_budget.chars_per_token('llama3.2:3b'), 3.0)
+        token_budget.record_usage('llama3.2:3b', 2000, 1000)
+        self.assertAlmostEqual(token_budget.chars_per_token('llama3.2:3b'), 2.8)
+
+        # Calibration is per model
+        self.assertEqual(token_budget.chars_per_token('llama3.2:1b'), 4.0)
+        self.assertEqual(token_budget.estimate_tokens('x' * 280, 'llama3.2:3b'), 100)
+
+    def test_implausible_samples_are_ignored(self):
+        token_budget.record_usage('llama3.2:3b', 150, 50)  # Too short to tell
+        token_budget.record_usage('llama3.2:3b', 3000, 100)  # Cached prefix: too few tokens
+        token_budget.record_usage('llama3.2:3b', 3000, 3000)
+        token_budget.record_usage('llama3.2:3b', 3000, 0)
+        self.assertEqual(token_budget.chars_per_token('llama3.2:3b'), 4.0)
+
+    def test_text_budget_follows_the_calibration(self):
+        template = 'x' * 400  # 100 tokens at 4 chars per token
+        self.assertEqual(token_budget.text_budget('llama3.2:3b', template, 500), int((8192 - 100 - 500 - 64) * 4.0 * 0.9))
+
+        token_budget.record_usage('llama3.2:3b', 2000, 1000)
+        self.assertEqual(token_budget.text_budget('llama3.2:3b', template, 500), int((8192 - 200 - 500 - 64) * 2.0 * 0.9))
+
+        # A large output request still leaves room for some text
+        self.assertEqual(token_budget.text_budget('mistral', template, 4000), 1000)
@@ -0,0 +1,28 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Compute a SHA-256 digest of each uploaded file as it streams in.
+
+    Chunks are passed through unchanged to the next handler, so the file is
+    still stored by Django's default handlers. Digests are collected in
+    ``request.upload_digests``, keyed by form field name.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_digests'):
+            self.request.upload_digests = {}
+        self.request.upload_digests[self.field_name] = self.hasher.hexdigest()
+        # Let the next handler build the uploaded file object
+        return None
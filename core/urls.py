@@ -7,8 +7,19 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('upload/', views.upload_pdf, name='upload_pdf'),
     path('workspace/<int:document_id>/', views.workspace, name='workspace'),
+    path('api/extraction-status/<int:document_id>/', views.extraction_status, name='extraction_status'),
+    path('api/pages/<int:document_id>/', views.page_sizes, name='page_sizes'),
+    path('api/page/<int:document_id>/<int:page_number>/', views.page_image, name='page_image'),
     path('api/summary/<int:document_id>/', views.generate_summary, name='generate_summary'),
     path('api/flashcards/<int:document_id>/', views.generate_flashcards, name='generate_flashcards'),
     path('api/quiz/<int:document_id>/', views.generate_quiz, name='generate_quiz'),
+    path('api/summary/<int:document_id>/stream/', views.stream_summary, name='stream_summary'),
+    path('api/flashcards/<int:document_id>/stream/', views.stream_flashcards, name='stream_flashcards'),
+    path('api/quiz/<int:document_id>/stream/', views.stream_quiz, name='stream_quiz'),
+    path('api/generate-all/<int:document_id>/', views.generate_all, name='generate_all'),
+    path('api/search/', views.search, name='search'),
+    path('api/export/', views.export_study_material, name='export'),
+    path('api/export/<int:document_id>/', views.export_study_material, name='export_document'),
     path('api/ollama-status/', views.check_ollama_status, name='ollama_status'),
+    path('api/metrics/', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -1,15 +1,34 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.http import JsonResponse, FileResponse, Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.http import require_http_methods, condition
 from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+import asyncio
 import json
 import traceback
-import requests
+from asgiref.sync import sync_to_async
 
-from . models import Document, Summary, Flashcard, Quiz, QuizQuestion
+from . models import Document, Summary
 from . forms import DocumentUploadForm
-from .services.pdf_service import extract_text_from_pdf
-from .services.ollama_service import OllamaService
+from .services.ollama_service import OllamaService, FLASHCARD_KEYS, QUESTION_KEYS
+from .services.stream_parser import JSONItemStreamParser
+from .services.ollama_async import AsyncOllamaService, new_async_client
+from .services.ollama_monitor import get_monitor
+from .services.circuit_breaker import CircuitOpenError
+from .services import metrics
+from .services.extraction_jobs import submit_extraction, resume_stale_extraction
+from .services.search_service import search_pages
+from .services.generation_service import save_flashcards, save_quiz
+from .services.text_store import load_text
+from .services.export_service import FORMATS as EXPORT_FORMATS, export_lines
+from .services.summary_service import generate_map_reduce_summary, map_chunk_summaries
+from .services.render_service import (
+    get_zoom_buckets, zoom_bucket, page_etag, get_rendered_page, get_page_sizes
+)
+from .services.document_service import (
+    hash_uploaded_file, find_duplicate, copy_artifacts, get_page_range_text
+)
 
 
 def home(request):
@@ -27,18 +46,27 @@ def upload_pdf(request):
     """Handle PDF upload."""
     form = DocumentUploadForm(request.POST, request.FILES)
     if form.is_valid():
+        uploaded_file = request.FILES['file']
+        content_hash = getattr(request, 'upload_digests', {}).get('file') or hash_uploaded_file(uploaded_file)
+        
         document = form.save(commit=False)
-        document.title = request.FILES['file'].name.replace('. pdf', '')
-        document.save()
+        document.title = uploaded_file.name.replace('. pdf', '')
+        document.content_hash = content_hash
         
-        # Extract text from PDF
-        try:
-            extracted_text = extract_text_from_pdf(document.file.path)
-            document.extracted_text = extracted_text
+        # Reuse the stored file and generated artifacts of an identical upload
+        original = find_duplicate(content_hash)
+        if original:
+            document.file = original.file.name
+            document.save()
+            if original.text_length:
+                copy_artifacts(original, document)
+                return redirect('core:workspace', document_id=document.id)
+        else:
             document.save()
-        except Exception as e:
-            print(f"Error extracting text: {e}")
-            traceback.print_exc()
+        
+        # Extract text from PDF in the background (or wait for the original's
+        # extraction to finish); the workspace polls for progress
+        submit_extraction(document, original)
         
         return redirect('core:workspace', document_id=document.id)
     
@@ -49,36 +77,199 @@ def workspace(request, document_id):
     """Workspace page with PDF viewer and tools."""
     document = get_object_or_404(Document, id=document_id)
     
-    # Check Ollama status with detailed info
+    # Ollama status from the background monitor's latest probe
+    snapshot = get_monitor().snapshot()
     ollama_status = {
-        'available':  False,
-        'models': [],
-        'error': None,
-        'server_running': False
+        'available': OllamaService().is_available(recheck=False),
+        'models': snapshot['models'],
+        'error': snapshot['error'],
+        'server_running': snapshot['reachable']
     }
     
-    try:
-        # First check if server is reachable
-        response = requests.get('http://localhost:11434', timeout=5)
-        ollama_status['server_running'] = True
-        
-        # Then check models
-        ollama = OllamaService()
-        ollama_status['available'] = ollama.is_available()
-        ollama_status['models'] = ollama.get_available_models()
-        
-    except requests.exceptions. ConnectionError:
-        ollama_status['error'] = 'Cannot connect to localhost:11434'
-    except Exception as e:
-        ollama_status['error'] = str(e)
+    resume_stale_extraction(document)
     
     return render(request, 'core/workspace.html', {
         'document': document,
         'ollama_status': ollama_status,
-        'text_extracted': bool(document.extracted_text and len(document.extracted_text.strip()) > 100)
+        'text_extracted': document.text_extracted
+    })
+
+
+@require_http_methods(["GET"])
+def extraction_status(request, document_id):
+    """Report background text extraction progress for a document."""
+    document = get_object_or_404(Document, id=document_id)
+    resume_stale_extraction(document)
+    
+    return JsonResponse({
+        'status': document.status,
+        'pages_done': document.pages_done,
+        'page_count': document.page_count,
+        'text_extracted': document.text_extracted,
+        'error': document.status_error or None
+    })
+
+
+def _requested_zoom_bucket(request):
+    try:
+        zoom = float(request.GET.get('zoom', 1.0))
+    except ValueError:
+        zoom = 1.0
+    return zoom_bucket(zoom)
+
+
+def _page_image_etag(request, document_id, page_number):
+    document = Document.objects.only('id', 'content_hash').filter(id=document_id).first()
+    if document is None:
+        return None
+    return page_etag(document, page_number, _requested_zoom_bucket(request))
+
+
+@require_http_methods(["GET"])
+def page_sizes(request, document_id):
+    """Page dimensions for laying out the viewer before images load."""
+    document = get_object_or_404(Document, id=document_id)
+    
+    try:
+        pages = get_page_sizes(document.file.path)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+    
+    return JsonResponse({
+        'success': True,
+        'pages': pages,
+        'zoom_buckets': get_zoom_buckets()
     })
 
 
+@require_http_methods(["GET"])
+@condition(etag_func=_page_image_etag)
+def page_image(request, document_id, page_number):
+    """Serve a server-rendered page image from the on-disk render cache."""
+    document = get_object_or_404(Document, id=document_id)
+    
+    try:
+        path = get_rendered_page(document, page_number, _requested_zoom_bucket(request))
+    except IndexError:
+        raise Http404("Page not found")
+    
+    response = FileResponse(open(path, 'rb'), content_type='image/png')
+    response['Cache-Control'] = f"public, max-age={getattr(settings, 'PAGE_RENDER_MAX_AGE', 86400)}"
+    return response
+
+
+def _circuit_open_response(error):
+    """Reject a generation at once while the Ollama circuit breaker is open."""
+    return JsonResponse({
+        'success': False,
+        'error': str(error),
+        'retry_after': int(error.retry_after) + 1
+    }, status=503)
+
+
+def _flashcard_fields(card):
+    """Turn one generated flashcard into Flashcard fields."""
+    # Safely extract question and answer
+    if isinstance(card, dict):
+        question = card.get('question', 'Question unavailable')
+        answer = card.get('answer', 'Answer unavailable')
+    else:
+        question = str(card)
+        answer = 'Please regenerate flashcards.'
+    
+    return {
+        'question': question,
+        'answer': answer
+    }
+
+
+def _save_flashcards(document, flashcards_data):
+    """Store newly generated flashcards as the document's next version."""
+    saved = save_flashcards(document, [_flashcard_fields(card) for card in flashcards_data])
+    return [
+        {
+            'id': fc.id,
+            'question': fc.question,
+            'answer': fc.answer
+        }
+        for fc in saved
+    ]
+
+
+def _quiz_question_fields(q):
+    """Turn one generated quiz question into QuizQuestion fields."""
+    # Safely extract question data with defaults
+    if isinstance(q, dict):
+        question_text = q.get('question', 'Question unavailable')
+        options = q. get('options', ['Option A', 'Option B', 'Option C', 'Option D'])
+        correct_answer = q.get('correct_answer', 0)
+        explanation = q.get('explanation', '')
+    else:
+        question_text = str(q)
+        options = ['Option A', 'Option B', 'Option C', 'Option D']
+        correct_answer = 0
+        explanation = ''
+    
+    # Ensure options is a valid list
+    if not isinstance(options, list) or len(options) < 2:
+        options = ['Option A', 'Option B', 'Option C', 'Option D']
+    
+    # Ensure all options are strings
+    options = [str(opt) for opt in options[:4]]
+    while len(options) < 4:
+        options.append(f'Option {len(options) + 1}')
+    
+    # Ensure correct_answer is valid
+    if not isinstance(correct_answer, int):
+        try:
+            correct_answer = int(correct_answer)
+        except:
+            correct_answer = 0
+    correct_answer = max(0, min(correct_answer, len(options) - 1))
+    
+    return {
+        'question_text': str(question_text),
+        'options': options,
+        'correct_answer': correct_answer,
+        'explanation': str(explanation) if explanation else ''
+    }
+
+
+def _save_quiz(document, quiz_data):
+    """Store a newly generated quiz as the document's next version."""
+    quiz, saved = save_quiz(document, [_quiz_question_fields(q) for q in quiz_data])
+    questions = [
+        {
+            'id':  question.id,
+            'question': question. question_text,
+            'options': question.options,
+            'correct_answer': question.correct_answer,
+            'explanation': question.explanation
+        }
+        for question in saved
+    ]
+    return quiz, questions
+
+
+def _parse_page_range(data):
+    """Return (page_start, page_end) from request data, or None for the whole document."""
+    if data.get('page_start') in (None, '') and data.get('page_end') in (None, ''):
+        return None
+    try:
+        page_start = max(int(data.get('page_start') or 1), 1)
+        page_end = int(data.get('page_end') or page_start)
+    except (TypeError, ValueError):
+        return None
+    return page_start, max(page_start, page_end)
+
+
+def _get_source_text(document, page_range):
+    """Get the text to generate from: a page range, or the whole document."""
+    if page_range:
+        return get_page_range_text(document, *page_range)
+    return load_text(document)
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def generate_summary(request, document_id):
@@ -90,10 +281,13 @@ def generate_summary(request, document_id):
         data = json.loads(request.body) if request.body else {}
         force_regenerate = data.get('regenerate', False)
     except:
+        data = {}
         force_regenerate = False
+    page_range = _parse_page_range(data)
     
     # Check if summary already exists and not forcing regeneration
-    if not force_regenerate: 
+    # (page-range summaries are not stored as the document summary)
+    if not force_regenerate and not page_range:
         try:
             summary = document.summary
             return JsonResponse({
@@ -105,14 +299,16 @@ def generate_summary(request, document_id):
             pass
     
     # Validate extracted text
-    if not document.extracted_text or len(document.extracted_text.strip()) < 50:
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
         return JsonResponse({
             'success': False,
             'error': 'Could not extract enough text from this document.  Please ensure the PDF contains selectable text.'
         })
     
     try:
-        ollama = OllamaService()
+        ollama = OllamaService(use_cache=not force_regenerate)
+        ollama.check_circuit()
         
         if not ollama.is_available():
             return JsonResponse({
@@ -120,19 +316,33 @@ def generate_summary(request, document_id):
                 'error': 'Ollama is not available. Please ensure Ollama is running with a model installed.'
             })
         
-        summary_text = ollama.generate_summary(document.extracted_text)
+        # Long documents are summarized chunk by chunk, then combined
+        use_map_reduce = not page_range and (
+            data.get('mode') == 'map_reduce'
+            or len(source_text) > getattr(settings, 'SUMMARY_MAP_REDUCE_THRESHOLD', 12000)
+        )
+        if use_map_reduce:
+            summary_text = generate_map_reduce_summary(
+                ollama, document, regenerate_chunks=bool(data.get('regenerate_chunks', False))
+            )
+        else:
+            summary_text = ollama.generate_summary(source_text)
         
         # Save or update summary
-        Summary.objects.update_or_create(
-            document=document,
-            defaults={'content': summary_text}
-        )
+        if not page_range:
+            Summary.objects.update_or_create(
+                document=document,
+                defaults={'content': summary_text}
+            )
         
         return JsonResponse({
             'success': True,
             'summary': summary_text,
-            'cached': False
+            'cached': False,
+            'mode': 'map_reduce' if use_map_reduce else 'single'
         })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
     except Exception as e: 
         traceback.print_exc()
         return JsonResponse({
@@ -151,17 +361,21 @@ def generate_flashcards(request, document_id):
         data = json.loads(request.body) if request.body else {}
         num_cards = min(max(int(data.get('num_cards', 5)), 1), 20)
     except:
+        data = {}
         num_cards = 5
+    page_range = _parse_page_range(data)
     
     # Validate extracted text
-    if not document.extracted_text or len(document.extracted_text.strip()) < 50:
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
         return JsonResponse({
             'success': False,
             'error': 'Could not extract enough text from this document.'
         })
     
     try: 
-        ollama = OllamaService()
+        ollama = OllamaService(use_cache=not data.get('regenerate', False))
+        ollama.check_circuit()
         
         if not ollama.is_available():
             return JsonResponse({
@@ -169,37 +383,15 @@ def generate_flashcards(request, document_id):
                 'error': 'Ollama is not running. Please start Ollama first.'
             })
         
-        # Delete existing flashcards
-        document.flashcards.all().delete()
-        
-        flashcards_data = ollama.generate_flashcards(document. extracted_text, num_cards)
-        
-        flashcards = []
-        for i, card in enumerate(flashcards_data):
-            # Safely extract question and answer
-            if isinstance(card, dict):
-                question = card.get('question', 'Question unavailable')
-                answer = card.get('answer', 'Answer unavailable')
-            else:
-                question = str(card)
-                answer = 'Please regenerate flashcards.'
-            
-            fc = Flashcard.objects.create(
-                document=document,
-                question=question,
-                answer=answer,
-                order=i
-            )
-            flashcards.append({
-                'id': fc.id,
-                'question': fc.question,
-                'answer': fc.answer
-            })
+        flashcards_data = ollama.generate_flashcards(source_text, num_cards)
+        flashcards = _save_flashcards(document, flashcards_data)
         
         return JsonResponse({
             'success':  True,
             'flashcards': flashcards
         })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
     except Exception as e: 
         traceback.print_exc()
         return JsonResponse({
@@ -218,17 +410,21 @@ def generate_quiz(request, document_id):
         data = json.loads(request.body) if request.body else {}
         num_questions = min(max(int(data.get('num_questions', 5)), 1), 15)
     except:
+        data = {}
         num_questions = 5
+    page_range = _parse_page_range(data)
     
     # Validate extracted text
-    if not document.extracted_text or len(document.extracted_text. strip()) < 50:
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
         return JsonResponse({
             'success': False,
             'error': 'Could not extract enough text from this document.'
         })
     
     try: 
-        ollama = OllamaService()
+        ollama = OllamaService(use_cache=not data.get('regenerate', False))
+        ollama.check_circuit()
         
         if not ollama.is_available():
             return JsonResponse({
@@ -236,97 +432,518 @@ def generate_quiz(request, document_id):
                 'error': 'Ollama is not running.  Please start Ollama first.'
             })
         
-        quiz_data = ollama.generate_quiz(document.extracted_text, num_questions)
+        quiz_data = ollama.generate_quiz(source_text, num_questions)
+        quiz, questions = _save_quiz(document, quiz_data)
         
-        # Create quiz
-        quiz = Quiz. objects.create(document=document)
+        return JsonResponse({
+            'success': True,
+            'quiz_id': quiz.id,
+            'questions': questions
+        })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        traceback.print_exc()
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+def _sse_event(event, data):
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _aiter_sync(iterator):
+    """
+    Step a sync generator from an async server, one chunk at a time.
+
+    Django's ASGI handler would otherwise collect the whole generator with
+    list() before sending anything. Each step runs on the request's own
+    thread, like a sync view, so database cursors stay on one connection.
+    """
+    done = object()
+    step = sync_to_async(next)
+    try:
+        while (chunk := await step(iterator, done)) is not done:
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+def _iter_async(agen):
+    """
+    Step an async generator from a WSGI server, one chunk at a time.
+
+    Django's WSGI handler would otherwise run the whole generator before
+    sending anything. The generator gets a private event loop in the
+    response's thread; tasks it starts run while the next chunk is awaited.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+def _streaming_response(request, content, content_type):
+    """
+    A StreamingHttpResponse that sends each chunk as soon as it is made.
+
+    ``content`` may be a sync or async generator; it is adapted to the
+    server the request came through (WSGI or ASGI).
+    """
+    if isinstance(request, ASGIRequest):
+        if not hasattr(content, '__aiter__'):
+            content = _aiter_sync(iter(content))
+    elif hasattr(content, '__aiter__'):
+        content = _iter_async(content)
+    return StreamingHttpResponse(content, content_type=content_type)
+
+
+def _sse_response(request, events):
+    """Wrap an event generator in an unbuffered text/event-stream response."""
+    response = _streaming_response(request, events, 'text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let a proxy hold tokens back
+    return response
+
+
+def _stream_events(tokens, finish, on_token=None):
+    """
+    Relay generated tokens as ``token`` events, then a ``done`` event.
+
+    ``on_token`` may return extra (event, data) pairs to send after a token,
+    such as items parsed from it. ``finish`` receives the full generated
+    text once the stream completes, saves it and returns the payload for the
+    ``done`` event. Errors raised while streaming become an ``error`` event,
+    since the response status has already been sent.
+    """
+    parts = []
+    try:
+        for token in tokens:
+            parts.append(token)
+            yield _sse_event('token', {'text': token})
+            if on_token:
+                for event, data in on_token(token):
+                    yield _sse_event(event, data)
+        yield _sse_event('done', finish(''.join(parts)))
+    except CircuitOpenError as e:
+        yield _sse_event('error', {'error': str(e), 'retry_after': int(e.retry_after) + 1})
+    except Exception as e:
+        traceback.print_exc()
+        yield _sse_event('error', {'error': str(e)})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def stream_summary(request, document_id):
+    """Stream a summary for a document over server-sent events."""
+    document = get_object_or_404(Document, id=document_id)
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        force_regenerate = data.get('regenerate', False)
+    except:
+        data = {}
+        force_regenerate = False
+    page_range = _parse_page_range(data)
+    
+    if not force_regenerate and not page_range:
+        try:
+            summary = document.summary
+            return _sse_response(request, iter([_sse_event('done', {
+                'success': True,
+                'summary': summary.content,
+                'cached': True
+            })]))
+        except Summary.DoesNotExist:
+            pass
+    
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
+        return JsonResponse({
+            'success': False,
+            'error': 'Could not extract enough text from this document.  Please ensure the PDF contains selectable text.'
+        })
+    
+    try:
+        ollama = OllamaService(use_cache=not force_regenerate)
+        ollama.check_circuit()
         
-        questions = []
-        for i, q in enumerate(quiz_data):
-            # Safely extract question data with defaults
-            if isinstance(q, dict):
-                question_text = q.get('question', 'Question unavailable')
-                options = q. get('options', ['Option A', 'Option B', 'Option C', 'Option D'])
-                correct_answer = q.get('correct_answer', 0)
-                explanation = q.get('explanation', '')
-            else:
-                question_text = str(q)
-                options = ['Option A', 'Option B', 'Option C', 'Option D']
-                correct_answer = 0
-                explanation = ''
-            
-            # Ensure options is a valid list
-            if not isinstance(options, list) or len(options) < 2:
-                options = ['Option A', 'Option B', 'Option C', 'Option D']
-            
-            # Ensure all options are strings
-            options = [str(opt) for opt in options[:4]]
-            while len(options) < 4:
-                options.append(f'Option {len(options) + 1}')
-            
-            # Ensure correct_answer is valid
-            if not isinstance(correct_answer, int):
-                try:
-                    correct_answer = int(correct_answer)
-                except:
-                    correct_answer = 0
-            correct_answer = max(0, min(correct_answer, len(options) - 1))
-            
-            question = QuizQuestion.objects.create(
-                quiz=quiz,
-                question_text=str(question_text),
-                options=options,
-                correct_answer=correct_answer,
-                explanation=str(explanation) if explanation else '',
-                order=i
-            )
-            questions.append({
-                'id':  question.id,
-                'question': question. question_text,
-                'options': question.options,
-                'correct_answer': question.correct_answer,
-                'explanation': question.explanation
+        if not ollama.is_available():
+            return JsonResponse({
+                'success': False,
+                'error': 'Ollama is not available. Please ensure Ollama is running with a model installed.'
             })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    
+    use_map_reduce = not page_range and (
+        data.get('mode') == 'map_reduce'
+        or len(source_text) > getattr(settings, 'SUMMARY_MAP_REDUCE_THRESHOLD', 12000)
+    )
+    
+    def tokens():
+        if use_map_reduce:
+            # Section summaries are not streamed; only the final reduce is
+            summaries = map_chunk_summaries(
+                ollama, document, regenerate_chunks=bool(data.get('regenerate_chunks', False))
+            )
+            yield from ollama.stream_reduce_summaries(summaries)
+        else:
+            yield from ollama.stream_summary(source_text)
+    
+    def finish(summary_text):
+        if not page_range:
+            Summary.objects.update_or_create(
+                document=document,
+                defaults={'content': summary_text}
+            )
+        return {
+            'success': True,
+            'summary': summary_text,
+            'cached': False,
+            'mode': 'map_reduce' if use_map_reduce else 'single'
+        }
+    
+    def events():
+        if use_map_reduce:
+            yield _sse_event('status', {'message': 'Summarizing document sections...'})
+        yield from _stream_events(tokens(), finish)
+    
+    return _sse_response(request, events())
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def stream_flashcards(request, document_id):
+    """Stream flashcard generation over server-sent events."""
+    document = get_object_or_404(Document, id=document_id)
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        num_cards = min(max(int(data.get('num_cards', 5)), 1), 20)
+    except:
+        data = {}
+        num_cards = 5
+    page_range = _parse_page_range(data)
+    
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
+        return JsonResponse({
+            'success': False,
+            'error': 'Could not extract enough text from this document.'
+        })
+    
+    try:
+        ollama = OllamaService(use_cache=not data.get('regenerate', False))
+        ollama.check_circuit()
         
+        if not ollama.is_available():
+            return JsonResponse({
+                'success': False,
+                'error': 'Ollama is not running. Please start Ollama first.'
+            })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    
+    parser = JSONItemStreamParser(FLASHCARD_KEYS)
+    flashcards = []
+    
+    def add_items(items):
+        # Each card is sent as soon as its closing brace arrives; all are saved together at the end
+        for item in items:
+            card = ollama.validate_item('flashcards', item)
+            if card is None or len(flashcards) >= num_cards:
+                continue
+            flashcards.append(card)
+            yield 'item', card
+    
+    def on_token(token):
+        return add_items(parser.feed(token))
+    
+    def finish(response_text):
+        list(add_items(parser.finish()))
+        # Generate only the cards that were missing or invalid
+        list(add_items(ollama.fill_missing('flashcards', source_text, flashcards, num_cards)))
+        if not flashcards:
+            # Nothing usable; fall back to the lenient parser and its error card
+            metrics.incr('generation.flashcards.fallbacks')
+            flashcards.extend(ollama._parse_flashcards(response_text, num_cards))
+        return {
+            'success': True,
+            'flashcards': _save_flashcards(document, flashcards)
+        }
+    
+    return _sse_response(request, _stream_events(ollama.stream_flashcards(source_text, num_cards), finish, on_token))
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def stream_quiz(request, document_id):
+    """Stream quiz generation over server-sent events."""
+    document = get_object_or_404(Document, id=document_id)
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        num_questions = min(max(int(data.get('num_questions', 5)), 1), 15)
+    except:
+        data = {}
+        num_questions = 5
+    page_range = _parse_page_range(data)
+    
+    source_text = _get_source_text(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
         return JsonResponse({
+            'success': False,
+            'error': 'Could not extract enough text from this document.'
+        })
+    
+    try:
+        ollama = OllamaService(use_cache=not data.get('regenerate', False))
+        ollama.check_circuit()
+        
+        if not ollama.is_available():
+            return JsonResponse({
+                'success': False,
+                'error': 'Ollama is not running.  Please start Ollama first.'
+            })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    
+    parser = JSONItemStreamParser(QUESTION_KEYS)
+    questions = []
+    
+    def add_items(items):
+        # Each question is sent as soon as its closing brace arrives; all are saved together at the end
+        for item in items:
+            question = ollama.validate_item('quiz', item)
+            if question is None or len(questions) >= num_questions:
+                continue
+            questions.append(question)
+            yield 'item', question
+    
+    def on_token(token):
+        return add_items(parser.feed(token))
+    
+    def finish(response_text):
+        list(add_items(parser.finish()))
+        # Generate only the questions that were missing or invalid
+        list(add_items(ollama.fill_missing('quiz', source_text, questions, num_questions)))
+        if not questions:
+            # Nothing usable; fall back to the lenient parser and its error question
+            metrics.incr('generation.quiz.fallbacks')
+            questions.extend(ollama._parse_quiz(response_text, num_questions))
+        quiz, saved = _save_quiz(document, questions)
+        return {
             'success': True,
             'quiz_id': quiz.id,
-            'questions': questions
+            'questions': saved
+        }
+    
+    return _sse_response(request, _stream_events(ollama.stream_quiz(source_text, num_questions), finish, on_token))
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def generate_all(request, document_id):
+    """
+    Generate a summary, flashcards and a quiz concurrently.
+    
+    Availability is checked once and the three generations are awaited
+    together on one async HTTP client. The response is newline-delimited
+    JSON: one line per task as soon as it finishes, then a final
+    ``{"done": true}`` line.
+    """
+    document = await aget_object_or_404(Document, id=document_id)
+    
+    try:
+        data = json.loads(request.body) if request.body else {}
+        num_cards = min(max(int(data.get('num_cards', 5)), 1), 20)
+        num_questions = min(max(int(data.get('num_questions', 5)), 1), 15)
+    except:
+        data = {}
+        num_cards = 5
+        num_questions = 5
+    force_regenerate = bool(data.get('regenerate', False))
+    page_range = _parse_page_range(data)
+    
+    source_text = await sync_to_async(_get_source_text)(document, page_range)
+    if not source_text or len(source_text.strip()) < 50:
+        return JsonResponse({
+            'success': False,
+            'error': 'Could not extract enough text from this document.'
         })
+    
+    try:
+        probe = OllamaService()
+        probe.check_circuit()
+        
+        if not await sync_to_async(probe.is_available)():
+            return JsonResponse({
+                'success': False,
+                'error': 'Ollama is not available. Please ensure Ollama is running with a model installed.'
+            })
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    
+    use_map_reduce = not page_range and len(source_text) > getattr(settings, 'SUMMARY_MAP_REDUCE_THRESHOLD', 12000)
+    
+    async def summary_task(ollama):
+        if not force_regenerate and not page_range:
+            summary = await Summary.objects.filter(document=document).afirst()
+            if summary:
+                return {'summary': summary.content, 'cached': True}
+        
+        if use_map_reduce:
+            # Map-reduce fans out over its own thread pool
+            summary_text = await sync_to_async(generate_map_reduce_summary, thread_sensitive=False)(
+                OllamaService(use_cache=not force_regenerate), document
+            )
+        else:
+            summary_text = await ollama.agenerate_summary(source_text)
+        
+        if not page_range:
+            await Summary.objects.aupdate_or_create(
+                document=document,
+                defaults={'content': summary_text}
+            )
+        return {'summary': summary_text, 'cached': False}
+    
+    async def flashcards_task(ollama):
+        flashcards_data = await ollama.agenerate_flashcards(source_text, num_cards)
+        return {'flashcards': await sync_to_async(_save_flashcards)(document, flashcards_data)}
+    
+    async def quiz_task(ollama):
+        quiz_data = await ollama.agenerate_quiz(source_text, num_questions)
+        quiz, questions = await sync_to_async(_save_quiz)(document, quiz_data)
+        return {'quiz_id': quiz.id, 'questions': questions}
+    
+    async def run(name, task, ollama):
+        try:
+            result = await task(ollama)
+            return {'task': name, 'success': True, **result}
+        except CircuitOpenError as e:
+            return {'task': name, 'success': False, 'error': str(e), 'retry_after': int(e.retry_after) + 1}
+        except Exception as e:
+            traceback.print_exc()
+            return {'task': name, 'success': False, 'error': str(e)}
+    
+    async def results():
+        # The client is bound to the event loop, so it is created here
+        async with new_async_client() as client:
+            ollama = AsyncOllamaService(client, use_cache=not force_regenerate)
+            tasks = [
+                asyncio.ensure_future(run(name, task, ollama))
+                for name, task in (('summary', summary_task), ('flashcards', flashcards_task), ('quiz', quiz_task))
+            ]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    yield json.dumps(await finished) + '\n'
+            finally:
+                for task in tasks:
+                    task.cancel()
+        yield json.dumps({'done': True}) + '\n'
+    
+    response = _streaming_response(request, results(), 'application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_http_methods(["GET"])
+def search(request):
+    """Full-text search over extracted page text."""
+    query = request.GET.get('q', '').strip()
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    
+    try:
+        document_id = int(request.GET['document']) if request.GET.get('document') else None
+    except ValueError:
+        document_id = None
+    
+    if not query:
+        return JsonResponse({'success': True, 'query': query, 'results': []})
+    
+    try:
+        results = search_pages(query, limit=limit, document_id=document_id)
     except Exception as e:
         traceback.print_exc()
         return JsonResponse({
             'success': False,
             'error': str(e)
         })
+    
+    return JsonResponse({
+        'success': True,
+        'query': query,
+        'results': results
+    })
+
+
+@require_http_methods(["GET"])
+def export_study_material(request, document_id=None):
+    """
+    Stream flashcards and quiz questions as CSV, JSONL or an Anki import file.
+    
+    Query parameters: ``format`` (csv, jsonl, anki), ``kind`` (flashcards,
+    quiz, all) and, on /api/export/, ``documents`` (comma-separated ids;
+    default all documents).
+    """
+    fmt = request.GET.get('format', 'csv')
+    kind = request.GET.get('kind', 'all')
+    if document_id is not None:
+        get_object_or_404(Document.objects.only('id'), id=document_id)
+        document_ids = [document_id]
+    else:
+        try:
+            document_ids = [int(i) for i in request.GET.get('documents', '').split(',') if i.strip()]
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'documents must be comma-separated ids'}, status=400)
+    
+    try:
+        lines = export_lines(fmt, kind, document_ids)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    content_type, extension = EXPORT_FORMATS[fmt]
+    name = f"futured-{document_id}-{kind}" if document_id is not None else f"futured-{kind}"
+    response = _streaming_response(request, lines, f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{name}.{extension}"'
+    return response
+
+
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """Process-wide counters, timings and gauges for this worker."""
+    return JsonResponse(metrics.snapshot())
 
 
 @csrf_exempt
 @require_http_methods(["GET"])
 def check_ollama_status(request):
     """Check if Ollama is running and available."""
+    snapshot = get_monitor().snapshot()
+    ollama = OllamaService()
     status = {
-        'server_reachable': False,
-        'available': False,
-        'models': [],
-        'configured_model': '',
-        'error':  None
+        'server_reachable': snapshot['reachable'],
+        'available': ollama.is_available(recheck=False),
+        'models': snapshot['models'],
+        'configured_model': ollama.model,
+        'error': snapshot['error'],
+        'checked_at': snapshot['checked_at']
     }
     
-    try: 
-        # Check server
-        response = requests.get('http://localhost:11434', timeout=5)
-        status['server_reachable'] = response.status_code == 200
-        
-        # Check models
-        ollama = OllamaService()
-        status['available'] = ollama.is_available()
-        status['models'] = ollama.get_available_models()
-        status['configured_model'] = ollama.model
-        
-    except requests.exceptions.ConnectionError:
-        status['error'] = 'Cannot connect to Ollama server at localhost:11434'
-    except Exception as e:
-        status['error'] = str(e)
-    
     return JsonResponse(status)
\ No newline at end of file
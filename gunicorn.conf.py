@@ -0,0 +1,33 @@
+# Gunicorn configuration for the production profile (FuturED/settings_production.py).
+#
+# WSGI:  DJANGO_SETTINGS_MODULE=futured.settings_production gunicorn futured.wsgi
+# ASGI:  DJANGO_SETTINGS_MODULE=futured.settings_production GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+#        gunicorn futured.asgi
+#
+# Every worker process has its own Ollama scheduler (OLLAMA_MAX_IN_FLIGHT
+# calls, priorities, merged identical calls), circuit breaker, metrics and
+# extraction thread pool. One worker keeps all of that shared; threads (or
+# the ASGI event loop) absorb concurrent users, since generations spend
+# nearly all their time waiting on Ollama and a streaming response holds its
+# thread until the model finishes. With more workers, divide
+# OLLAMA_MAX_IN_FLIGHT between them. Both worker classes stream every
+# endpoint (token streams, generate-all, exports) chunk by chunk.
+import os
+
+# Start the Ollama monitor and warm-up threads in the workers (see core/apps.py)
+os.environ['FUTURED_SERVING'] = '1'
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 32))  # gthread only
+
+# A generation may take up to OLLAMA_READ_TIMEOUT (300 s) plus repair calls
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 360))
+graceful_timeout = 30
+keepalive = 5
+
+# Not preloaded: each worker starts its own warm-up and job threads in AppConfig.ready()
+preload_app = False
+
+accesslog = '-'
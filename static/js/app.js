@@ -46,6 +46,62 @@ function formatContent(text) {
     return formatted;
 }
 
+function getPageRange(prefix) {
+    // Optional page range inputs; empty means the whole document
+    const start = parseInt(document.getElementById(`${prefix}-page-start`)?.value);
+    const end = parseInt(document.getElementById(`${prefix}-page-end`)?.value);
+    const range = {};
+    if (!isNaN(start)) range.page_start = start;
+    if (!isNaN(end)) range.page_end = end;
+    return range;
+}
+
+async function postStream(url, body, onEvent) {
+    // POST and relay server-sent events to onEvent(event, data).
+    // Errors found before generation starts come back as plain JSON.
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.startsWith('text/event-stream')) {
+        const data = await response.json();
+        onEvent(data.success ? 'done' : 'error', data);
+        return;
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            raw.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
+function setLoadingText(prefix, text) {
+    const el = document.querySelector(`#${prefix}-loading .loading-text`);
+    if (el) el.textContent = text;
+}
+
 function showNotification(message, type = 'info') {
     // Remove existing notifications
     document.querySelectorAll('.notification').forEach(n => n.remove());
@@ -85,6 +141,49 @@ function showNotification(message, type = 'info') {
     }, 5000);
 }
 
+// ===== Extraction Progress =====
+let extractionState = typeof EXTRACTION_STATUS !== 'undefined' ? EXTRACTION_STATUS : 'ready';
+
+function textUnavailableMessage() {
+    if (extractionState === 'pending' || extractionState === 'processing') {
+        return 'Text extraction is still in progress. Please wait a moment.';
+    }
+    return 'No text could be extracted from this PDF.';
+}
+
+async function pollExtractionStatus() {
+    const statusEl = document.getElementById('extraction-status');
+    
+    try {
+        const response = await fetch(`/api/extraction-status/${DOCUMENT_ID}/`);
+        const data = await response.json();
+        extractionState = data.status;
+        
+        if (data.status === 'ready') {
+            TEXT_EXTRACTED = data.text_extracted;
+            if (statusEl) statusEl.innerHTML = '<span style="color: #22c55e;">Text Extracted</span>';
+            return;
+        }
+        
+        if (data.status === 'failed') {
+            if (statusEl) statusEl.innerHTML = '<span style="color: #ef4444;">No Text Found</span>';
+            return;
+        }
+        
+        if (statusEl) {
+            statusEl.innerHTML = `<span class="text-muted">Extracting text... ${data.pages_done}/${data.page_count} pages</span>`;
+        }
+    } catch (error) {
+        console.error('Extraction status error:', error);
+    }
+    
+    setTimeout(pollExtractionStatus, 1000);
+}
+
+if (extractionState === 'pending' || extractionState === 'processing') {
+    pollExtractionStatus();
+}
+
 // ===== Summary =====
 function showSummaryState(state) {
     ['initial', 'loading', 'content', 'error']. forEach(s => {
@@ -100,46 +199,50 @@ async function generateSummary(regenerate = false) {
     }
     
     if (typeof TEXT_EXTRACTED !== 'undefined' && !TEXT_EXTRACTED) {
-        showNotification('No text could be extracted from this PDF.', 'error');
+        showNotification(textUnavailableMessage(), 'error');
         return;
     }
     
     showSummaryState('loading');
+    setLoadingText('summary', 'Analyzing document and generating summary...');
+    
+    const contentEl = document.getElementById('summary-content');
+    let streamedText = '';
     
     try {
-        const response = await fetch(`/api/summary/${DOCUMENT_ID}/`, {
-            method:  'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ regenerate: regenerate })
-        });
-        
-        const data = await response.json();
-        
-        if (data. success) {
-            const contentEl = document.getElementById('summary-content');
-            contentEl. innerHTML = `
-                <div class="summary-text">${formatContent(data.summary)}</div>
-                <div style="margin-top:  1.5rem; padding-top: 1rem; border-top:  1px solid hsl(var(--border));">
-                    <button id="regenerate-summary-btn" class="btn btn-ghost btn-sm">Regenerate Summary</button>
-                </div>
-            `;
-            
-            document.getElementById('regenerate-summary-btn')?.addEventListener('click', () => generateSummary(true));
-            
-            showSummaryState('content');
-            
-            // Trigger MathJax
-            if (window.MathJax) {
-                MathJax.typesetPromise();
-            }
-            
-            if (data.cached) {
-                showNotification('Loaded cached summary.  Click "Regenerate" to create a new one.');
+        await postStream(`/api/summary/${DOCUMENT_ID}/stream/`, { regenerate: regenerate }, (event, data) => {
+            if (event === 'status') {
+                setLoadingText('summary', data.message);
+            } else if (event === 'token') {
+                // Render the summary as it is written
+                streamedText += data.text;
+                contentEl.innerHTML = `<div class="summary-text">${formatContent(streamedText)}</div>`;
+                showSummaryState('content');
+            } else if (event === 'done') {
+                contentEl.innerHTML = `
+                    <div class="summary-text">${formatContent(data.summary)}</div>
+                    <div style="margin-top:  1.5rem; padding-top: 1rem; border-top:  1px solid hsl(var(--border));">
+                        <button id="regenerate-summary-btn" class="btn btn-ghost btn-sm">Regenerate Summary</button>
+                    </div>
+                `;
+                
+                document.getElementById('regenerate-summary-btn')?.addEventListener('click', () => generateSummary(true));
+                
+                showSummaryState('content');
+                
+                // Trigger MathJax
+                if (window.MathJax) {
+                    MathJax.typesetPromise();
+                }
+                
+                if (data.cached) {
+                    showNotification('Loaded cached summary.  Click "Regenerate" to create a new one.');
+                }
+            } else if (event === 'error') {
+                document.getElementById('summary-error-text').textContent = data.error;
+                showSummaryState('error');
             }
-        } else {
-            document.getElementById('summary-error-text').textContent = data.error;
-            showSummaryState('error');
-        }
+        });
     } catch (error) {
         console.error('Summary generation error:', error);
         document.getElementById('summary-error-text').textContent = 'Failed to connect to the server. Please try again. ';
@@ -153,6 +256,7 @@ document.getElementById('retry-summary-btn')?.addEventListener('click', () => ge
 // ===== Flashcards =====
 let flashcards = [];
 let currentCardIndex = 0;
+let regenerateFlashcards = false;  // Skip the server's response cache on the next request
 
 function showFlashcardsState(state) {
     ['initial', 'loading', 'display', 'error'].forEach(s => {
@@ -192,31 +296,52 @@ async function generateFlashcards() {
     }
     
     if (typeof TEXT_EXTRACTED !== 'undefined' && !TEXT_EXTRACTED) {
-        showNotification('No text could be extracted from this PDF.', 'error');
+        showNotification(textUnavailableMessage(), 'error');
         return;
     }
     
     const numCards = parseInt(document.getElementById('num-flashcards')?.value) || 5;
     showFlashcardsState('loading');
+    setLoadingText('flashcards', 'Creating flashcards...');
+    flashcards = [];
+    let received = 0;
     
     try {
-        const response = await fetch(`/api/flashcards/${DOCUMENT_ID}/`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ num_cards: numCards })
+        await postStream(`/api/flashcards/${DOCUMENT_ID}/stream/`, { num_cards: numCards, regenerate: regenerateFlashcards, ...getPageRange('flashcards') }, (event, data) => {
+            if (event === 'token') {
+                received += data.text.length;
+                setLoadingText('flashcards', `Creating flashcards... (${received} characters written)`);
+            } else if (event === 'item') {
+                // Show the first card as soon as it's ready; later ones just extend the deck
+                flashcards.push(data);
+                if (flashcards.length === 1) {
+                    currentCardIndex = 0;
+                    displayCurrentCard();
+                    showFlashcardsState('display');
+                } else {
+                    document.getElementById('total-cards').textContent = flashcards.length;
+                    const nextBtn = document.getElementById('next-card');
+                    if (nextBtn) nextBtn.disabled = currentCardIndex === flashcards.length - 1;
+                }
+            } else if (event === 'done') {
+                regenerateFlashcards = false;
+                const streamed = flashcards.length > 0;
+                flashcards = data.flashcards;
+                if (!streamed) {
+                    currentCardIndex = 0;
+                    displayCurrentCard();
+                    showFlashcardsState('display');
+                }
+            } else if (event === 'error') {
+                if (flashcards.length > 0) {
+                    // Keep the cards that already arrived
+                    showNotification(`Flashcard generation stopped early: ${data.error}`, 'error');
+                } else {
+                    document.getElementById('flashcards-error-text').textContent = data.error;
+                    showFlashcardsState('error');
+                }
+            }
         });
-        
-        const data = await response.json();
-        
-        if (data.success) {
-            flashcards = data.flashcards;
-            currentCardIndex = 0;
-            displayCurrentCard();
-            showFlashcardsState('display');
-        } else {
-            document.getElementById('flashcards-error-text').textContent = data.error;
-            showFlashcardsState('error');
-        }
     } catch (error) {
         console.error('Flashcards generation error:', error);
         document.getElementById('flashcards-error-text').textContent = 'Failed to connect to the server. ';
@@ -227,6 +352,7 @@ async function generateFlashcards() {
 document.getElementById('generate-flashcards-btn')?.addEventListener('click', generateFlashcards);
 document.getElementById('retry-flashcards-btn')?.addEventListener('click', generateFlashcards);
 document.getElementById('regenerate-flashcards-btn')?.addEventListener('click', () => {
+    regenerateFlashcards = true;
     showFlashcardsState('initial');
 });
 
@@ -271,6 +397,8 @@ document.addEventListener('keydown', (e) => {
 let quizQuestions = [];
 let currentQuestionIndex = 0;
 let userAnswers = [];
+let regenerateQuiz = false;  // Skip the server's response cache on the next request
+let quizLoading = false;  // More questions are still streaming in
 
 function showQuizState(state) {
     ['initial', 'loading', 'display', 'results', 'review', 'error']. forEach(s => {
@@ -319,7 +447,7 @@ function displayCurrentQuestion() {
     
     if (prevBtn) prevBtn.classList.toggle('hidden', currentQuestionIndex === 0);
     if (nextBtn) nextBtn.classList.toggle('hidden', currentQuestionIndex === quizQuestions. length - 1);
-    if (submitBtn) submitBtn.classList.toggle('hidden', currentQuestionIndex !== quizQuestions.length - 1);
+    if (submitBtn) submitBtn.classList.toggle('hidden', quizLoading || currentQuestionIndex !== quizQuestions.length - 1);
     
     // Trigger MathJax
     if (window.MathJax) {
@@ -390,36 +518,61 @@ async function generateQuiz() {
     }
     
     if (typeof TEXT_EXTRACTED !== 'undefined' && ! TEXT_EXTRACTED) {
-        showNotification('No text could be extracted from this PDF.', 'error');
+        showNotification(textUnavailableMessage(), 'error');
         return;
     }
     
     const numQuestions = parseInt(document.getElementById('num-questions')?.value) || 5;
     showQuizState('loading');
+    setLoadingText('quiz', 'Generating quiz questions...');
+    quizQuestions = [];
+    userAnswers = [];
+    quizLoading = true;
+    let received = 0;
     
     try {
-        const response = await fetch(`/api/quiz/${DOCUMENT_ID}/`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ num_questions:  numQuestions })
+        await postStream(`/api/quiz/${DOCUMENT_ID}/stream/`, { num_questions:  numQuestions, regenerate: regenerateQuiz, ...getPageRange('quiz') }, (event, data) => {
+            if (event === 'token') {
+                received += data.text.length;
+                setLoadingText('quiz', `Generating quiz questions... (${received} characters written)`);
+            } else if (event === 'item') {
+                // Start the quiz with the first question; the rest are appended as they arrive
+                quizQuestions.push(data);
+                userAnswers.push(null);
+                if (quizQuestions.length === 1) {
+                    currentQuestionIndex = 0;
+                    showQuizState('display');
+                }
+                displayCurrentQuestion();
+            } else if (event === 'done') {
+                regenerateQuiz = false;
+                quizLoading = false;
+                const streamed = quizQuestions.length > 0;
+                quizQuestions = data.questions;
+                if (!streamed) {
+                    currentQuestionIndex = 0;
+                    userAnswers = new Array(quizQuestions.length).fill(null);
+                    showQuizState('display');
+                }
+                displayCurrentQuestion();
+            } else if (event === 'error') {
+                if (quizQuestions.length > 0) {
+                    // Keep the questions that already arrived
+                    quizLoading = false;
+                    displayCurrentQuestion();
+                    showNotification(`Quiz generation stopped early: ${data.error}`, 'error');
+                } else {
+                    document.getElementById('quiz-error-text').textContent = data.error;
+                    showQuizState('error');
+                }
+            }
         });
-        
-        const data = await response.json();
-        
-        if (data.success) {
-            quizQuestions = data.questions;
-            currentQuestionIndex = 0;
-            userAnswers = new Array(quizQuestions.length).fill(null);
-            displayCurrentQuestion();
-            showQuizState('display');
-        } else {
-            document.getElementById('quiz-error-text').textContent = data.error;
-            showQuizState('error');
-        }
     } catch (error) {
         console.error('Quiz generation error:', error);
         document.getElementById('quiz-error-text').textContent = 'Failed to connect to the server. ';
         showQuizState('error');
+    } finally {
+        quizLoading = false;
     }
 }
 
@@ -444,6 +597,7 @@ document.getElementById('submit-quiz')?.addEventListener('click', showQuizResult
 document.getElementById('review-quiz')?.addEventListener('click', showQuizReview);
 document.getElementById('back-to-results')?.addEventListener('click', () => showQuizState('results'));
 document.getElementById('new-quiz')?.addEventListener('click', () => {
+    regenerateQuiz = true;
     showQuizState('initial');
 });
 
@@ -1,12 +1,12 @@
 // FuturEd - PDF Viewer Module
 
 const PDFViewer = (function() {
-    let pdfDoc = null;
+    let pageSizes = [];
+    let zoomBuckets = [];
     let currentPage = 1;
     let currentScale = 1.0;
     let totalPages = 0;
-    let isRendering = false;
-    let pendingRender = null;
+    let observer = null;
     
     const MIN_SCALE = 0.5;
     const MAX_SCALE = 3.0;
@@ -35,15 +35,17 @@ const PDFViewer = (function() {
         elements.zoomLevel = document.getElementById('zoom-level');
         elements.container = document.getElementById('pdf-container');
 
-        // Set up PDF. js worker
-        const pdfjsLib = window['pdfjs-dist/build/pdf'];
-        pdfjsLib.GlobalWorkerOptions.workerSrc = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js';
+        // Lazy-load page images as they scroll into view
+        observer = new IntersectionObserver(handleIntersection, {
+            root: elements.container,
+            rootMargin: '200px 0px'
+        });
 
         // Bind event listeners
         bindEvents();
 
         // Load the PDF
-        loadPDF(PDF_URL);
+        loadPDF();
     }
 
     function bindEvents() {
@@ -57,7 +59,7 @@ const PDFViewer = (function() {
         document.getElementById('next-page')?.addEventListener('click', nextPage);
 
         // Retry button
-        document.getElementById('retry-pdf')?.addEventListener('click', () => loadPDF(PDF_URL));
+        document.getElementById('retry-pdf')?.addEventListener('click', () => loadPDF());
 
         // Keyboard shortcuts
         document.addEventListener('keydown', handleKeyboard);
@@ -66,16 +68,21 @@ const PDFViewer = (function() {
         elements.container?. addEventListener('scroll', handleScroll);
     }
 
-    async function loadPDF(url) {
+    async function loadPDF() {
         showLoading();
         
         try {
-            const pdfjsLib = window['pdfjs-dist/build/pdf'];
-            pdfDoc = await pdfjsLib.getDocument(url).promise;
-            totalPages = pdfDoc.numPages;
+            // Pages are rendered on the server; only their sizes are needed up front
+            const response = await fetch(`/api/pages/${DOCUMENT_ID}/`);
+            const data = await response.json();
+            if (!data.success) throw new Error(data.error);
+            
+            pageSizes = data.pages;
+            zoomBuckets = data.zoom_buckets;
+            totalPages = pageSizes.length;
             
             updatePageInfo();
-            await renderAllPages();
+            renderAllPages();
             hideLoading();
         } catch (error) {
             console.error('Error loading PDF:', error);
@@ -83,76 +90,78 @@ const PDFViewer = (function() {
         }
     }
 
-    async function renderAllPages() {
-        if (! pdfDoc || isRendering) return;
-        
-        isRendering = true;
-        elements.viewer.innerHTML = '';
-
-        for (let pageNum = 1; pageNum <= totalPages; pageNum++) {
-            try {
-                const page = await pdfDoc.getPage(pageNum);
-                const viewport = page.getViewport({ scale: currentScale });
-
-                // Create page wrapper
-                const pageWrapper = document.createElement('div');
-                pageWrapper.className = 'page-wrapper';
-                pageWrapper.dataset.pageNumber = pageNum;
-
-                // Create canvas
-                const canvas = document.createElement('canvas');
-                const context = canvas.getContext('2d');
-                canvas.height = viewport.height;
-                canvas.width = viewport.width;
-
-                // Create page number label
-                const pageLabel = document.createElement('div');
-                pageLabel.className = 'page-number';
-                pageLabel.textContent = `Page ${pageNum}`;
-
-                pageWrapper.appendChild(canvas);
-                pageWrapper.appendChild(pageLabel);
-                elements.viewer.appendChild(pageWrapper);
-
-                // Render page
-                await page.render({
-                    canvasContext: context,
-                    viewport: viewport
-                }).promise;
-
-            } catch (error) {
-                console.error(`Error rendering page ${pageNum}: `, error);
-            }
+    function zoomBucket(scale) {
+        // Match the server's buckets so zoom levels share cached images
+        const target = scale * (window.devicePixelRatio || 1);
+        for (const bucket of zoomBuckets) {
+            if (bucket >= target) return bucket;
         }
+        return zoomBuckets[zoomBuckets.length - 1] || 1;
+    }
 
-        isRendering = false;
+    function pageImageUrl(pageNum) {
+        return `/api/page/${DOCUMENT_ID}/${pageNum}/?zoom=${zoomBucket(currentScale)}`;
     }
 
-    async function renderSinglePage(pageNum) {
-        if (!pdfDoc || pageNum < 1 || pageNum > totalPages) return;
+    function renderAllPages() {
+        // Lay out sized placeholders; images load when they become visible
+        observer.disconnect();
+        elements.viewer.innerHTML = '';
 
-        try {
-            const page = await pdfDoc.getPage(pageNum);
-            const viewport = page.getViewport({ scale:  currentScale });
+        pageSizes.forEach(size => {
+            const pageWrapper = document.createElement('div');
+            pageWrapper.className = 'page-wrapper';
+            pageWrapper.dataset.pageNumber = size.number;
 
-            const pageWrapper = elements.viewer.querySelector(`[data-page-number="${pageNum}"]`);
-            if (!pageWrapper) return;
+            const img = document.createElement('img');
+            img.alt = `Page ${size.number}`;
+            img.decoding = 'async';
 
-            const canvas = pageWrapper.querySelector('canvas');
-            if (!canvas) return;
+            const pageLabel = document.createElement('div');
+            pageLabel.className = 'page-number';
+            pageLabel.textContent = `Page ${size.number}`;
 
-            const context = canvas.getContext('2d');
-            canvas.height = viewport.height;
-            canvas.width = viewport.width;
+            pageWrapper.appendChild(img);
+            pageWrapper.appendChild(pageLabel);
+            elements.viewer.appendChild(pageWrapper);
+        });
 
-            await page.render({
-                canvasContext: context,
-                viewport: viewport
-            }).promise;
+        applyScale();
+    }
 
-        } catch (error) {
-            console.error(`Error rendering page ${pageNum}:`, error);
-        }
+    function applyScale() {
+        // Resize placeholders and drop images so visible pages reload at the new bucket
+        elements.viewer.querySelectorAll('.page-wrapper').forEach(pageWrapper => {
+            const size = pageSizes[pageWrapper.dataset.pageNumber - 1];
+            const img = pageWrapper.querySelector('img');
+            img.style.width = `${Math.floor(size.width * currentScale)}px`;
+            img.style.height = `${Math.floor(size.height * currentScale)}px`;
+            img.removeAttribute('src');
+            delete img.dataset.bucket;
+            observer.observe(pageWrapper);
+        });
+    }
+
+    function handleIntersection(entries) {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            renderSinglePage(parseInt(entry.target.dataset.pageNumber));
+        });
+    }
+
+    function renderSinglePage(pageNum) {
+        if (pageNum < 1 || pageNum > totalPages) return;
+
+        const pageWrapper = elements.viewer.querySelector(`[data-page-number="${pageNum}"]`);
+        if (!pageWrapper) return;
+
+        const img = pageWrapper.querySelector('img');
+        const bucket = String(zoomBucket(currentScale));
+        if (!img || img.dataset.bucket === bucket) return;
+
+        img.dataset.bucket = bucket;
+        img.onerror = () => console.error(`Error rendering page ${pageNum}`);
+        img.src = pageImageUrl(pageNum);
     }
 
     function zoomIn() {
@@ -170,21 +179,18 @@ const PDFViewer = (function() {
     }
 
     function zoomFit() {
-        if (! pdfDoc || !elements.container) return;
+        if (pageSizes.length === 0 || !elements.container) return;
 
         // Calculate scale to fit width
-        pdfDoc.getPage(1).then(page => {
-            const containerWidth = elements.container.clientWidth - 40; // Subtract padding
-            const viewport = page.getViewport({ scale: 1.0 });
-            currentScale = containerWidth / viewport.width;
-            currentScale = Math.max(MIN_SCALE, Math.min(currentScale, MAX_SCALE));
-            updateZoom();
-        });
+        const containerWidth = elements.container.clientWidth - 40; // Subtract padding
+        currentScale = containerWidth / pageSizes[0].width;
+        currentScale = Math.max(MIN_SCALE, Math.min(currentScale, MAX_SCALE));
+        updateZoom();
     }
 
     function updateZoom() {
         elements.zoomLevel.textContent = Math.round(currentScale * 100) + '%';
-        renderAllPages();
+        applyScale();
     }
 
     function prevPage() {